@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark for sentence-parallel synthesis in the web service
+
+Measures p50 latency of one request against its length (1 to N paragraphs),
+comparing a single kokoro.create() call with sentence-parallel rendering on
+session pools of different sizes.
+
+Usage: python benchmark_sentence_parallel.py [--sessions 1,2,4] [--paragraphs 5] [--runs 5]
+Needs kokoro-v1.0.onnx and voices-v1.0.bin in the current directory.
+"""
+
+import sys
+import os
+import time
+import statistics
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '.'))
+
+from kokoro_tts import web_service
+
+MODEL_PATH = "./kokoro-v1.0.onnx"
+VOICES_PATH = "./voices-v1.0.bin"
+
+PARAGRAPH = (
+    "The lighthouse keeper climbed the stairs every evening at dusk. "
+    "He trimmed the wick, polished the great lens, and wound the clockwork that turned the light. "
+    "Ships passing in the night never saw him, but they trusted the beam. "
+    "On stormy nights he stayed awake until dawn, listening to the waves break against the rocks below. "
+    "It was lonely work, yet he would not have traded it for anything."
+)
+
+def parse_args(argv):
+    options = {'sessions': [1, 2, 4], 'paragraphs': 5, 'runs': 5}
+    i = 0
+    while i < len(argv):
+        if argv[i] == '--sessions' and i + 1 < len(argv):
+            options['sessions'] = [int(n) for n in argv[i + 1].split(',')]
+            i += 1
+        elif argv[i] == '--paragraphs' and i + 1 < len(argv):
+            options['paragraphs'] = int(argv[i + 1])
+            i += 1
+        elif argv[i] == '--runs' and i + 1 < len(argv):
+            options['runs'] = int(argv[i + 1])
+            i += 1
+        else:
+            print(__doc__)
+            sys.exit(1)
+        i += 1
+    return options
+
+def p50(func, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def main():
+    options = parse_args(sys.argv[1:])
+    if not (os.path.exists(MODEL_PATH) and os.path.exists(VOICES_PATH)):
+        print("Model files not found. Please download kokoro-v1.0.onnx and voices-v1.0.bin first.")
+        sys.exit(1)
+
+    texts = [" ".join([PARAGRAPH] * n) for n in range(1, options['paragraphs'] + 1)]
+    longest = max(len(s) for s in web_service.split_sentences(PARAGRAPH))
+    results = {}
+
+    for sessions in options['sessions']:
+        web_service.pool_size = sessions
+        web_service.attach_model(web_service.create_kokoro(MODEL_PATH, VOICES_PATH))
+        print(f"Warming up {sessions} session(s)...")
+        web_service.render_samples(PARAGRAPH, "af_sarah", 1.0, "en-us")
+
+        if sessions == options['sessions'][0]:
+            # Baseline: the whole text in a single create() call
+            kokoro = web_service.pool.sessions[0]
+            results['single call'] = [
+                p50(lambda: kokoro.create(text, voice="af_sarah", speed=1.0, lang="en-us"), options['runs'])
+                for text in texts
+            ]
+
+        results[f"{sessions} session(s)"] = [
+            p50(lambda: web_service.render_samples(text, "af_sarah", 1.0, "en-us"), options['runs'])
+            for text in texts
+        ]
+
+    print(f"\np50 latency in seconds ({options['runs']} runs each, longest sentence {longest} characters)\n")
+    header = f"{'paragraphs':>10} {'characters':>10} " + " ".join(f"{name:>14}" for name in results)
+    print(header)
+    print("-" * len(header))
+    for i, text in enumerate(texts):
+        row = f"{i + 1:>10} {len(text):>10} "
+        row += " ".join(f"{results[name][i]:>14.3f}" for name in results)
+        print(row)
+
+if __name__ == "__main__":
+    main()
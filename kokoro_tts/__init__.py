@@ -3,6 +3,7 @@
 # Standard library imports
 import os
 import sys
+import bisect
 import itertools
 import threading
 import time
@@ -12,6 +13,10 @@ import warnings
 from threading import Event
 import re
 import json
+import shutil
+import hashlib
+import unicodedata
+from collections import Counter
 
 # Rich imports for ASCII art
 try:
@@ -23,13 +28,16 @@ except ImportError:
 
 # Third-party imports
 import numpy as np
-from ebooklib import epub, ITEM_DOCUMENT
-from bs4 import BeautifulSoup
+from ebooklib import epub
 import soundfile as sf
 import sounddevice as sd
 from kokoro_onnx import Kokoro
-import pymupdf4llm
 import fitz
+from kokoro_tts.model_registry import resolve_model_paths
+from kokoro_tts.pdf_cleanup import PageCleaner
+from kokoro_tts.pdf_pages import iter_pages, iter_markdown_windows
+from kokoro_tts.extract_cache import cached_chapters, CHUNK_SIZE
+from kokoro_tts.epub_reader import open_epub, iter_epub_chapters, iter_epub_text
 
 warnings.filterwarnings("ignore", category=UserWarning, module='ebooklib')
 warnings.filterwarnings("ignore", category=FutureWarning, module='ebooklib')
@@ -290,13 +298,7 @@ def list_available_voices(kokoro):
     return voices
 
 def extract_text_from_epub(epub_file):
-    book = epub.read_epub(epub_file)
-    full_text = ""
-    for item in book.get_items():
-        if item.get_type() == ITEM_DOCUMENT:
-            soup = BeautifulSoup(item.get_body_content(), "html.parser")
-            full_text += soup.get_text()
-    return full_text
+    return "".join(iter_epub_text(epub_file))
 
 def chunk_text(text, initial_chunk_size=1000):
     """Split text into chunks at sentence boundaries with dynamic sizing."""
@@ -348,6 +350,16 @@ def chunk_text(text, initial_chunk_size=1000):
     
     return chunks
 
+def chapter_chunks(chapter, chunk_size=1000):
+    """A chapter's chunks, reusing the list cached with it when the size matches."""
+    if 'chunks' in chapter and chunk_size == CHUNK_SIZE:
+        return chapter['chunks']
+    return chunk_text(chapter['content'], initial_chunk_size=chunk_size)
+
+def load_cached_chapters(input_file, extract):
+    """Chapters of a book from the extraction cache, or from extract() while caching them."""
+    return cached_chapters(input_file, extract, lambda text: chunk_text(text, initial_chunk_size=CHUNK_SIZE))
+
 def validate_language(lang, kokoro):
     """Validate if the language is supported."""
     try:
@@ -371,6 +383,10 @@ Commands:
     --help-emotions    List all available emotions
     --help-effects     List all available audio effects
     --merge-chunks     Merge existing chunks in split-output directory into chapter files
+    --manifest <file>  Render every line of a JSONL manifest into --out-dir with one model load
+    --batch-dir <dir>  Convert every .epub, .pdf and .txt in a directory into --out-dir with one model load
+    --worker           Render chunks from a shared --queue directory until it is finished
+    --audition <text>  Render the text with every voice into --out-dir, with an index of durations and timings
 
 Options:
     --stream            Stream audio instead of saving to file
@@ -384,9 +400,18 @@ Options:
     --save-preset <str> Save current voice settings as a preset
     --split-output <dir> Save each chunk as separate file in directory
     --format <str>      Audio format: wav or mp3 (default: wav)
+    --chapters <list>   Only render these chapters, e.g. 3-5,9
+    --pages <list>      Only read these PDF pages, e.g. 100-180
+    --max-seconds <n>   Stop after about n seconds of estimated audio
     --debug             Show detailed debug information
-    --model <path>      Path to kokoro-v1.0.onnx model file (default: ./kokoro-v1.0.onnx)
+    --model <path>      Path to kokoro-v1.0.onnx model file, or a model name from models.json (default: ./kokoro-v1.0.onnx)
     --voices <path>     Path to voices-v1.0.bin file (default: ./voices-v1.0.bin)
+    --out-dir <dir>     Output directory for --manifest, --batch-dir and --audition
+    --audition-voices <list> Voices for --audition, e.g. "af_* am_adam af_sarah:60,am_adam:40" (default: all)
+    --workers <int>     Sessions rendering in parallel for --manifest, --batch-dir and --audition (default: one per two CPU cores, up to 4)
+    --watch             Keep polling --batch-dir and convert new books as they arrive
+    --queue <dir>       Shared work queue: with an input file and --split-output, queue the book for
+                        --worker processes on any machine, wait for them and merge the chapters
 
 Input formats:
     .txt               Text file input
@@ -405,8 +430,14 @@ Examples:
     kokoro-desktop input.epub --split-output ./chunks/ --format mp3
     kokoro-desktop input.pdf output.wav --speed 1.2 --lang en-us --voice af_sarah
     kokoro-desktop input.pdf --split-output ./chunks/ --format mp3
+    kokoro-desktop input.pdf --split-output ./chunks/ --chapters 3-5,9 --max-seconds 600
     kokoro-desktop input.txt --stream --speed 0.8
     kokoro-desktop --merge-chunks --split-output ./chunks/ --format wav
+    kokoro-desktop --manifest prompts.jsonl --out-dir ./prompts/ --workers 4
+    kokoro-desktop --batch-dir ./spool/ --out-dir ./audiobooks/ --watch
+    kokoro-desktop book.epub --split-output /shared/book/ --queue /shared/queue/
+    kokoro-desktop --worker --queue /shared/queue/
+    kokoro-desktop --audition "The quick brown fox." --out-dir ./audition/ --audition-voices "af_* bf_*"
     kokoro-desktop --help-voices
     kokoro-desktop --help-languages
     kokoro-desktop --help-emotions
@@ -514,10 +545,8 @@ def extract_chapters_from_epub(epub_file, debug=False):
     if not os.path.exists(epub_file):
         raise FileNotFoundError(f"EPUB file not found: {epub_file}")
     
-    book = epub.read_epub(epub_file)
-    chapters = []
-    
     if debug:
+        book, _documents = open_epub(epub_file)
         print("\nBook Metadata:")
         for key, value in book.metadata.items():
             print(f"  {key}: {value}")
@@ -534,156 +563,7 @@ def extract_chapters_from_epub(epub_file, debug=False):
                     print(f"{indent}• {item.title} -> {item.href}")
         print_toc(book.toc)
     
-    def get_chapter_content(soup, start_id, next_id=None):
-        """Extract content between two fragment IDs"""
-        content = []
-        start_elem = soup.find(id=start_id)
-        
-        if not start_elem:
-            return ""
-        
-        # Skip the heading itself if it's a heading
-        if start_elem.name in ['h1', 'h2', 'h3', 'h4']:
-            current = start_elem.find_next_sibling()
-        else:
-            current = start_elem
-            
-        while current:
-            # Stop if we hit the next chapter
-            if next_id and current.get('id') == next_id:
-                break
-            # Stop if we hit another chapter heading
-            if current.name in ['h1', 'h2', 'h3'] and 'chapter' in current.get_text().lower():
-                break
-            content.append(current.get_text())
-            current = current.find_next_sibling()
-            
-        return '\n'.join(content).strip()
-    
-    def process_toc_items(items, depth=0):
-        processed = []
-        for i, item in enumerate(items):
-            if isinstance(item, tuple):
-                section_title, section_items = item
-                if debug:
-                    print(f"{'  ' * depth}Processing section: {section_title}")
-                processed.extend(process_toc_items(section_items, depth + 1))
-            elif isinstance(item, epub.Link):
-                if debug:
-                    print(f"{'  ' * depth}Processing link: {item.title} -> {item.href}")
-                
-                # Skip if title suggests it's front matter
-                if (item.title.lower() in ['copy', 'copyright', 'title page', 'cover'] or
-                    item.title.lower().startswith('by')):
-                    continue
-                
-                # Extract the file name and fragment from href
-                href_parts = item.href.split('#')
-                file_name = href_parts[0]
-                fragment_id = href_parts[1] if len(href_parts) > 1 else None
-                
-                # Find the document
-                doc = next((doc for doc in book.get_items_of_type(ITEM_DOCUMENT) 
-                          if doc.file_name.endswith(file_name)), None)
-                
-                if doc:
-                    content = doc.get_content().decode('utf-8')
-                    soup = BeautifulSoup(content, "html.parser")
-                    
-                    # If no fragment ID, get whole document content
-                    if not fragment_id:
-                        text_content = soup.get_text().strip()
-                    else:
-                        # Get the next fragment ID if available
-                        next_item = items[i + 1] if i + 1 < len(items) else None
-                        next_fragment = None
-                        if isinstance(next_item, epub.Link):
-                            next_href_parts = next_item.href.split('#')
-                            if next_href_parts[0] == file_name and len(next_href_parts) > 1:
-                                next_fragment = next_href_parts[1]
-                        
-                        # Extract content between fragments
-                        text_content = get_chapter_content(soup, fragment_id, next_fragment)
-                    
-                    if text_content:
-                        chapters.append({
-                            'title': item.title,
-                            'content': text_content,
-                            'order': len(processed) + 1
-                        })
-                        processed.append(item)
-                        if debug:
-                            print(f"{'  ' * depth}Added chapter: {item.title}")
-                            print(f"{'  ' * depth}Content length: {len(text_content)} chars")
-                            print(f"{'  ' * depth}Word count: {len(text_content.split())}")
-        return processed
-    
-    # Process the table of contents
-    process_toc_items(book.toc)
-    
-    # If no chapters were found through TOC, try processing all documents
-    if not chapters:
-        if debug:
-            print("\nNo chapters found in TOC, processing all documents...")
-        
-        # Get all document items sorted by file name
-        docs = sorted(
-            book.get_items_of_type(ITEM_DOCUMENT),
-            key=lambda x: x.file_name
-        )
-        
-        for doc in docs:
-            if debug:
-                print(f"Processing document: {doc.file_name}")
-            
-            content = doc.get_content().decode('utf-8')
-            soup = BeautifulSoup(content, "html.parser")
-            
-            # Try to find chapter divisions
-            chapter_divs = soup.find_all(['h1', 'h2', 'h3'], class_=lambda x: x and 'chapter' in x.lower())
-            if not chapter_divs:
-                chapter_divs = soup.find_all(lambda tag: tag.name in ['h1', 'h2', 'h3'] and 
-                                          ('chapter' in tag.get_text().lower() or
-                                           'book' in tag.get_text().lower()))
-            
-            if chapter_divs:
-                # Process each chapter division
-                for i, div in enumerate(chapter_divs):
-                    title = div.get_text().strip()
-                    
-                    # Get content until next chapter heading or end
-                    content = ''
-                    for tag in div.find_next_siblings():
-                        if tag.name in ['h1', 'h2', 'h3'] and (
-                            'chapter' in tag.get_text().lower() or
-                            'book' in tag.get_text().lower()):
-                            break
-                        content += tag.get_text() + '\n'
-                    
-                    if content.strip():
-                        chapters.append({
-                            'title': title,
-                            'content': content.strip(),
-                            'order': len(chapters) + 1
-                        })
-                        if debug:
-                            print(f"Added chapter: {title}")
-            else:
-                # No chapter divisions found, treat whole document as one chapter
-                text_content = soup.get_text().strip()
-                if text_content:
-                    # Try to find a title
-                    title_tag = soup.find(['h1', 'h2', 'title'])
-                    title = title_tag.get_text().strip() if title_tag else f"Chapter {len(chapters) + 1}"
-                    
-                    if title.lower() not in ['copy', 'copyright', 'title page', 'cover']:
-                        chapters.append({
-                            'title': title,
-                            'content': text_content,
-                            'order': len(chapters) + 1
-                        })
-                        if debug:
-                            print(f"Added chapter: {title}")
+    chapters = list(iter_epub_chapters(epub_file, debug))
     
     # Print summary
     if chapters:
@@ -708,7 +588,7 @@ def extract_chapters_from_epub(epub_file, debug=False):
         print("\nWarning: No chapters were extracted!")
         if debug:
             print("\nAvailable documents:")
-            for doc in book.get_items_of_type(ITEM_DOCUMENT):
+            for doc in open_epub(epub_file)[1].spine():
                 print(f"  • {doc.file_name}")
     
     return chapters
@@ -720,18 +600,29 @@ class PdfParser:
     then falls back to markdown-based extraction if TOC fails.
     """
     
-    def __init__(self, pdf_path: str, debug: bool = False, min_chapter_length: int = 50):
+    def __init__(self, pdf_path: str, debug: bool = False, min_chapter_length: int = 50,
+                 interactive: bool = True, strip_non_speech: bool = True, workers: int = None,
+                 pages: list = None):
         """Initialize PDF parser.
         
         Args:
             pdf_path: Path to PDF file
             debug: Enable debug logging
             min_chapter_length: Minimum text length to consider as chapter
+            interactive: Ask for confirmation after printing the table of contents
+            strip_non_speech: Drop running headers/footers, footnote markers and
+                blocks of digits or symbols from page text
+            workers: Processes reading pages (default: one per core, at most eight)
+            pages: Only read these (first, last) page ranges, 1-based and inclusive
         """
         self.pdf_path = pdf_path
         self.chapters = []
         self.debug = debug
         self.min_chapter_length = min_chapter_length
+        self.interactive = interactive
+        self.strip_non_speech = strip_non_speech
+        self.workers = workers
+        self.pages = pages
         
         if not os.path.exists(pdf_path):
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
@@ -771,52 +662,129 @@ class PdfParser:
         Returns:
             bool: True if chapters were found, False otherwise
         """
-        doc = None
         try:
-            doc = fitz.open(self.pdf_path)
-            toc = doc.get_toc()
-            
-            if not toc:
-                if self.debug:
-                    print("\nDEBUG: No table of contents found")
+            chapter_markers, page_count = self._get_toc_markers()
+            if not chapter_markers:
                 return False
-
-            # Print TOC structure
-            print("\nTable of Contents:")
-            for level, title, page in toc:
-                title = self._clean_title(title)
-                indent = "  " * (level - 1)
-                print(f"{indent}{'•' if level > 1 else '>'} {title} (page {page})")
+            self.chapters = list(self._iter_toc_chapters(chapter_markers, page_count))
+            return bool(self.chapters)
             
+        except Exception as e:
             if self.debug:
-                print(f"\nDEBUG: Found {len(toc)} TOC entries")
-            
-            # Get user confirmation
+                print(f"\nDEBUG: Error in TOC extraction: {str(e)}")
+            return False
+
+    def iter_chapters(self):
+        """Yield chapters as soon as their pages have been extracted.
+        
+        Like get_chapters(), but the first chapter is available while later
+        pages are still being read, so synthesis can start early.
+        """
+        found = False
+        try:
+            chapter_markers, page_count = self._get_toc_markers()
+            if chapter_markers:
+                for chapter in self._iter_toc_chapters(chapter_markers, page_count):
+                    found = True
+                    yield chapter
+        except Exception as e:
+            if found:
+                raise
+            if self.debug:
+                print(f"\nDEBUG: Error in TOC extraction: {str(e)}")
+        
+        if not found:
+            if self.debug:
+                print("\nDEBUG: TOC extraction failed, trying markdown conversion...")
+            yield from self.iter_chapters_from_markdown()
+
+    def _get_toc_markers(self):
+        """Print the table of contents and pick the chapter start pages.
+        
+        Returns:
+            (list of (title, start_page), page_count); the list is empty if
+            the document has no usable table of contents
+        """
+        with fitz.open(self.pdf_path) as doc:
+            toc = doc.get_toc()
+            page_count = doc.page_count
+        
+        if not toc:
+            if self.debug:
+                print("\nDEBUG: No table of contents found")
+            return [], page_count
+
+        # Print TOC structure
+        print("\nTable of Contents:")
+        for level, title, page in toc:
+            title = self._clean_title(title)
+            indent = "  " * (level - 1)
+            print(f"{indent}{'•' if level > 1 else '>'} {title} (page {page})")
+        
+        if self.debug:
+            print(f"\nDEBUG: Found {len(toc)} TOC entries")
+        
+        # Get user confirmation
+        if self.interactive:
             print("\nPress Enter to start processing, or Ctrl+C to cancel...")
             input()
-            
-            # Extract level 1 chapters, filtering out empty titles and duplicates
-            seen_pages = set()
-            chapter_markers = []
-            
-            for level, title, page in toc:
-                if level == 1:
-                    title = self._clean_title(title)
-                    # Skip empty titles or titles that start on same page as previous entry
-                    if title and page not in seen_pages:
-                        chapter_markers.append((title, page))
-                        seen_pages.add(page)
-            
-            if not chapter_markers:
-                if self.debug:
-                    print("\nDEBUG: No level 1 chapters found in TOC")
-                return False
-            
+        
+        # Extract level 1 chapters, filtering out empty titles and duplicates
+        seen_pages = set()
+        chapter_markers = []
+        
+        for level, title, page in toc:
+            if level == 1:
+                title = self._clean_title(title)
+                # Skip empty titles or titles that start on same page as previous entry
+                if title and page not in seen_pages:
+                    chapter_markers.append((title, page))
+                    seen_pages.add(page)
+        
+        if not chapter_markers:
             if self.debug:
-                print(f"\nDEBUG: Found {len(chapter_markers)} chapters:")
-                for title, page in chapter_markers:
-                    print(f"DEBUG: • {title} (page {page})")
-            
+                print("\nDEBUG: No level 1 chapters found in TOC")
+            return [], page_count
+        
+        if self.debug:
+            print(f"\nDEBUG: Found {len(chapter_markers)} chapters:")
+            for title, page in chapter_markers:
+                print(f"DEBUG: • {title} (page {page})")
+        
+        return chapter_markers, page_count
+
+    def _selected_pages(self, page_count):
+        """0-based numbers of the pages to read, in order."""
+        if not self.pages:
+            return list(range(page_count))
+        return [page_num for page_num in range(page_count)
+                if any(first <= page_num + 1 <= last for first, last in self.pages)]
+
+    def _iter_toc_chapters(self, chapter_markers, page_count):
+        """Yield chapters in TOC order while a process pool reads the pages."""
+        # Running headers/footers and non-speech blocks are found across pages
+        cleaner = PageCleaner() if self.strip_non_speech else None
+        selected = self._selected_pages(page_count)
+        pages = iter_pages(self.pdf_path, selected, self.workers, blocks=bool(cleaner))
+        plain = []
+        
+        def read_until(page_num):
+            # Read pages until position page_num (and, for the cleaner, its neighbours) are known
+            if cleaner:
+                while not cleaner.ready(page_num):
+                    page = next(pages, None)
+                    if page is None:
+                        cleaner.complete = True
+                    else:
+                        cleaner.add(page)
+            else:
+                while len(plain) <= page_num:
+                    page = next(pages, None)
+                    if page is None:
+                        break
+                    plain.append(page)
+        
+        try:
             # Process each chapter
             for i, (title, start_page) in enumerate(chapter_markers):
                 if self.debug:
@@ -827,30 +795,33 @@ class PdfParser:
                 # Get chapter end page
                 end_page = (chapter_markers[i + 1][1] - 1 
                            if i < len(chapter_markers) - 1 
-                           else doc.page_count)
+                           else page_count)
+                start_page = max(start_page, 1)
+                end_page = min(end_page, page_count)
+                
+                # Positions of the chapter's pages among the pages being read
+                first = bisect.bisect_left(selected, start_page - 1)
+                last = bisect.bisect_left(selected, end_page)
+                if first == last:
+                    continue
                 
                 # Extract chapter text
-                chapter_text = self._extract_chapter_text(doc, start_page - 1, end_page)
+                read_until(last - 1)
+                chapter_text = self._extract_chapter_text(plain, first, last, cleaner)
                 
                 if len(chapter_text.strip()) > self.min_chapter_length:
-                    self.chapters.append({
+                    if self.debug:
+                        print(f"DEBUG: Added chapter with {len(chapter_text.split())} words")
+                    yield {
                         'title': title,
                         'content': chapter_text,
                         'order': i + 1
-                    })
-                    if self.debug:
-                        print(f"DEBUG: Added chapter with {len(chapter_text.split())} words")
-            
-            return bool(self.chapters)
-            
-        except Exception as e:
-            if self.debug:
-                print(f"\nDEBUG: Error in TOC extraction: {str(e)}")
-            return False
+                    }
             
+            if cleaner:
+                cleaner.report()
         finally:
-            if doc:
-                doc.close()
+            pages.close()
 
     def get_chapters_from_markdown(self):
         """Extract chapters by converting PDF to markdown.
@@ -860,36 +831,60 @@ class PdfParser:
         """
         chapters = []
         try:
-            def progress(current, total):
-                if self.debug:
-                    print(f"\rConverting page {current}/{total}...", end="", flush=True)
-            
-            # Convert PDF to markdown
-            md_text = pymupdf4llm.to_markdown(
-                self.pdf_path,
-                show_progress=True,
-                progress_callback=progress
-            )
-            
-            # Clean up markdown text
-            md_text = self._clean_markdown(md_text)
+            for chapter in self.iter_chapters_from_markdown():
+                chapters.append(chapter)
+        except Exception as e:
+            if self.debug:
+                print(f"\nDEBUG: Error in markdown extraction: {str(e)}")
+        return chapters
+
+    def iter_chapters_from_markdown(self):
+        """Yield chapters split at Markdown headings, converting the PDF in page windows.
+        
+        Windows are converted by a process pool a few at a time, and a chapter
+        is yielded as soon as the next heading shows it is complete.
+        """
+        with fitz.open(self.pdf_path) as doc:
+            page_count = doc.page_count
+        
+        started = time.perf_counter()
+        ready = []
+        current_chapter = None
+        current_text = []
+        chapter_count = 0
+        
+        def finish_chapter():
+            # The chapter under construction, if it is long enough to keep
+            if current_chapter and current_text:
+                chapter_text = ''.join(current_text)
+                if len(chapter_text.strip()) > self.min_chapter_length:
+                    return {
+                        'title': current_chapter,
+                        'content': chapter_text,
+                        'order': chapter_count
+                    }
+            return None
+        
+        def report(chapter):
+            # Time to first chapter is what a listener waits before audio starts
+            if chapter:
+                if not ready:
+                    print(f"\nFirst chapter ready after {time.perf_counter() - started:.1f}s")
+                ready.append(chapter['order'])
+            return chapter
+        
+        selected = self._selected_pages(page_count)
+        for first_page, last_page, md_text in iter_markdown_windows(self.pdf_path, selected, self.workers):
+            if self.debug:
+                print(f"\rConverted pages {first_page}-{last_page}/{page_count}...", end="", flush=True)
             
             # Extract chapters
-            current_chapter = None
-            current_text = []
-            chapter_count = 0
-            
-            for line in md_text.split('\n'):
+            for line in self._clean_markdown(md_text).split('\n'):
                 if line.startswith('#'):
                     # Save previous chapter if exists
-                    if current_chapter and current_text:
-                        chapter_text = ''.join(current_text)
-                        if len(chapter_text.strip()) > self.min_chapter_length:
-                            chapters.append({
-                                'title': current_chapter,
-                                'content': chapter_text,
-                                'order': chapter_count
-                            })
+                    chapter = report(finish_chapter())
+                    if chapter:
+                        yield chapter
                     
                     # Start new chapter
                     chapter_count += 1
@@ -898,43 +893,42 @@ class PdfParser:
                 else:
                     if current_chapter is not None:
                         current_text.append(line + '\n')
-            
-            # Add final chapter
-            if current_chapter and current_text:
-                chapter_text = ''.join(current_text)
-                if len(chapter_text.strip()) > self.min_chapter_length:
-                    chapters.append({
-                        'title': current_chapter,
-                        'content': chapter_text,
-                        'order': chapter_count
-                    })
-            
-            return chapters
-            
-        except Exception as e:
-            if self.debug:
-                print(f"\nDEBUG: Error in markdown extraction: {str(e)}")
-            return chapters
+        
+        # Add final chapter
+        chapter = report(finish_chapter())
+        if chapter:
+            yield chapter
 
     def _clean_title(self, title: str) -> str:
         """Clean up chapter title text."""
         return title.strip().replace('\u200b', ' ')
         
     def _clean_markdown(self, text: str) -> str:
-        """Clean up converted markdown text."""
-        # Remove page markers
-        text = text.replace('-', '')
-        # Remove other unwanted characters
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
+        """Clean up converted markdown text, keeping one line per line."""
+        lines = []
+        for line in text.split('\n'):
+            # Remove page markers and horizontal rules
+            if re.fullmatch(r'\s*([-*_]\s*){3,}', line):
+                continue
+            # Remove other unwanted whitespace
+            line = re.sub(r'\s+', ' ', line).strip()
+            if line:
+                lines.append(line)
+        return '\n'.join(lines)
+        
+    def _extract_chapter_text(self, pages, start_page: int, end_page: int, cleaner=None) -> str:
+        """Join the text of extracted pages, through the page cleaner if given.
         
-    def _extract_chapter_text(self, doc, start_page: int, end_page: int) -> str:
-        """Extract text from PDF pages."""
+        start_page and end_page are positions among the pages read, which are
+        the page numbers themselves unless only some pages were selected.
+        """
         chapter_text = []
         for page_num in range(start_page, end_page):
             try:
-                page = doc[page_num]
-                text = page.get_text()
+                if cleaner:
+                    text = cleaner.page_text(page_num)
+                else:
+                    text = pages[page_num]
                 chapter_text.append(text)
             except Exception as e:
                 if self.debug:
@@ -1048,10 +1042,98 @@ def process_chunk_sequential(chunk: str, kokoro: Kokoro, voice: str, speed: floa
         
         return None, None
 
+def normalize_chunk(text):
+    """Normalize a chunk for duplicate detection (Unicode form and whitespace)."""
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+class DuplicateChunks:
+    """Synthesize each distinct chunk of a book once and reuse its audio for repeats.
+
+    Books repeat text verbatim (epigraphs, scene breaks, refrains, boilerplate,
+    PDF running headers). A pre-pass hashes every normalized chunk; audio for a
+    chunk that occurs again is kept until its last repeat has used it.
+
+    Without ``chapters`` (chapters read lazily) there is no pre-pass: repeats
+    are still served from earlier chunk files, but no audio is kept in memory.
+    """
+
+    def __init__(self, chapters=None, chunk_size=1000):
+        self.remaining = Counter(
+            self.key(chunk)
+            for chapter in chapters or []
+            for chunk in chapter_chunks(chapter, chunk_size)
+        )
+        self.seen = Counter()
+        self.total = sum(self.remaining.values())
+        self.unique = len(self.remaining)
+        self.samples = {}  # key -> (samples, sample_rate) while repeats remain
+        self.files = {}  # key -> first chunk file written with this text
+        self.seconds = {}  # key -> inference seconds it took
+        self.reused = 0
+        self.saved_seconds = 0.0
+
+    @staticmethod
+    def key(chunk):
+        return hashlib.sha1(normalize_chunk(chunk).encode('utf-8')).hexdigest()
+
+    def _use(self, key):
+        self.remaining[key] -= 1
+        self.seen[key] += 1
+
+    def _reused(self, key):
+        self.reused += 1
+        self.saved_seconds += self.seconds.get(key, 0.0)
+
+    def lookup_samples(self, chunk):
+        """Return (samples, sample_rate) of an earlier identical chunk, or None."""
+        key = self.key(chunk)
+        self._use(key)
+        cached = self.samples.get(key)
+        if cached is None:
+            return None
+        if self.remaining[key] <= 0:
+            del self.samples[key]
+        self._reused(key)
+        return cached
+
+    def store_samples(self, chunk, samples, sample_rate, seconds):
+        """Remember a chunk's audio if the book repeats it later."""
+        key = self.key(chunk)
+        self.seconds[key] = seconds
+        if self.remaining[key] > 0:
+            self.samples[key] = (samples, sample_rate)
+
+    def lookup_file(self, chunk, chunk_file):
+        """Copy an earlier identical chunk's file to chunk_file; True if it did."""
+        key = self.key(chunk)
+        self._use(key)
+        source = self.files.get(key)
+        if source is None or not os.path.exists(source):
+            return False
+        shutil.copyfile(source, chunk_file)
+        self._reused(key)
+        return True
+
+    def store_file(self, chunk, chunk_file, seconds=None):
+        """Remember the file holding a chunk's audio."""
+        key = self.key(chunk)
+        self.files.setdefault(key, chunk_file)
+        if seconds is not None:
+            self.seconds[key] = seconds
+
+    def report(self):
+        """Print how much synthesis the reuse saved."""
+        total = self.total or sum(self.seen.values())
+        unique = self.unique or len(self.seen)
+        if total > unique:
+            print(f"\nDuplicate chunks: {unique} unique of {total}; reused audio {self.reused} time(s), "
+                  f"saving {self.saved_seconds:.1f}s of inference")
+
 def convert_text_to_audio(input_file, output_file=None, voice=None, speed=1.0, lang="en-us",
                          stream=False, split_output=None, format="wav", debug=False, stdin_indicators=None,
                          model_path="kokoro-v1.0.onnx", voices_path="voices-v1.0.bin", emotion=None,
-                         audio_effect="none", multispeaker=False):
+                         audio_effect="none", multispeaker=False, chapter_ranges=None, page_ranges=None,
+                         max_seconds=None):
     global stop_spinner
     
     # Define stdin indicators if not provided
@@ -1128,8 +1210,24 @@ def convert_text_to_audio(input_file, output_file=None, voice=None, speed=1.0, l
         sys.exit(1)
     
     # Read the input file (handle .txt or .epub)
-    if input_file.endswith('.epub'):
-        chapters = extract_chapters_from_epub(input_file, debug)
+    lazy_chapters = False
+    # A selection is applied while chapters are extracted, so reading stops early
+    selective = bool(chapter_ranges or page_ranges or max_seconds)
+    if page_ranges and not input_file.endswith('.pdf'):
+        print("Warning: --pages only applies to PDF input; ignoring it")
+    if input_file.endswith('.epub') and (stream or split_output or selective):
+        # Start synthesizing the first chapter while the rest is still unread
+        if not os.path.exists(input_file):
+            raise FileNotFoundError(f"EPUB file not found: {input_file}")
+        chapters = load_cached_chapters(input_file, lambda: iter_epub_chapters(input_file, debug))
+        first = next(chapters, None)
+        if first is None:
+            print("No chapters found in EPUB file.")
+            sys.exit(1)
+        chapters = itertools.chain([first], chapters)
+        lazy_chapters = True
+    elif input_file.endswith('.epub'):
+        chapters = list(load_cached_chapters(input_file, lambda: extract_chapters_from_epub(input_file, debug)))
         if not chapters:
             print("No chapters found in EPUB file.")
             sys.exit(1)
@@ -1157,9 +1255,18 @@ def convert_text_to_audio(input_file, output_file=None, voice=None, speed=1.0, l
                 print("Created chapter directories and info files")
                 
                 # Continue with existing processing code...
+    elif input_file.endswith('.pdf') and (stream or split_output or selective):
+        # Chapters come out as soon as their pages have been read
+        parser = PdfParser(input_file, debug=debug, pages=page_ranges)
+        if page_ranges:
+            # Part of a book is not cached as the whole book
+            chapters = parser.iter_chapters()
+        else:
+            chapters = load_cached_chapters(input_file, parser.iter_chapters)
+        lazy_chapters = True
     elif input_file.endswith('.pdf'):
         parser = PdfParser(input_file, debug=debug)
-        chapters = parser.get_chapters()
+        chapters = list(load_cached_chapters(input_file, parser.get_chapters))
     else:
         # Handle stdin specially (cross-platform)
         if input_file in stdin_indicators:
@@ -1170,25 +1277,48 @@ def convert_text_to_audio(input_file, output_file=None, voice=None, speed=1.0, l
         # Treat single text file as one chapter
         chapters = [{'title': 'Chapter 1', 'content': text}]
 
+    if selective:
+        from kokoro_tts.selection import select_chapters, limit_duration
+        if chapter_ranges:
+            chapters = select_chapters(chapters, chapter_ranges)
+        if max_seconds:
+            chapters = limit_duration(chapters, max_seconds, speed)
+        chapters = iter(chapters)
+        first = next(chapters, None)
+        if first is None:
+            print("No chapters selected.")
+            sys.exit(1)
+        chapters = itertools.chain([first], chapters)
+        lazy_chapters = True
+        if not (stream or split_output):
+            # Combined output needs the whole selection up front
+            chapters = list(chapters)
+            lazy_chapters = False
+
+    # Repeated chunks (epigraphs, scene breaks, boilerplate) are synthesized once
+    duplicates = DuplicateChunks(None if lazy_chapters else chapters)
+
     if stream:
         import asyncio
         # Stream each chapter
         for chapter in chapters:
             print(f"\nStreaming: {chapter['title']}")
-            chunks = chunk_text(chapter['content'], initial_chunk_size=1000)
-            asyncio.run(stream_audio(kokoro, chapter['content'], voice, speed, lang, debug))
+            asyncio.run(stream_audio(kokoro, chapter['content'], voice, speed, lang, debug,
+                                     chunks=chapter_chunks(chapter)))
     else:
         if split_output:
             os.makedirs(split_output, exist_ok=True)
             
+            chapter_num = 0
             for chapter_num, chapter in enumerate(chapters, 1):
-                chapter_dir = os.path.join(split_output, f"chapter_{chapter_num:03d}")
+                # Selected chapters keep their number in the book
+                chapter_dir = os.path.join(split_output, f"chapter_{chapter.get('number', chapter_num):03d}")
                 
                 # Skip if chapter is already fully processed
                 if os.path.exists(chapter_dir):
                     info_file = os.path.join(chapter_dir, "info.txt")
                     if os.path.exists(info_file):
-                        chunks = chunk_text(chapter['content'], initial_chunk_size=1000)
+                        chunks = chapter_chunks(chapter)
                         total_chunks = len(chunks)
                         existing_chunks = len([f for f in os.listdir(chapter_dir) 
                                             if f.startswith("chunk_") and f.endswith(f".{format}")])
@@ -1208,7 +1338,7 @@ def convert_text_to_audio(input_file, output_file=None, voice=None, speed=1.0, l
                     with open(info_file, "w", encoding="utf-8") as f:
                         f.write(f"Title: {chapter['title']}\n")
                 
-                chunks = chunk_text(chapter['content'], initial_chunk_size=1000)
+                chunks = chapter_chunks(chapter)
                 total_chunks = len(chunks)
                 processed_chunks = len([f for f in os.listdir(chapter_dir) 
                                      if f.startswith("chunk_") and f.endswith(f".{format}")])
@@ -1220,6 +1350,7 @@ def convert_text_to_audio(input_file, output_file=None, voice=None, speed=1.0, l
                     # Skip if chunk file already exists (regardless of position)
                     chunk_file = os.path.join(chapter_dir, f"chunk_{chunk_num:03d}.{format}")
                     if os.path.exists(chunk_file):
+                        duplicates.store_file(chunk, chunk_file)
                         continue  # Don't increment processed_chunks here since we counted them above
                     
                     # Create progress bar
@@ -1235,13 +1366,18 @@ def convert_text_to_audio(input_file, output_file=None, voice=None, speed=1.0, l
                     spinner_thread.start()
                     
                     try:
-                        samples, sample_rate = process_chunk_sequential(
-                            chunk, kokoro, voice, speed, lang, 
-                            retry_count=0, debug=debug  # Add retry parameters
-                        )
-                        if samples is not None:
-                            sf.write(chunk_file, samples, sample_rate)
+                        if duplicates.lookup_file(chunk, chunk_file):
                             processed_chunks += 1
+                        else:
+                            start = time.perf_counter()
+                            samples, sample_rate = process_chunk_sequential(
+                                chunk, kokoro, voice, speed, lang, 
+                                retry_count=0, debug=debug  # Add retry parameters
+                            )
+                            if samples is not None:
+                                sf.write(chunk_file, samples, sample_rate)
+                                duplicates.store_file(chunk, chunk_file, time.perf_counter() - start)
+                                processed_chunks += 1
                     except Exception as e:
                         print(f"\nError processing chunk {chunk_num}: {e}")
                     
@@ -1256,7 +1392,8 @@ def convert_text_to_audio(input_file, output_file=None, voice=None, speed=1.0, l
                 if stop_audio:  # Check for interruption
                     break
             
-            print(f"\nCreated audio files for {len(chapters)} chapters in {split_output}/")
+            duplicates.report()
+            print(f"\nCreated audio files for {chapter_num} chapters in {split_output}/")
         else:
             # Combine all chapters into one file
             all_samples = []
@@ -1264,7 +1401,7 @@ def convert_text_to_audio(input_file, output_file=None, voice=None, speed=1.0, l
             
             for chapter_num, chapter in enumerate(chapters, 1):
                 print(f"\nProcessing: {chapter['title']}")
-                chunks = chunk_text(chapter['content'], initial_chunk_size=1000)
+                chunks = chapter_chunks(chapter)
                 processed_chunks = 0
                 total_chunks = len(chunks)
                 
@@ -1287,15 +1424,22 @@ def convert_text_to_audio(input_file, output_file=None, voice=None, speed=1.0, l
                             adjusted_speed *= emotion_profile["speed"]
 
                         # Process based on whether multispeaker mode is enabled
-                        if multispeaker:
-                            samples, sample_rate = process_multispeaker_text(
-                                chunk, kokoro, voice, adjusted_speed, lang
-                            )
+                        cached = duplicates.lookup_samples(chunk)
+                        if cached is not None:
+                            samples, sr = cached
                         else:
-                            samples, sr = process_chunk_sequential(
-                                chunk, kokoro, voice, adjusted_speed, lang,
-                                retry_count=0, debug=debug  # Add retry parameters
-                            )
+                            start = time.perf_counter()
+                            if multispeaker:
+                                samples, sr = process_multispeaker_text(
+                                    chunk, kokoro, voice, adjusted_speed, lang
+                                )
+                            else:
+                                samples, sr = process_chunk_sequential(
+                                    chunk, kokoro, voice, adjusted_speed, lang,
+                                    retry_count=0, debug=debug  # Add retry parameters
+                                )
+                            if samples is not None:
+                                duplicates.store_samples(chunk, samples, sr, time.perf_counter() - start)
 
                         if samples is not None:
                             if sample_rate is None:
@@ -1310,6 +1454,7 @@ def convert_text_to_audio(input_file, output_file=None, voice=None, speed=1.0, l
                 
                 print(f"\nCompleted {chapter['title']}: {processed_chunks}/{total_chunks} chunks processed")
             
+            duplicates.report()
             if all_samples:
                 print("\nSaving complete audio file...")
                 if not output_file:
@@ -1317,13 +1462,14 @@ def convert_text_to_audio(input_file, output_file=None, voice=None, speed=1.0, l
                 sf.write(output_file, all_samples, sample_rate)
                 print(f"Created {output_file}")
 
-async def stream_audio(kokoro, text, voice, speed, lang, debug=False):
+async def stream_audio(kokoro, text, voice, speed, lang, debug=False, chunks=None):
     global stop_spinner, stop_audio
     stop_spinner = False
     stop_audio = False
     
     print("Starting audio stream...")
-    chunks = chunk_text(text, initial_chunk_size=1000)
+    if chunks is None:
+        chunks = chunk_text(text, initial_chunk_size=1000)
     
     for i, chunk in enumerate(chunks, 1):
         if stop_audio:
@@ -1496,7 +1642,19 @@ def get_valid_options():
         '--format',
         '--debug',
         '--model',
-        '--voices'
+        '--voices',
+        '--manifest',
+        '--out-dir',
+        '--workers',
+        '--batch-dir',
+        '--watch',
+        '--queue',
+        '--worker',
+        '--chapters',
+        '--pages',
+        '--max-seconds',
+        '--audition',
+        '--audition-voices'
     }
 
 
@@ -1518,7 +1676,9 @@ def main():
         if arg.startswith('--') and arg not in valid_options:
             unknown_options.append(arg)
             # Skip the next argument if it's a value for an option that takes parameters
-        elif arg in {'--speed', '--lang', '--voice', '--split-output', '--format', '--model', '--voices'}:
+        elif arg in {'--speed', '--lang', '--voice', '--split-output', '--format', '--model', '--voices',
+                     '--manifest', '--out-dir', '--workers', '--batch-dir', '--queue',
+                     '--chapters', '--pages', '--max-seconds', '--audition', '--audition-voices'}:
             i += 1
         i += 1
     
@@ -1550,6 +1710,7 @@ def main():
                 model_path = sys.argv[i + 1]
             elif arg == '--voices' and i + 1 < len(sys.argv):
                 voices_path = sys.argv[i + 1]
+        model_path, voices_path = resolve_model_paths(model_path, voices_path, "voices-v1.0.bin")
 
         print_supported_languages(model_path, voices_path)
         sys.exit(0)
@@ -1564,6 +1725,7 @@ def main():
                 model_path = sys.argv[i + 1]
             elif arg == '--voices' and i + 1 < len(sys.argv):
                 voices_path = sys.argv[i + 1]
+        model_path, voices_path = resolve_model_paths(model_path, voices_path, "voices-v1.0.bin")
 
         print_supported_voices(model_path, voices_path)
         sys.exit(0)
@@ -1595,6 +1757,18 @@ def main():
     audio_effect = "none"  # default audio effect
     multispeaker = False  # default multispeaker mode
     preset_name = None  # default preset name
+    manifest = None  # JSONL manifest for bulk rendering
+    out_dir = None  # output directory for manifest mode
+    workers = None  # manifest/batch sessions (default: one per two CPU cores, up to 4)
+    batch_dir = None  # directory of books to convert with one model load
+    watch = '--watch' in sys.argv  # keep polling --batch-dir for new books
+    queue_dir = None  # shared work queue directory for rendering across machines
+    worker = '--worker' in sys.argv  # render items from --queue instead of an input file
+    chapter_ranges = None  # only render these chapters
+    page_ranges = None  # only read these PDF pages
+    max_seconds = None  # stop after this much estimated audio
+    audition = None  # sample text to render with every voice
+    audition_voices = None  # voices for --audition (default: all)
     
     # Parse optional arguments
     for i, arg in enumerate(sys.argv):
@@ -1667,6 +1841,48 @@ def main():
             model_path = sys.argv[i + 1]
         elif arg == '--voices' and i + 1 < len(sys.argv):
             voices_path = sys.argv[i + 1]
+        elif arg == '--manifest' and i + 1 < len(sys.argv):
+            manifest = sys.argv[i + 1]
+        elif arg == '--queue' and i + 1 < len(sys.argv):
+            queue_dir = sys.argv[i + 1]
+        elif arg == '--batch-dir' and i + 1 < len(sys.argv):
+            batch_dir = sys.argv[i + 1]
+        elif arg == '--out-dir' and i + 1 < len(sys.argv):
+            out_dir = sys.argv[i + 1]
+        elif arg == '--workers' and i + 1 < len(sys.argv):
+            try:
+                workers = int(sys.argv[i + 1])
+                if workers < 1:
+                    raise ValueError
+            except ValueError:
+                print("Error: Workers must be a positive whole number")
+                sys.exit(1)
+        elif arg in ('--chapters', '--pages') and i + 1 < len(sys.argv):
+            from kokoro_tts.selection import parse_ranges
+            try:
+                ranges = parse_ranges(sys.argv[i + 1])
+            except ValueError as e:
+                print(f"Error: {arg}: {e}")
+                sys.exit(1)
+            if arg == '--chapters':
+                chapter_ranges = ranges
+            else:
+                page_ranges = ranges
+        elif arg == '--audition' and i + 1 < len(sys.argv):
+            audition = sys.argv[i + 1]
+        elif arg == '--audition-voices' and i + 1 < len(sys.argv):
+            audition_voices = sys.argv[i + 1]
+        elif arg == '--max-seconds' and i + 1 < len(sys.argv):
+            try:
+                max_seconds = float(sys.argv[i + 1])
+                if max_seconds <= 0:
+                    raise ValueError
+            except ValueError:
+                print("Error: Max seconds must be a positive number")
+                sys.exit(1)
+    
+    # --model may name a model from the registry (models.json) instead of a file
+    model_path, voices_path = resolve_model_paths(model_path, voices_path, "voices-v1.0.bin")
     
     # Handle merge chunks operation
     if merge_chunks:
@@ -1676,6 +1892,71 @@ def main():
         merge_chunks_to_chapters(split_output, format)
         sys.exit(0)
     
+    # Handle bulk manifest rendering (one model load for every line)
+    if manifest:
+        if not out_dir:
+            print("Error: --out-dir must be specified when using --manifest")
+            sys.exit(1)
+        if not os.access(manifest, os.R_OK):
+            print(f"Error: Cannot read from {manifest}. File may not exist or you may not have permission to read it.")
+            sys.exit(1)
+        check_required_files(model_path, voices_path)
+        from kokoro_tts.manifest import run_manifest
+        summary = run_manifest(manifest, out_dir, model_path=model_path, voices_path=voices_path,
+                               voice=voice or "af_sarah", speed=speed, lang=lang, format=format,
+                               workers=workers, debug='--debug' in sys.argv)
+        sys.exit(1 if summary["failures"] else 0)
+    
+    # Handle the voice audition matrix (one sample text, every voice)
+    if audition is not None:
+        if not out_dir:
+            print("Error: --out-dir must be specified when using --audition")
+            sys.exit(1)
+        if not audition.strip():
+            print("Error: --audition needs some sample text")
+            sys.exit(1)
+        check_required_files(model_path, voices_path)
+        from kokoro_tts.audition import run_audition
+        try:
+            index = run_audition(audition, out_dir, model_path=model_path, voices_path=voices_path,
+                                 voices=audition_voices, speed=speed, lang=lang, format=format,
+                                 workers=workers, debug='--debug' in sys.argv)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        sys.exit(1 if any(clip["status"] == "failed" for clip in index["clips"]) else 0)
+    
+    # Handle directory batch mode (every book in a directory, optionally watching for more)
+    if batch_dir:
+        if not out_dir:
+            print("Error: --out-dir must be specified when using --batch-dir")
+            sys.exit(1)
+        check_required_files(model_path, voices_path)
+        from kokoro_tts.batch_dir import run_batch_dir
+        results = run_batch_dir(batch_dir, out_dir, model_path=model_path, voices_path=voices_path,
+                                voice=voice or "af_sarah", speed=speed, lang=lang, format=format,
+                                workers=workers, watch=watch, debug='--debug' in sys.argv)
+        sys.exit(1 if any(result["failed"] for result in results.values()) else 0)
+    
+    # Handle the shared work queue: workers render chunks that a coordinator queued
+    if worker:
+        if not queue_dir:
+            print("Error: --queue directory must be specified when using --worker")
+            sys.exit(1)
+        check_required_files(model_path, voices_path)
+        from kokoro_tts.work_queue import run_worker
+        run_worker(queue_dir, model_path=model_path, voices_path=voices_path, workers=workers,
+                   debug='--debug' in sys.argv)
+        sys.exit(0)
+    if queue_dir:
+        if not input_file or not split_output:
+            print("Error: An input file and --split-output directory are required to coordinate a --queue")
+            sys.exit(1)
+        from kokoro_tts.work_queue import run_coordinator
+        ok = run_coordinator(input_file, queue_dir, split_output, voice=voice or "af_sarah", speed=speed,
+                             lang=lang, format=format, debug='--debug' in sys.argv)
+        sys.exit(0 if ok else 1)
+    
     # Normal processing mode
     if not input_file:
         print("Error: Input file required for text-to-speech conversion")
@@ -1701,7 +1982,8 @@ def main():
                          format=format, debug=debug, stdin_indicators=stdin_indicators,
                          model_path=model_path, voices_path=voices_path,
                          emotion=emotion, audio_effect=audio_effect,
-                         multispeaker=multispeaker)
+                         multispeaker=multispeaker, chapter_ranges=chapter_ranges,
+                         page_ranges=page_ranges, max_seconds=max_seconds)
 
 
 if __name__ == '__main__':
@@ -5,36 +5,36 @@ A full-featured web application for text-to-speech with multi-voice blending
 """
 
 import os
-import tempfile
 import threading
 from flask import Flask, render_template, request, jsonify, send_file
-from kokoro_onnx import Kokoro
 import numpy as np
-import soundfile as sf
 import io
-import base64
 import json
-from kokoro_tts import validate_voice, get_all_emotion_profiles, get_all_audio_effects
+from kokoro_tts import get_all_emotion_profiles, get_all_audio_effects
+from kokoro_tts.server import serve
+from kokoro_tts.web_service import service_api, create_kokoro, attach_model, wake_model, model_resident, model_available, synthesize, get_coalescing_stats, admit_request, get_scheduler_stats, get_idle_stats, ModelUnavailable, get_model_paths
+from kokoro_tts.model_registry import UnknownModel
+from kokoro_tts.scheduler import DeadlineExceeded
 
 app = Flask(__name__)
+app.register_blueprint(service_api)
 
-# Global variables for the Kokoro model
-kokoro = None
-model_loaded = False
+# Voices and languages of the loaded model (the model itself lives in web_service's session pool)
 available_voices = []
 available_languages = []
 
 def load_model():
     """Load the Kokoro model if files exist"""
-    global kokoro, model_loaded, available_voices, available_languages
+    global available_voices, available_languages
     
-    model_path = "./kokoro-v1.0.onnx"
-    voices_path = "./voices-v1.0.bin"
+    # Default model from the registry (models.json, or the files in the current directory)
+    model_path, voices_path = get_model_paths()
     
     if os.path.exists(model_path) and os.path.exists(voices_path):
         try:
-            kokoro = Kokoro(model_path, voices_path)
-            model_loaded = True
+            # The session pool owns the model, so an idle unload can release it
+            kokoro = create_kokoro(model_path, voices_path)
+            attach_model(kokoro)
             
             # Get available voices and languages
             available_voices = sorted(list(kokoro.get_voices()))
@@ -43,23 +43,22 @@ def load_model():
             print(f"Model loaded successfully. Available voices: {len(available_voices)}, languages: {len(available_languages)}")
         except Exception as e:
             print(f"Failed to load model: {str(e)}")
-            model_loaded = False
     else:
-        print("Model files not found. Please check that kokoro-v1.0.onnx and voices-v1.0.bin are in the current directory.")
+        print(f"Model files not found. Please check that {model_path} and {voices_path} exist.")
 
 @app.route('/')
 def index():
-    if not model_loaded:
-        load_model()
+    # Load (or reload after an idle unload) in the background rather than blocking this request
+    wake_model(load_model)
     
     return render_template('index.html', 
                           voices=available_voices, 
                           languages=available_languages,
-                          model_loaded=model_loaded)
+                          model_loaded=model_resident())
 
 @app.route('/api/convert', methods=['POST'])
 def convert_text():
-    if not model_loaded:
+    if not model_available():
         return jsonify({"error": "Model not loaded"}), 500
     
     data = request.json
@@ -68,58 +67,58 @@ def convert_text():
     speed = float(data.get('speed', 1.0))
     language = data.get('language', 'en-us')
     effect = data.get('effect', 'none')  # New effect parameter
+    model = data.get('model')  # Registry model name (default model if omitted)
     
     if not text:
         return jsonify({"error": "No text provided"}), 400
     
     try:
-        # Process the voice blend if it contains commas (indicating multiple voices)
-        processed_voice = voice
-        if ',' in voice:
-            # Use validate_voice to process the voice blend
-            processed_voice = validate_voice(voice, kokoro)
-        elif voice not in kokoro.get_voices():
-            # Validate single voice
-            processed_voice = validate_voice(voice, kokoro)
-        
-        # Create audio using the processed voice
-        samples, sample_rate = kokoro.create(text, voice=processed_voice, speed=speed, lang=language)
-        
+        # Pick the priority class and turn away requests that cannot meet their deadline
+        admission = admit_request(text, speed, data.get('priority'))
+    except DeadlineExceeded as e:
+        return jsonify({
+            "error": str(e),
+            "estimated_seconds": round(e.estimated_seconds, 3)
+        }), 503
+    except ValueError:
+        return jsonify({"error": "X-Deadline-Ms must be a number of milliseconds"}), 400
+    
+    try:
+        # Identical requests already in flight share a single synthesis
+        audio_data = synthesize(admission["text"], voice, speed, language, admission["priority"], model)
+
         # Note: Actual audio effects would be applied here if the kokoro library supported them
         # For now, we pass the parameters along but the actual effects depend on the underlying library
-        
-        # Write to temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as tmp_file:
-            sf.write(tmp_file.name, samples, sample_rate)
-            audio_path = tmp_file.name
-        
-        # Encode to base64 for transmission
-        with open(audio_path, 'rb') as f:
-            audio_data = base64.b64encode(f.read()).decode('utf-8')
-        
-        # Clean up temp file
-        os.unlink(audio_path)
-        
+
         return jsonify({
             "success": True,
             "audio_data": audio_data,
             "format": "audio/wav",
-            "effect": effect
+            "effect": effect,
+            "priority": admission["priority"],
+            "estimated_seconds": admission["estimated_seconds"],
+            "truncated": admission["truncated"]
         })
+
+    except UnknownModel as e:
+        return jsonify({"error": str(e)}), 400
+
+    except ModelUnavailable as e:
+        return jsonify({"error": str(e)}), 503
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/voices')
 def get_voices():
-    if not model_loaded:
-        load_model()
+    # Load (or reload after an idle unload) in the background rather than blocking this request
+    wake_model(load_model)
     return jsonify({"voices": available_voices})
 
 @app.route('/api/languages')
 def get_languages():
-    if not model_loaded:
-        load_model()
+    # Load (or reload after an idle unload) in the background rather than blocking this request
+    wake_model(load_model)
     return jsonify({"languages": available_languages})
 
 @app.route('/api/emotions')
@@ -135,15 +134,17 @@ def get_effects():
 @app.route('/api/status')
 def get_status():
     return jsonify({
-        "model_loaded": model_loaded,
+        "model_loaded": model_resident(),
         "voices_count": len(available_voices) if available_voices else 0,
-        "languages_count": len(available_languages) if available_languages else 0
+        "languages_count": len(available_languages) if available_languages else 0,
+        "coalescing": get_coalescing_stats(),
+        "scheduler": get_scheduler_stats(),
+        "idle": get_idle_stats()
     })
 
 def main():
     """Main function to run the web application"""
-    load_model()
-    app.run(debug=True, port=5001)
+    serve(app, load_model, prog="kokoro-app")
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
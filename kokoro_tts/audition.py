@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Voice audition matrix for Kokoro Desktop
+Renders one sample text with every voice (or a chosen subset, or blends) in
+parallel on a pool of sessions, and writes a labelled clip per voice plus an
+index of durations and render timings. Clips are cached on disk by text,
+voice and settings, so a matrix that was rendered before is ready at once,
+without loading the model.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import fnmatch
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import soundfile as sf
+
+from kokoro_tts import chunk_text, process_chunk_sequential, validate_voice
+from kokoro_tts.manifest import create_sessions, check_voice, default_workers, model_fingerprint
+from kokoro_tts.session_pool import SessionPool, clone_kokoro
+from kokoro_tts.streaming import sentence_gap
+
+AUDITION_CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+                                  "kokoro-tts", "audition")
+
+# Least recently used clips beyond this many are deleted
+AUDITION_CACHE_MAX_ENTRIES = 1000
+
+INDEX_FILE = "index.json"
+
+
+def list_voices(voices_path):
+    """Voice names in a voices file, without loading the model."""
+    with np.load(voices_path) as voices:
+        return sorted(voices.files)
+
+
+def pick_voices(spec, available):
+    """Voices to audition from a list like "af_* am_adam af_sarah:60,am_adam:40".
+
+    Entries are separated by spaces or semicolons; names may use shell-style
+    wildcards, and blends are kept as they are. No spec means every voice.
+
+    Raises:
+        ValueError: If a name or pattern matches no voice
+    """
+    if not spec:
+        return list(available)
+    voices = []
+    for entry in spec.replace(';', ' ').split():
+        if ',' in entry or ':' in entry:
+            matches = [entry]
+        else:
+            matches = fnmatch.filter(available, entry)
+            if not matches:
+                raise ValueError(f"No voice matches '{entry}'")
+        voices.extend(voice for voice in matches if voice not in voices)
+    return voices
+
+
+def clip_label(voice):
+    """File name stem for a voice or blend: af_sarah:60,am_adam:40 -> af_sarah-60+am_adam-40"""
+    return voice.replace(':', '-').replace(',', '+').replace(' ', '')
+
+
+def clip_key(text, voice, speed, lang, model_path, voices_path):
+    """Hash of everything that determines a clip's audio.
+
+    The model files are identified by path, size and modification time, as
+    the cache is shared by every model on the machine.
+    """
+    settings = [text, voice, round(speed, 3), lang, model_fingerprint(model_path, voices_path)]
+    return hashlib.sha256(json.dumps(settings).encode('utf-8')).hexdigest()
+
+
+def _clip_path(key):
+    return os.path.join(AUDITION_CACHE_DIR, f"{key}.wav")
+
+
+def cached_clip(key):
+    """Return (wav path, metadata) of a cached clip, or None."""
+    path = _clip_path(key)
+    try:
+        with open(path[:-4] + ".json", 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        os.utime(path)  # Most recently used
+    except (OSError, ValueError):
+        return None
+    return path, meta
+
+
+def store_clip(key, samples, sample_rate, render_seconds):
+    """Cache a rendered clip; return its metadata."""
+    meta = {
+        "duration": round(len(samples) / sample_rate, 3),
+        "render_seconds": round(render_seconds, 3),
+    }
+    try:
+        os.makedirs(AUDITION_CACHE_DIR, exist_ok=True)
+        path = _clip_path(key)
+        sf.write(path + ".part", samples, sample_rate, format='WAV')
+        os.replace(path + ".part", path)
+        with open(path[:-4] + ".json", 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        prune()
+    except OSError:
+        pass  # No writable cache: the clip is still returned
+    return meta
+
+
+def prune(max_entries=AUDITION_CACHE_MAX_ENTRIES):
+    """Delete the least recently used clips beyond max_entries."""
+    clips = []
+    for name in os.listdir(AUDITION_CACHE_DIR):
+        if name.endswith('.wav'):
+            try:
+                clips.append((os.path.getmtime(os.path.join(AUDITION_CACHE_DIR, name)), name))
+            except OSError:
+                continue
+    clips.sort(reverse=True)
+    for _mtime, name in clips[max_entries:]:
+        for path in (name, name[:-4] + ".json"):
+            try:
+                os.unlink(os.path.join(AUDITION_CACHE_DIR, path))
+            except OSError:
+                pass
+
+
+def render_matrix(text, voices, speed, lang, model_path, voices_path, render, workers=1,
+                  cancel=None, on_clip=None):
+    """Render text with each voice, from the cache where possible.
+
+    Args:
+        render: Callable(voice) -> (samples, sample_rate), called from
+            ``workers`` threads at once for the voices not yet cached
+        cancel: threading.Event; voices not started when it is set are skipped
+        on_clip: Called with each result as it finishes
+
+    Returns:
+        List of results in voice order: dicts with 'voice', 'label', 'status'
+        (cached, synthesized or failed), 'path' of the cached WAV clip,
+        'duration' and 'render_seconds', or 'error'
+    """
+    results = {}
+    todo = []
+    for voice in voices:
+        key = clip_key(text, voice, speed, lang, model_path, voices_path)
+        cached = cached_clip(key)
+        if cached:
+            results[voice] = dict(voice=voice, label=clip_label(voice), status="cached", path=cached[0], **cached[1])
+            if on_clip:
+                on_clip(results[voice])
+        else:
+            todo.append((voice, key))
+
+    def work(voice, key):
+        if cancel is not None and cancel.is_set():
+            return dict(voice=voice, label=clip_label(voice), status="failed", error="Cancelled")
+        started = time.perf_counter()
+        samples, sample_rate = render(voice)
+        meta = store_clip(key, samples, sample_rate, time.perf_counter() - started)
+        path = _clip_path(key)
+        if not os.path.exists(path):
+            # Cache not writable: keep the clip in memory for the caller
+            return dict(voice=voice, label=clip_label(voice), status="synthesized", path=None,
+                        samples=samples, sample_rate=sample_rate, **meta)
+        return dict(voice=voice, label=clip_label(voice), status="synthesized", path=path, **meta)
+
+    if todo:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(todo)))) as executor:
+            futures = {executor.submit(work, voice, key): voice for voice, key in todo}
+            for future in as_completed(futures):
+                voice = futures[future]
+                try:
+                    results[voice] = future.result()
+                except Exception as e:
+                    results[voice] = dict(voice=voice, label=clip_label(voice), status="failed", error=str(e))
+                if on_clip:
+                    on_clip(results[voice])
+    return [results[voice] for voice in voices]
+
+
+def session_renderer(sessions, text, speed, lang, debug=False):
+    """A render(voice) function that synthesizes on a pool of sessions."""
+    styles = {}
+    styles_lock = threading.Lock()
+
+    def render(voice):
+        with sessions.session() as session:
+            with styles_lock:
+                if voice not in styles:
+                    check_voice(voice, session)
+                    styles[voice] = validate_voice(voice, session)
+            parts = []
+            sample_rate = None
+            for chunk in chunk_text(text, initial_chunk_size=1000):
+                samples, sample_rate = process_chunk_sequential(chunk, session, styles[voice], speed, lang,
+                                                                debug=debug)
+                if samples is None:
+                    raise RuntimeError("Synthesis failed")
+                if parts:
+                    parts.append(sentence_gap(sample_rate))
+                parts.append(np.asarray(samples, dtype=np.float32))
+        return np.concatenate(parts), sample_rate
+    return render
+
+
+def write_clip(result, out_dir, format="wav"):
+    """Write a result's clip into out_dir as <label>.<format>; return the file name."""
+    name = f"{result['label']}.{format}"
+    target = os.path.join(out_dir, name)
+    if result.get('path') and format == "wav":
+        shutil.copyfile(result['path'], target)
+    elif result.get('path'):
+        samples, sample_rate = sf.read(result['path'], dtype='float32')
+        sf.write(target, samples, sample_rate)
+    else:
+        sf.write(target, result['samples'], result['sample_rate'])
+    return name
+
+
+def run_audition(text, out_dir, model_path="kokoro-v1.0.onnx", voices_path="voices-v1.0.bin", voices=None,
+                 speed=1.0, lang="en-us", format="wav", workers=None, kokoro=None, cancel=None, debug=False):
+    """Render text with every chosen voice into out_dir and write index.json.
+
+    Args:
+        voices: Voice list spec for pick_voices (default: every voice)
+        kokoro: An already loaded model to render with; otherwise the model is
+            loaded, only if some clips are not cached yet
+
+    Returns:
+        dict: The index
+    """
+    voices = pick_voices(voices, list_voices(voices_path))
+    os.makedirs(out_dir, exist_ok=True)
+    start = time.perf_counter()
+
+    uncached = [voice for voice in voices
+                if not cached_clip(clip_key(text, voice, speed, lang, model_path, voices_path))]
+    workers = max(1, min(workers or default_workers(), len(uncached) or 1))
+    sessions = None
+    if uncached:
+        if kokoro is not None:
+            sessions = SessionPool([kokoro] + [clone_kokoro(kokoro) for _ in range(workers - 1)])
+        else:
+            print(f"Loading model with {workers} session(s)...")
+            sessions = create_sessions(model_path, voices_path, workers)
+    print(f"Auditioning {len(voices)} voice(s), {len(voices) - len(uncached)} cached")
+
+    def progress(result):
+        sys.stdout.write(f"\r\033[KRendered {result['label']} ({result['status']})")
+        sys.stdout.flush()
+
+    results = render_matrix(text, voices, speed, lang, model_path, voices_path,
+                            session_renderer(sessions, text, speed, lang, debug) if sessions else None,
+                            workers=workers, cancel=cancel, on_clip=progress)
+    print()
+
+    clips = []
+    for result in results:
+        entry = {"voice": result['voice'], "status": result['status']}
+        if result['status'] == "failed":
+            entry["error"] = result['error']
+        else:
+            entry["file"] = write_clip(result, out_dir, format)
+            entry["duration"] = result['duration']
+            entry["render_seconds"] = result['render_seconds']
+        clips.append(entry)
+
+    index = {
+        "text": text,
+        "speed": speed,
+        "lang": lang,
+        "model": os.path.basename(model_path),
+        "total_seconds": round(time.perf_counter() - start, 3),
+        "clips": clips,
+    }
+    with open(os.path.join(out_dir, INDEX_FILE), 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2)
+
+    print(f"\n{'Voice':<32} {'Duration':>9} {'Render':>8}")
+    for entry in clips:
+        if entry['status'] == "failed":
+            print(f"{entry['voice']:<32} failed: {entry['error']}")
+        else:
+            cached = " (cached)" if entry['status'] == "cached" else ""
+            print(f"{entry['voice']:<32} {entry['duration']:>8.2f}s {entry['render_seconds']:>7.2f}s{cached}")
+    print(f"\nWrote {sum(entry['status'] != 'failed' for entry in clips)} clip(s) and {INDEX_FILE} "
+          f"to {out_dir} in {index['total_seconds']}s")
+    return index
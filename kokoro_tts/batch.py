@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Batch synthesis for the Kokoro Desktop web applications
+Many short utterances are synthesized across the session pool in one request
+and streamed back as a zip archive or a multipart response, each item with
+its own timings.
+"""
+
+import re
+import json
+import time
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Most items accepted in one batch request
+BATCH_MAX_ITEMS = 1000
+
+# Response formats: a zip archive of WAV files plus manifest.json, or a
+# multipart/mixed stream with one part per item and the manifest last
+BATCH_FORMATS = ('zip', 'multipart')
+
+
+def parse_batch_items(items, voice='af_sarah', speed=1.0, language='en-us'):
+    """Validate batch items and fill in the batch-wide defaults.
+
+    Args:
+        items: List of {"id", "text", "voice", "speed", "lang"} dicts
+        voice, speed, language: Defaults for items that leave them out
+
+    Returns:
+        list: One dict per item with id, text, voice, speed, language and filename
+
+    Raises:
+        ValueError: If the list or an item is not valid
+    """
+    if not isinstance(items, list) or not items:
+        raise ValueError("Provide a non-empty \"items\" list")
+    if len(items) > BATCH_MAX_ITEMS:
+        raise ValueError(f"A batch holds at most {BATCH_MAX_ITEMS} items, got {len(items)}")
+
+    parsed = []
+    seen = set()
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            raise ValueError(f"Item {index} must be an object")
+        item_id = str(item.get('id', index))
+        if item_id in seen:
+            raise ValueError(f"Duplicate item id: {item_id}")
+        seen.add(item_id)
+
+        text = item.get('text', '')
+        if not isinstance(text, str) or not text.strip():
+            raise ValueError(f"Item {item_id} has no text")
+        try:
+            item_speed = float(item.get('speed', speed))
+        except (TypeError, ValueError):
+            raise ValueError(f"Item {item_id} has an invalid speed")
+
+        parsed.append({
+            'id': item_id,
+            'text': text,
+            'voice': item.get('voice', voice),
+            'speed': item_speed,
+            'language': item.get('lang', item.get('language', language)),
+            'filename': re.sub(r'[^A-Za-z0-9._-]+', '_', item_id) + '.wav',
+        })
+
+    # Sanitizing can make distinct ids collide ("a b" and "a_b")
+    filenames = set()
+    for item in parsed:
+        base, n = item['filename'][:-4], 1
+        while item['filename'] in filenames:
+            n += 1
+            item['filename'] = f"{base}-{n}.wav"
+        filenames.add(item['filename'])
+    return parsed
+
+
+def run_batch(items, render, key, workers):
+    """Synthesize batch items concurrently, yielding each as soon as it is done.
+
+    Identical items (same ``key``) are synthesized once. Unique items are
+    started longest first so a long item does not finish alone at the end
+    while the other workers sit idle.
+
+    Args:
+        items: Items from parse_batch_items
+        render: Function (item) returning (samples, sample_rate)
+        key: Function (item) returning the key identical items share
+        workers: Items synthesized at once
+
+    Yields:
+        tuple: (item, samples, sample_rate, timing) in completion order;
+        samples is None and timing["error"] is set when an item failed
+    """
+    batch_start = time.perf_counter()
+    groups = {}
+    for item in items:
+        groups.setdefault(key(item), []).append(item)
+
+    def task(item):
+        started = time.perf_counter()
+        samples, sample_rate = render(item)
+        return samples, sample_rate, started - batch_start, time.perf_counter() - started
+
+    order = sorted(groups.values(), key=lambda group: len(group[0]['text']), reverse=True)
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(order)))) as executor:
+        futures = {executor.submit(task, group[0]): group for group in order}
+        for future in as_completed(futures):
+            group = futures[future]
+            try:
+                samples, sample_rate, queued, seconds = future.result()
+            except Exception as e:
+                for item in group:
+                    yield item, None, None, {"error": str(e)}
+                continue
+
+            audio_seconds = len(samples) / sample_rate
+            for i, item in enumerate(group):
+                timing = {
+                    "queue_seconds": round(queued, 3),
+                    "synthesis_seconds": round(seconds, 3),
+                    "audio_seconds": round(audio_seconds, 3),
+                    "rtf": round(seconds / audio_seconds, 3) if audio_seconds else None,
+                    "shared": i > 0,
+                }
+                yield item, samples, sample_rate, timing
+
+
+def build_manifest(items, timings, total_seconds, workers):
+    """Describe a finished batch, items in request order."""
+    entries = []
+    for item in items:
+        timing = timings.get(item['id'], {"error": "Not synthesized"})
+        entry = {
+            "id": item['id'],
+            "file": None if "error" in timing else item['filename'],
+            "characters": len(item['text']),
+            "voice": item['voice'],
+        }
+        entry.update(timing)
+        entries.append(entry)
+    return {
+        "items": entries,
+        "count": len(items),
+        "failed": sum(1 for entry in entries if "error" in entry),
+        "shared": sum(1 for entry in entries if entry.get("shared")),
+        "workers": workers,
+        "total_seconds": round(total_seconds, 3),
+    }
+
+
+class _ChunkSink:
+    """Write-only file that hands its contents back in chunks.
+
+    zipfile writes to it as to an unseekable stream, so the archive can be
+    sent while later items are still synthesizing.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_zip(results, finish):
+    """Stream a zip archive of item WAV files followed by manifest.json.
+
+    Args:
+        results: Iterable of (item, wav_bytes or None, timing)
+        finish: Function returning the manifest once every item is done
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_STORED) as archive:
+        for item, wav, timing in results:
+            if wav is not None:
+                archive.writestr(item['filename'], wav)
+                yield sink.take()
+        archive.writestr('manifest.json', json.dumps(finish(), indent=2))
+    yield sink.take()
+
+
+def multipart_boundary():
+    return f"kokoro-batch-{uuid.uuid4().hex}"
+
+
+def iter_multipart(results, finish, boundary):
+    """Stream a multipart/mixed body: one audio/wav part per item, then the manifest.
+
+    Failed items get an application/json part with the error instead.
+    """
+    for item, wav, timing in results:
+        if wav is None:
+            body = json.dumps({"id": item['id'], **timing}).encode('utf-8')
+            headers = "Content-Type: application/json\r\n"
+        else:
+            body = wav
+            headers = (
+                "Content-Type: audio/wav\r\n"
+                f"Content-Disposition: attachment; filename=\"{item['filename']}\"\r\n"
+            )
+        item_id = re.sub(r'[\r\n]+', ' ', item['id'])
+        headers += f"X-Item-Id: {item_id}\r\nX-Item-Timing: {json.dumps(timing)}\r\n"
+        yield f"--{boundary}\r\n{headers}\r\n".encode('utf-8') + body + b"\r\n"
+
+    manifest = json.dumps(finish()).encode('utf-8')
+    yield (f"--{boundary}\r\nContent-Type: application/json\r\n"
+           "Content-Disposition: attachment; filename=\"manifest.json\"\r\n\r\n").encode('utf-8')
+    yield manifest + f"\r\n--{boundary}--\r\n".encode('utf-8')
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Directory batch and watch-folder mode for the Kokoro Desktop CLI
+Converts every book in an input directory with one model load. Chunks of all
+books share one pool of sessions and are handed out round-robin between the
+books, so a long book does not hold up the others.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from collections import deque
+
+import soundfile as sf
+
+from kokoro_tts import (chapter_chunks, process_chunk_sequential, validate_voice, validate_language,
+                        extract_chapters_from_epub, merge_chunks_to_chapters, PdfParser, load_cached_chapters)
+from kokoro_tts.manifest import create_sessions, check_voice, default_workers
+
+SUPPORTED_EXTENSIONS = ('.epub', '.pdf', '.txt')
+
+# Kept in each book's output directory to resume it and to skip it once done
+BOOK_STATE_FILE = ".kokoro-book-state.json"
+
+# Seconds between scans of the input directory in watch mode
+WATCH_POLL_SECONDS = 10
+
+
+def load_chapters(path, debug=False):
+    """Extract a book's chapters without asking for confirmation."""
+    if path.lower().endswith('.epub'):
+        return list(load_cached_chapters(path, lambda: extract_chapters_from_epub(path, debug)))
+    if path.lower().endswith('.pdf'):
+        return list(load_cached_chapters(path, PdfParser(path, debug=debug, interactive=False).get_chapters))
+    with open(path, 'r', encoding='utf-8') as f:
+        return [{'title': 'Chapter 1', 'content': f.read()}]
+
+
+def fingerprint(path):
+    """Size and modification time, to notice a book that changed."""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def read_book_state(book_dir):
+    try:
+        with open(os.path.join(book_dir, BOOK_STATE_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_book_state(book_dir, state):
+    path = os.path.join(book_dir, BOOK_STATE_FILE)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def book_output_dir(path, out_dir):
+    """Output directory for a book: its file name without the extension.
+
+    Books that only differ by extension keep the extension in the name.
+    """
+    stem, ext = os.path.splitext(os.path.basename(path))
+    book_dir = os.path.join(out_dir, stem)
+    state = read_book_state(book_dir)
+    if state and os.path.abspath(state['source']) != os.path.abspath(path):
+        book_dir = os.path.join(out_dir, f"{stem}-{ext[1:].lower()}")
+    return book_dir
+
+
+class Book:
+    """One input file: its chunks still to render and its resume state."""
+
+    def __init__(self, path, book_dir, chapters, format="wav"):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.dir = book_dir
+        self.format = format
+        self.pending = deque()
+        self.outstanding = 0
+        self.failed = 0
+        self.started = time.perf_counter()
+        self.state = {
+            'source': os.path.abspath(path),
+            'fingerprint': fingerprint(path),
+            'chapters': [],
+            'done': False,
+        }
+
+        for chapter_num, chapter in enumerate(chapters, 1):
+            chapter_dir = os.path.join(book_dir, f"chapter_{chapter_num:03d}")
+            os.makedirs(chapter_dir, exist_ok=True)
+            with open(os.path.join(chapter_dir, "info.txt"), "w", encoding="utf-8") as f:
+                f.write(f"Title: {chapter['title']}\n")
+            chunks = chapter_chunks(chapter)
+            self.state['chapters'].append({'title': chapter['title'], 'chunks': len(chunks)})
+            for chunk_num, chunk in enumerate(chunks, 1):
+                chunk_file = os.path.join(chapter_dir, f"chunk_{chunk_num:03d}.{format}")
+                if not os.path.exists(chunk_file):
+                    self.pending.append((chunk_file, chunk))
+        self.total = sum(chapter['chunks'] for chapter in self.state['chapters'])
+        write_book_state(book_dir, self.state)
+
+
+class FairScheduler:
+    """Hand out chunks round-robin between books.
+
+    Every book with work left gets a turn before any book gets a second one,
+    and books added later (watch mode) join the rotation straight away.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._books = deque()
+        self.closed = False
+
+    def add(self, book):
+        with self._cond:
+            if book.pending:
+                self._books.append(book)
+                self._cond.notify_all()
+
+    def next(self):
+        """Wait for the next (book, chunk_file, text); None once closed and drained."""
+        with self._cond:
+            while not self._books:
+                if self.closed:
+                    return None
+                self._cond.wait()
+            book = self._books.popleft()
+            chunk_file, text = book.pending.popleft()
+            book.outstanding += 1
+            if book.pending:
+                self._books.append(book)
+            return book, chunk_file, text
+
+    def done(self, book, ok):
+        """Record a finished chunk; returns True when it was the book's last."""
+        with self._cond:
+            book.outstanding -= 1
+            if not ok:
+                book.failed += 1
+            return not book.pending and not book.outstanding
+
+    def close(self):
+        """Let workers exit once the queued chunks are rendered."""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def stop(self):
+        """Drop the queued chunks and let workers exit."""
+        with self._cond:
+            for book in self._books:
+                book.pending.clear()
+            self._books.clear()
+            self.closed = True
+            self._cond.notify_all()
+
+
+def discover_books(in_dir):
+    """Return the supported input files in a directory, sorted by name."""
+    return sorted(
+        os.path.join(in_dir, name) for name in os.listdir(in_dir)
+        if name.lower().endswith(SUPPORTED_EXTENSIONS) and not name.startswith('.')
+        and os.path.isfile(os.path.join(in_dir, name))
+    )
+
+
+def run_batch_dir(in_dir, out_dir, model_path="kokoro-v1.0.onnx", voices_path="voices-v1.0.bin",
+                  voice="af_sarah", speed=1.0, lang="en-us", format="wav", workers=None,
+                  watch=False, debug=False, poll_seconds=WATCH_POLL_SECONDS):
+    """Convert every book in ``in_dir`` into chapter files under ``out_dir``.
+
+    Each book is rendered into ``out_dir/<book name>/`` in the --split-output
+    layout and merged into chapter files once every chunk is done. A book
+    whose state file says it is done, and whose file has not changed since,
+    is skipped; an interrupted book resumes from the chunks it already has.
+    In watch mode the directory is polled for new files until Ctrl+C.
+
+    Returns:
+        dict: Per-book results (chunks, failed, seconds)
+    """
+    if not os.path.isdir(in_dir):
+        print(f"Error: Directory {in_dir} does not exist.")
+        sys.exit(1)
+    os.makedirs(out_dir, exist_ok=True)
+
+    workers = workers or default_workers()
+    print(f"Loading model with {workers} session(s)...")
+    sessions = create_sessions(model_path, voices_path, workers)
+    kokoro = sessions.sessions[0]
+    lang = validate_language(lang, kokoro)
+    try:
+        check_voice(voice, kokoro)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    voice_style = validate_voice(voice, kokoro)
+
+    scheduler = FairScheduler()
+    results = {}
+    known = {}  # path -> fingerprint of files already queued or finished
+    active = set()  # paths of books still rendering
+    sizes = {}  # path -> fingerprint seen on the previous scan (watch mode)
+    lock = threading.Lock()
+
+    def finish(book):
+        seconds = round(time.perf_counter() - book.started, 1)
+        if book.failed:
+            print(f"\n{book.name}: {book.failed} chunk(s) failed; run again to retry them")
+        else:
+            merge_chunks_to_chapters(book.dir, format)
+            book.state['done'] = True
+            write_book_state(book.dir, book.state)
+            print(f"\nFinished {book.name} in {seconds}s")
+        with lock:
+            results[book.name] = {"chunks": book.total, "failed": book.failed, "seconds": seconds}
+            active.discard(book.path)
+
+    def work(session):
+        while True:
+            unit = scheduler.next()
+            if unit is None:
+                return
+            book, chunk_file, text = unit
+            ok = False
+            try:
+                samples, sample_rate = process_chunk_sequential(text, session, voice_style, speed, lang,
+                                                                debug=debug)
+                if samples is not None:
+                    # Write under a temporary name so a half-written chunk never looks done
+                    partial = os.path.join(os.path.dirname(chunk_file), f".{os.path.basename(chunk_file)}.part")
+                    sf.write(partial, samples, sample_rate, format=format.upper())
+                    os.replace(partial, chunk_file)
+                    ok = True
+            except Exception as e:
+                print(f"\nError rendering {chunk_file}: {e}")
+            if scheduler.done(book, ok):
+                finish(book)
+
+    def queue_books(paths):
+        for path in paths:
+            book_dir = book_output_dir(path, out_dir)
+            current = fingerprint(path)
+            state = read_book_state(book_dir)
+            if state and state.get('fingerprint') != current:
+                print(f"\n{os.path.basename(path)} changed since it was converted; converting it again")
+                for name in os.listdir(book_dir):
+                    chapter_dir = os.path.join(book_dir, name)
+                    if name.startswith("chapter_") and os.path.isdir(chapter_dir):
+                        for chunk in os.listdir(chapter_dir):
+                            if chunk.startswith("chunk_"):
+                                os.unlink(os.path.join(chapter_dir, chunk))
+            elif state and state.get('done'):
+                known[path] = current
+                continue
+
+            known[path] = current
+            try:
+                chapters = load_chapters(path, debug)
+            except Exception as e:
+                print(f"\nError reading {path}: {e}")
+                continue
+            book = Book(path, book_dir, chapters, format)
+            with lock:
+                active.add(path)
+            print(f"\nQueued {book.name}: {len(chapters)} chapters, {len(book.pending)}/{book.total} chunks to render")
+            if book.pending:
+                scheduler.add(book)
+            else:
+                finish(book)
+
+    threads = [threading.Thread(target=work, args=(session,), daemon=True) for session in sessions.sessions]
+    for thread in threads:
+        thread.start()
+
+    try:
+        queue_books(discover_books(in_dir))
+        if watch:
+            print(f"\nWatching {in_dir} for new books (Ctrl+C to stop)...")
+            while True:
+                time.sleep(poll_seconds)
+                ready = []
+                for path in discover_books(in_dir):
+                    current = fingerprint(path)
+                    with lock:
+                        rendering = path in active
+                    if rendering or known.get(path) == current:
+                        continue
+                    # Only pick up a file once it stops changing (the copy has finished)
+                    if sizes.get(path) == current:
+                        ready.append(path)
+                    sizes[path] = current
+                queue_books(ready)
+        else:
+            scheduler.close()
+            for thread in threads:
+                thread.join()
+    finally:
+        scheduler.stop()
+
+    return results
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+In-flight request coalescing for Kokoro Desktop
+Identical synthesis requests that arrive while one is already running wait for
+that run and share its result instead of synthesizing the same audio again.
+"""
+
+import threading
+
+
+def make_request_key(text, voice, speed, lang, model=None):
+    """Build the coalescing key for a synthesis request.
+
+    The voice is keyed by its raw string (single voice or blend spec), and the
+    model by name, so two requests only share a result when they would produce
+    the same audio.
+    """
+    return (text, str(voice), round(float(speed), 3), lang, model)
+
+
+class _InflightCall:
+    """A synthesis call that other requests can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class RequestCoalescer:
+    """Run one call per key and fan its result out to every concurrent caller.
+
+    The first caller for a key (the leader) runs the function. Callers that
+    arrive with the same key before it finishes (followers) block until the
+    leader is done and receive the same result, or the same exception.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self.leaders = 0
+        self.followers = 0
+        self.errors = 0
+
+    def run(self, key, func, *args, **kwargs):
+        """Call ``func(*args, **kwargs)`` unless an identical call is already running."""
+        with self._lock:
+            call = self._inflight.get(key)
+            if call is None:
+                call = _InflightCall()
+                self._inflight[key] = call
+                self.leaders += 1
+                leader = True
+            else:
+                call.waiters += 1
+                self.followers += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            call.done.set()
+
+    def stats(self):
+        """Return the coalescing counters as a dictionary."""
+        with self._lock:
+            total = self.leaders + self.followers
+            return {
+                "requests": total,
+                "executions": self.leaders,
+                "coalesced": self.followers,
+                "errors": self.errors,
+                "in_flight": len(self._inflight),
+                "waiting": sum(call.waiters for call in self._inflight.values()),
+                "hit_ratio": (self.followers / total) if total else 0.0,
+            }
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Streaming access to the documents of an EPUB book
+Chapters are yielded in spine (reading) order as each document is parsed, so
+synthesis can start before the rest of the book is read. Document text is
+read from the archive on demand and each document is parsed once (with lxml
+when it is installed) and dropped once its chapters have been yielded, so
+memory does not grow with the size of the book.
+"""
+
+import zipfile
+import posixpath
+import warnings
+from urllib.parse import unquote
+
+from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning
+from ebooklib import epub, ITEM_DOCUMENT
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# EPUB documents are XHTML; the HTML parsers handle them fine
+warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
+
+# Archive members that are not loaded when the book is opened: text
+# documents are read when their chapter is reached, media is never needed
+DEFERRED_EXTENSIONS = ('.xhtml', '.html', '.htm')
+SKIPPED_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.bmp', '.tif', '.tiff',
+                      '.ttf', '.otf', '.woff', '.woff2', '.mp3', '.mp4', '.m4a', '.ogg', '.css')
+
+FRONT_MATTER_TITLES = ['copy', 'copyright', 'title page', 'cover']
+
+
+class _LazyEpubReader(epub.EpubReader):
+    """Reads a book's structure (metadata, manifest, spine, TOC) but no content."""
+
+    def _load_manifest(self):
+        # The navigation document is needed to read the table of contents
+        self.keep = set()
+        for item in self.container.find("{%s}manifest" % epub.NAMESPACES["OPF"]):
+            if 'nav' in item.get("properties", "").split():
+                self.keep.add(posixpath.normpath(posixpath.join(self.opf_dir, unquote(item.get("href")))))
+        super()._load_manifest()
+
+    def read_file(self, name):
+        path = posixpath.normpath(unquote(name))
+        lower = path.lower()
+        if lower.endswith(SKIPPED_EXTENSIONS) or (lower.endswith(DEFERRED_EXTENSIONS) and path not in self.keep):
+            return b""
+        return super().read_file(name)
+
+
+def open_epub(epub_file):
+    """Open a book without loading its documents or media.
+
+    Returns:
+        (EpubBook, EpubDocuments)
+    """
+    reader = _LazyEpubReader(epub_file)
+    book = reader.load()
+    reader.process()
+    return book, EpubDocuments(book, epub_file, reader.opf_dir)
+
+
+class EpubDocuments:
+    """The XHTML documents of a book, looked up by href and parsed on demand."""
+
+    def __init__(self, book, epub_file=None, opf_dir=""):
+        self.book = book
+        self.epub_file = epub_file
+        self.opf_dir = opf_dir
+        self._items = {}
+        self._by_basename = {}
+        for item in book.get_items_of_type(ITEM_DOCUMENT):
+            self._items[item.file_name] = item
+            self._by_basename.setdefault(posixpath.basename(item.file_name), []).append(item)
+        self._resolved = {}
+        self._soups = {}
+        self._ids = {}
+
+    def find(self, href):
+        """Return the document an href (without fragment) points at, or None.
+
+        TOC hrefs are relative to the navigation file, so a document whose
+        path ends with the href matches as well as an exact one.
+        """
+        if href not in self._resolved:
+            path = unquote(href)
+            item = self._items.get(path)
+            if item is None:
+                item = next((candidate for candidate in self._by_basename.get(posixpath.basename(path), [])
+                             if candidate.file_name.endswith(path)), None)
+            self._resolved[href] = item
+        return self._resolved[href]
+
+    def spine(self):
+        """Documents in reading order, then any documents not in the spine."""
+        ordered = []
+        seen = set()
+        for idref, _linear in self.book.spine:
+            item = self.book.get_item_with_id(idref)
+            if item is not None and item.get_type() == ITEM_DOCUMENT and item.file_name not in seen:
+                ordered.append(item)
+                seen.add(item.file_name)
+        rest = sorted((item for name, item in self._items.items() if name not in seen), key=lambda x: x.file_name)
+        return ordered + rest
+
+    def content(self, item):
+        """Raw bytes of a document, read from the archive if not loaded."""
+        if item.content or self.epub_file is None:
+            return item.content
+        try:
+            with zipfile.ZipFile(self.epub_file) as archive:
+                return archive.read(posixpath.normpath(posixpath.join(self.opf_dir, item.file_name)))
+        except KeyError:
+            return b""
+
+    def soup(self, item):
+        """Parsed tree of a document, parsed on first use."""
+        name = item.file_name
+        if name not in self._soups:
+            self._soups[name] = BeautifulSoup(self.content(item), HTML_PARSER)
+        return self._soups[name]
+
+    def element(self, item, element_id):
+        """Element with the given id in a document, or None."""
+        name = item.file_name
+        if name not in self._ids:
+            self._ids[name] = {}
+            for tag in self.soup(item).find_all(id=True):
+                self._ids[name].setdefault(tag['id'], tag)
+        return self._ids[name].get(element_id)
+
+    def release(self, item):
+        """Drop a document's parsed tree."""
+        self._soups.pop(item.file_name, None)
+        self._ids.pop(item.file_name, None)
+
+
+def body_text(soup):
+    """Text of a document's body, leaving out the <head> (title, styles)."""
+    return (soup.body or soup).get_text()
+
+
+def get_chapter_content(documents, doc, start_id, next_id=None):
+    """Extract content between two fragment IDs"""
+    content = []
+    start_elem = documents.element(doc, start_id)
+
+    if not start_elem:
+        return ""
+
+    # Skip the heading itself if it's a heading
+    if start_elem.name in ['h1', 'h2', 'h3', 'h4']:
+        current = start_elem.find_next_sibling()
+    else:
+        current = start_elem
+
+    while current:
+        # Stop if we hit the next chapter
+        if next_id and current.get('id') == next_id:
+            break
+        # Stop if we hit another chapter heading
+        if current.name in ['h1', 'h2', 'h3'] and 'chapter' in current.get_text().lower():
+            break
+        content.append(current.get_text())
+        current = current.find_next_sibling()
+
+    return '\n'.join(content).strip()
+
+
+def toc_links(items, debug=False, depth=0):
+    """Flatten the table of contents into (link, file_name, fragment, next_fragment).
+
+    Front matter is skipped. ``next_fragment`` is the following sibling
+    link's fragment when it points into the same file, where the chapter ends.
+    """
+    links = []
+    for i, item in enumerate(items):
+        if isinstance(item, tuple):
+            section_title, section_items = item
+            if debug:
+                print(f"{'  ' * depth}Processing section: {section_title}")
+            links.extend(toc_links(section_items, debug, depth + 1))
+        elif isinstance(item, epub.Link):
+            if debug:
+                print(f"{'  ' * depth}Processing link: {item.title} -> {item.href}")
+
+            # Skip if title suggests it's front matter
+            if item.title.lower() in FRONT_MATTER_TITLES or item.title.lower().startswith('by'):
+                continue
+
+            # Extract the file name and fragment from href
+            file_name, _, fragment_id = item.href.partition('#')
+
+            # Get the next fragment ID if available
+            next_item = items[i + 1] if i + 1 < len(items) else None
+            next_fragment = None
+            if isinstance(next_item, epub.Link):
+                next_file, _, next_id = next_item.href.partition('#')
+                if next_file == file_name and next_id:
+                    next_fragment = next_id
+
+            links.append((item, file_name, fragment_id or None, next_fragment))
+    return links
+
+
+def _heading_chapters(soup, title_number):
+    """Split a document without TOC entries at its chapter headings."""
+    chapter_divs = soup.find_all(['h1', 'h2', 'h3'], class_=lambda x: x and 'chapter' in x.lower())
+    if not chapter_divs:
+        chapter_divs = soup.find_all(lambda tag: tag.name in ['h1', 'h2', 'h3'] and
+                                     ('chapter' in tag.get_text().lower() or
+                                      'book' in tag.get_text().lower()))
+
+    if chapter_divs:
+        for div in chapter_divs:
+            title = div.get_text().strip()
+
+            # Get content until next chapter heading or end
+            content = []
+            for tag in div.find_next_siblings():
+                if tag.name in ['h1', 'h2', 'h3'] and (
+                        'chapter' in tag.get_text().lower() or
+                        'book' in tag.get_text().lower()):
+                    break
+                content.append(tag.get_text() + '\n')
+            content = ''.join(content).strip()
+            if content:
+                yield title, content
+    else:
+        # No chapter divisions found, treat whole document as one chapter
+        text_content = body_text(soup).strip()
+        if text_content:
+            # Try to find a title
+            title_tag = soup.find(['h1', 'h2', 'title'])
+            title = title_tag.get_text().strip() if title_tag else f"Chapter {title_number}"
+            if title.lower() not in FRONT_MATTER_TITLES:
+                yield title, text_content
+
+
+def iter_epub_chapters(epub_file, debug=False):
+    """Yield the chapters of an EPUB book lazily, in spine order.
+
+    Chapters come from the table of contents; a book whose TOC yields
+    nothing is split at the chapter headings of each document instead.
+
+    Yields:
+        dict: Chapter with 'title', 'content' and 'order'
+    """
+    book, documents = open_epub(epub_file)
+    order = 0
+
+    # Group the TOC links by the document they point into
+    by_doc = {}
+    for link in toc_links(book.toc, debug):
+        doc = documents.find(link[1])
+        if doc is not None:
+            by_doc.setdefault(doc.file_name, []).append(link)
+
+    for doc in documents.spine():
+        for item, _file_name, fragment_id, next_fragment in by_doc.get(doc.file_name, []):
+            # If no fragment ID, get whole document content
+            if not fragment_id:
+                text_content = body_text(documents.soup(doc)).strip()
+            else:
+                text_content = get_chapter_content(documents, doc, fragment_id, next_fragment)
+
+            if text_content:
+                order += 1
+                if debug:
+                    print(f"Added chapter: {item.title}")
+                    print(f"Content length: {len(text_content)} chars")
+                    print(f"Word count: {len(text_content.split())}")
+                yield {'title': item.title, 'content': text_content, 'order': order}
+        documents.release(doc)
+
+    if order:
+        return
+
+    # If no chapters were found through TOC, try processing all documents
+    if debug:
+        print("\nNo chapters found in TOC, processing all documents...")
+    for doc in documents.spine():
+        if debug:
+            print(f"Processing document: {doc.file_name}")
+        for title, content in _heading_chapters(documents.soup(doc), order + 1):
+            order += 1
+            if debug:
+                print(f"Added chapter: {title}")
+            yield {'title': title, 'content': content, 'order': order}
+        documents.release(doc)
+
+
+def iter_epub_text(epub_file):
+    """Yield the body text of each document in spine order."""
+    _book, documents = open_epub(epub_file)
+    for doc in documents.spine():
+        yield body_text(documents.soup(doc))
+        documents.release(doc)
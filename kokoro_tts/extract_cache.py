@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Persistent cache of extracted book text
+Chapters extracted from an EPUB or PDF, with their chunk lists, are stored as
+gzip-compressed JSON lines keyed by the input file's content hash and the
+extractor version, so resuming a --split-output render does not parse the
+book again. Chapters are written while they are extracted and read back one
+at a time, so neither direction holds the whole book in memory.
+"""
+
+import os
+import gzip
+import json
+import hashlib
+
+# Bump whenever extraction or chunking changes what a book turns into
+EXTRACTOR_VERSION = 1
+
+# Chunk size the cached chunk lists were made with
+CHUNK_SIZE = 1000
+
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+                         "kokoro-tts", "extracted")
+
+# Least recently used entries beyond this many are deleted
+CACHE_MAX_ENTRIES = 50
+
+
+def cache_key(path):
+    """Content hash of a file plus the extractor version."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return f"{digest.hexdigest()}-v{EXTRACTOR_VERSION}"
+
+
+def _entry(key):
+    return os.path.join(CACHE_DIR, f"{key}.jsonl.gz")
+
+
+def load(key):
+    """Iterate a cached book's chapters, or return None if it is not cached."""
+    path = _entry(key)
+    try:
+        f = gzip.open(path, 'rt', encoding='utf-8')
+        header = json.loads(f.readline())
+        os.utime(path)  # Most recently used
+    except (OSError, EOFError, ValueError):
+        return None
+    if header.get('version') != EXTRACTOR_VERSION or header.get('chunk_size') != CHUNK_SIZE:
+        f.close()
+        return None
+
+    def chapters():
+        with f:
+            for line in f:
+                yield json.loads(line)
+    return chapters()
+
+
+def _with_chunks(chapters, chunker):
+    for chapter in chapters:
+        chapter['chunks'] = chunker(chapter['content'])
+        yield chapter
+
+
+def record(key, source, chapters, chunker):
+    """Yield chapters with their 'chunks', writing them to the cache as they pass.
+
+    The entry only becomes visible once every chapter has been yielded; an
+    interrupted extraction, or one the cache cannot be written for, leaves
+    nothing behind.
+    """
+    path = _entry(key)
+    partial = f"{path}.{os.getpid()}.part"
+    f = None
+    count = 0
+    try:
+        try:
+            f = gzip.open(partial, 'wt', encoding='utf-8')
+            f.write(json.dumps({'version': EXTRACTOR_VERSION, 'chunk_size': CHUNK_SIZE,
+                                'source': os.path.basename(source)}) + "\n")
+        except OSError:
+            f = None
+        for chapter in _with_chunks(chapters, chunker):
+            if f:
+                try:
+                    f.write(json.dumps(chapter, ensure_ascii=False) + "\n")
+                except OSError:
+                    f = None  # Disk full; finish the book without caching it
+            count += 1
+            yield chapter
+        if f and count:
+            try:
+                f.close()
+                os.replace(partial, path)
+                prune()
+            except OSError:
+                pass
+    finally:
+        if f:
+            f.close()
+        if os.path.exists(partial):
+            os.unlink(partial)
+
+
+def prune(max_entries=CACHE_MAX_ENTRIES):
+    """Delete the least recently used entries beyond max_entries."""
+    entries = []
+    for name in os.listdir(CACHE_DIR):
+        if name.endswith('.jsonl.gz'):
+            try:
+                entries.append((os.path.getmtime(os.path.join(CACHE_DIR, name)), name))
+            except OSError:
+                continue  # Pruned by another process
+    entries.sort(reverse=True)
+    for _mtime, name in entries[max_entries:]:
+        try:
+            os.unlink(os.path.join(CACHE_DIR, name))
+        except OSError:
+            pass
+
+
+def cached_chapters(path, extract, chunker):
+    """Chapters of a book from the cache, or from ``extract()`` while caching them.
+
+    Args:
+        path: Input file
+        extract: Callable returning the book's chapters (a list or a generator)
+        chunker: Callable splitting chapter text into chunks of CHUNK_SIZE
+
+    Returns:
+        Iterator of chapter dicts, each with a 'chunks' list
+    """
+    try:
+        key = cache_key(path)
+        cached = load(key)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+    except OSError:
+        # No readable input or no writable cache: extract without caching
+        return _with_chunks(extract(), chunker)
+    if cached is not None:
+        print(f"Using cached text of {os.path.basename(path)}")
+        return cached
+    return record(key, path, extract(), chunker)
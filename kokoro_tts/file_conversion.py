@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Chunked file conversion for the desktop GUI
+A book is rendered the way the CLI renders --split-output: one chunk at a
+time, each written to its own file next to the output as soon as it is
+synthesized, so a cancelled or interrupted conversion resumes where it
+stopped. The chunk files are then streamed into the output file one at a
+time, so memory use does not grow with the length of the book.
+"""
+
+import os
+import time
+import shutil
+
+import soundfile as sf
+
+from kokoro_tts import chapter_chunks, process_chunk_sequential, DuplicateChunks
+from kokoro_tts.batch_dir import load_chapters, fingerprint, read_book_state, write_book_state
+
+# Chunk files of an unfinished conversion are kept in <output file> + this suffix
+PARTS_SUFFIX = ".parts"
+
+
+class ConversionCancelled(Exception):
+    """Raised when a conversion is cancelled; its finished chunks are kept."""
+
+
+def parts_dir(output_file):
+    return output_file + PARTS_SUFFIX
+
+
+class ConversionProgress:
+    """Chunks and characters done so far, with throughput and time left.
+
+    Chunks carried over from an earlier run count as done but not towards
+    throughput, which only measures chunks synthesized in this run.
+    """
+
+    def __init__(self, total_chunks, total_chars):
+        self.total_chunks = total_chunks
+        self.total_chars = total_chars
+        self.done_chunks = 0
+        self.done_chars = 0
+        self.rendered_chars = 0
+        self.render_seconds = 0.0
+        self.started = time.perf_counter()
+
+    def advance(self, chars, seconds=None):
+        """Count a finished chunk; seconds is None for a chunk rendered earlier."""
+        self.done_chunks += 1
+        self.done_chars += chars
+        if seconds is not None:
+            self.rendered_chars += chars
+            self.render_seconds += seconds
+
+    @property
+    def fraction(self):
+        return self.done_chars / self.total_chars if self.total_chars else 1.0
+
+    @property
+    def throughput(self):
+        """Characters synthesized per second, or None before the first chunk."""
+        if not self.render_seconds:
+            return None
+        return self.rendered_chars / self.render_seconds
+
+    @property
+    def eta_seconds(self):
+        if self.throughput is None:
+            return None
+        return (self.total_chars - self.done_chars) / self.throughput
+
+    def describe(self):
+        text = f"Chunk {self.done_chunks}/{self.total_chunks} ({self.fraction:.0%})"
+        if self.throughput is not None:
+            minutes, seconds = divmod(int(self.eta_seconds), 60)
+            text += f", {self.throughput:.0f} chars/s, about {minutes}m {seconds:02d}s left"
+        return text
+
+
+def convert_file(kokoro, input_file, output_file, voice, speed=1.0, lang="en-us",
+                 cancel=None, on_progress=None, debug=False):
+    """Convert a text, EPUB or PDF file into one audio file, chunk by chunk.
+
+    Args:
+        kokoro: Loaded Kokoro model
+        cancel: threading.Event checked between chunks
+        on_progress: Called with a ConversionProgress after every chunk
+
+    Raises:
+        ConversionCancelled: If cancel was set; converting again resumes
+        ValueError: If the file has no text
+        RuntimeError: If a chunk cannot be synthesized
+    """
+    chapters = load_chapters(input_file, debug)
+    chunks = [chunk for chapter in chapters for chunk in chapter_chunks(chapter)]
+    if not chunks:
+        raise ValueError(f"No text found in {os.path.basename(input_file)}")
+
+    # Chunk files from an earlier run are only reused for the same book and voice settings
+    work_dir = parts_dir(output_file)
+    settings = {
+        'source': os.path.abspath(input_file),
+        'fingerprint': fingerprint(input_file),
+        'voice': voice,
+        'speed': speed,
+        'lang': lang,
+        'chunks': len(chunks),
+    }
+    if read_book_state(work_dir) != settings:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    os.makedirs(work_dir, exist_ok=True)
+    write_book_state(work_dir, settings)
+
+    progress = ConversionProgress(len(chunks), sum(len(chunk) for chunk in chunks))
+    duplicates = DuplicateChunks(chapters)
+    chunk_files = []
+    for number, chunk in enumerate(chunks, 1):
+        if cancel is not None and cancel.is_set():
+            raise ConversionCancelled(f"Cancelled after {progress.done_chunks}/{len(chunks)} chunks")
+
+        chunk_file = os.path.join(work_dir, f"chunk_{number:05d}.wav")
+        chunk_files.append(chunk_file)
+        if os.path.exists(chunk_file):
+            duplicates.store_file(chunk, chunk_file)
+            progress.advance(len(chunk))
+            continue
+
+        start = time.perf_counter()
+        if not duplicates.lookup_file(chunk, chunk_file):
+            samples, sample_rate = process_chunk_sequential(chunk, kokoro, voice, speed, lang, debug=debug)
+            if samples is None:
+                raise RuntimeError(f"Could not synthesize chunk {number}")
+            # Written under a temporary name so an interrupted write is not taken as done
+            partial = chunk_file + ".part"
+            sf.write(partial, samples, sample_rate, format='WAV')
+            os.replace(partial, chunk_file)
+            duplicates.store_file(chunk, chunk_file, time.perf_counter() - start)
+        progress.advance(len(chunk), time.perf_counter() - start)
+        if on_progress:
+            on_progress(progress)
+
+    # Stream the chunks into the output file
+    sample_rate = sf.info(chunk_files[0]).samplerate
+    with sf.SoundFile(output_file, 'w', samplerate=sample_rate, channels=1) as out:
+        for chunk_file in chunk_files:
+            samples, _ = sf.read(chunk_file, dtype='float32')
+            out.write(samples)
+    shutil.rmtree(work_dir)
+    return progress
@@ -7,11 +7,29 @@ A graphical user interface for the text-to-speech application with multi-voice b
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import threading
+import queue
 import os
 from kokoro_onnx import Kokoro
 import numpy as np
 import soundfile as sf
 import sounddevice as sd
+from kokoro_tts.model_registry import load_model_config, DEFAULT_MODEL_NAME, DEFAULT_MODEL_PATH, DEFAULT_VOICES_PATH
+from kokoro_tts.preview import PreviewCache, play_preview
+from kokoro_tts.file_conversion import convert_file, ConversionCancelled
+from kokoro_tts.audition import run_audition
+
+# Milliseconds between checks for UI updates posted by background threads
+UI_POLL_MS = 50
+
+class Job:
+    """Work for the job thread; cancel is set to stop it."""
+    
+    def __init__(self, description, func, args, cancellable=True):
+        self.description = description
+        self.func = func
+        self.args = args
+        self.cancellable = cancellable
+        self.cancel = threading.Event()
 
 class KokoroDesktopGUI:
     def __init__(self, root):
@@ -23,17 +41,41 @@ class KokoroDesktopGUI:
         # Initialize Kokoro model
         self.kokoro = None
         self.model_loaded = False
+        self.model_loading = False
+        
+        # Named models from the registry (models.json); the default one is loaded at startup
+        try:
+            self.model_config = load_model_config()
+        except ValueError as e:
+            print(f"Warning: {e}")
+            self.model_config = {
+                'default': DEFAULT_MODEL_NAME,
+                'models': {DEFAULT_MODEL_NAME: {'model': DEFAULT_MODEL_PATH, 'voices': DEFAULT_VOICES_PATH}},
+            }
+        default_model = self.model_config['models'][self.model_config['default']]
         
         # Variables
-        self.model_path = tk.StringVar(value="./kokoro-v1.0.onnx")
-        self.voices_path = tk.StringVar(value="./voices-v1.0.bin")
+        self.model_name = tk.StringVar(value=self.model_config['default'])
+        self.model_path = tk.StringVar(value=default_model['model'])
+        self.voices_path = tk.StringVar(value=default_model['voices'])
         self.speed_var = tk.DoubleVar(value=1.0)
         self.language_var = tk.StringVar(value="en-us")
         self.output_format_var = tk.StringVar(value="wav")
         self.voice_vars = []  # For voice blending
         self.voice_weights = []  # For voice blending weights
+        self.preview_cache = PreviewCache()  # File previews per voice, speed and language
+        
+        # Model loading and synthesis run one job at a time on a single
+        # background thread; it hands UI updates back through ui_updates
+        self.jobs = queue.Queue()
+        self.jobs_lock = threading.Lock()
+        self.pending_jobs = []
+        self.running_job = None
+        self.ui_updates = queue.Queue()
+        threading.Thread(target=self._run_jobs, daemon=True).start()
         
         self.setup_ui()
+        self._poll_ui_updates()
         self.load_model_if_exists()
         
     def setup_ui(self):
@@ -87,6 +129,9 @@ class KokoroDesktopGUI:
         self.save_text_btn = ttk.Button(button_frame, text="Save to File", command=self.save_text_to_file)
         self.save_text_btn.pack(side=tk.LEFT, padx=5)
         
+        self.cancel_text_btn = ttk.Button(button_frame, text="Cancel", command=self.cancel_jobs, state=tk.DISABLED)
+        self.cancel_text_btn.pack(side=tk.LEFT, padx=5)
+        
     def setup_file_tab(self):
         # File input
         file_input_frame = ttk.LabelFrame(self.file_frame, text="File Input")
@@ -112,6 +157,19 @@ class KokoroDesktopGUI:
         self.play_file_btn = ttk.Button(file_button_frame, text="Play Preview", command=self.play_file_preview)
         self.play_file_btn.pack(side=tk.LEFT, padx=5)
         
+        self.cancel_file_btn = ttk.Button(file_button_frame, text="Cancel", command=self.cancel_jobs, state=tk.DISABLED)
+        self.cancel_file_btn.pack(side=tk.LEFT, padx=5)
+        
+        # Conversion progress
+        progress_frame = ttk.LabelFrame(self.file_frame, text="Progress")
+        progress_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        self.file_progress_var = tk.DoubleVar(value=0.0)
+        ttk.Progressbar(progress_frame, variable=self.file_progress_var, maximum=100.0).pack(fill=tk.X, padx=5, pady=5)
+        
+        self.file_progress_text = tk.StringVar(value="")
+        ttk.Label(progress_frame, textvariable=self.file_progress_text).pack(anchor=tk.W, padx=5, pady=(0, 5))
+        
     def setup_voice_blending_tab(self):
         # Voice blending controls
         blend_control_frame = ttk.LabelFrame(self.blend_frame, text="Voice Blending Controls")
@@ -124,6 +182,9 @@ class KokoroDesktopGUI:
         num_voices_spinbox.grid(row=0, column=1, padx=5, pady=5)
         ttk.Button(blend_control_frame, text="Update Voices", command=self.update_voice_controls).grid(row=0, column=2, padx=5, pady=5)
         
+        # Render the Text Input text with every voice to compare them
+        ttk.Button(blend_control_frame, text="Audition All Voices", command=self.audition_voices).grid(row=0, column=3, padx=5, pady=5)
+        
         # Voice selection and weight controls
         self.voice_control_frame = ttk.LabelFrame(self.blend_frame, text="Voice Selection")
         self.voice_control_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -136,16 +197,22 @@ class KokoroDesktopGUI:
         model_frame = ttk.LabelFrame(self.settings_frame, text="Model Paths")
         model_frame.pack(fill=tk.X, padx=10, pady=5)
         
-        ttk.Label(model_frame, text="Model Path:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
-        ttk.Entry(model_frame, textvariable=self.model_path, width=50).grid(row=0, column=1, padx=5, pady=5)
-        ttk.Button(model_frame, text="Browse", command=lambda: self.browse_file(self.model_path)).grid(row=0, column=2, padx=5, pady=5)
+        # Picking a registry model fills in its paths and loads it
+        ttk.Label(model_frame, text="Model:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
+        model_combo = ttk.Combobox(model_frame, textvariable=self.model_name, values=list(self.model_config['models']), state="readonly")
+        model_combo.grid(row=0, column=1, sticky=tk.EW, padx=5, pady=5)
+        model_combo.bind("<<ComboboxSelected>>", self.select_registry_model)
+        
+        ttk.Label(model_frame, text="Model Path:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=5)
+        ttk.Entry(model_frame, textvariable=self.model_path, width=50).grid(row=1, column=1, padx=5, pady=5)
+        ttk.Button(model_frame, text="Browse", command=lambda: self.browse_file(self.model_path)).grid(row=1, column=2, padx=5, pady=5)
         
-        ttk.Label(model_frame, text="Voices Path:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=5)
-        ttk.Entry(model_frame, textvariable=self.voices_path, width=50).grid(row=1, column=1, padx=5, pady=5)
-        ttk.Button(model_frame, text="Browse", command=lambda: self.browse_file(self.voices_path)).grid(row=1, column=2, padx=5, pady=5)
+        ttk.Label(model_frame, text="Voices Path:").grid(row=2, column=0, sticky=tk.W, padx=5, pady=5)
+        ttk.Entry(model_frame, textvariable=self.voices_path, width=50).grid(row=2, column=1, padx=5, pady=5)
+        ttk.Button(model_frame, text="Browse", command=lambda: self.browse_file(self.voices_path)).grid(row=2, column=2, padx=5, pady=5)
         
         # Reload model button
-        ttk.Button(model_frame, text="Reload Model", command=self.load_model_if_exists).grid(row=2, column=0, columnspan=3, pady=10)
+        ttk.Button(model_frame, text="Reload Model", command=self.load_model_if_exists).grid(row=3, column=0, columnspan=3, pady=10)
         
         # Other settings
         settings_frame = ttk.LabelFrame(self.settings_frame, text="General Settings")
@@ -255,32 +322,134 @@ class KokoroDesktopGUI:
         for var in self.voice_weights:
             var.set(var.get() * factor)
             
+    def select_registry_model(self, event=None):
+        """Switch to the model picked from the registry"""
+        entry = self.model_config['models'].get(self.model_name.get())
+        if entry:
+            self.model_path.set(entry['model'])
+            self.voices_path.set(entry['voices'])
+            self.load_model_if_exists()
+            
     def load_model_if_exists(self):
-        """Load the model if files exist"""
+        """Load the model in the background if its files exist"""
         model_path = self.model_path.get()
         voices_path = self.voices_path.get()
         
         if os.path.exists(model_path) and os.path.exists(voices_path):
-            try:
-                self.kokoro = Kokoro(model_path, voices_path)
-                self.model_loaded = True
-                self.status_var.set("Model loaded successfully")
-                
-                # Update voice combo boxes if on voice blending tab
-                if self.notebook.index(self.notebook.select()) == 2:  # Voice blending tab
-                    self.update_voice_controls()
-                    
-            except Exception as e:
-                self.model_loaded = False
-                self.status_var.set(f"Failed to load model: {str(e)}")
+            # Loading takes seconds; the window stays responsive meanwhile, and
+            # jobs started before it finishes wait for it in the job queue
+            self.model_loading = True
+            self.submit_job("Loading model", self._load_model_worker, model_path, voices_path,
+                            cancellable=False)
         else:
             self.model_loaded = False
             self.status_var.set("Model files not found. Please check paths in Settings.")
             
+    def _load_model_worker(self, cancel, model_path, voices_path):
+        """Job that loads the model"""
+        try:
+            self.kokoro = Kokoro(model_path, voices_path)
+            self.model_loaded = True
+            self.set_status("Model loaded successfully")
+            
+            # Update voice combo boxes if on voice blending tab
+            self.post(self._refresh_voice_controls)
+            
+        except Exception as e:
+            self.model_loaded = False
+            self.set_status(f"Failed to load model: {str(e)}")
+        finally:
+            self.model_loading = False
+            
+    def _refresh_voice_controls(self):
+        if self.notebook.index(self.notebook.select()) == 2:  # Voice blending tab
+            self.update_voice_controls()
+            
+    def model_available(self):
+        """True if the model is loaded or loading; otherwise tell the user"""
+        if not (self.model_loaded or self.model_loading):
+            messagebox.showerror("Error", "Model not loaded. Please check settings.")
+            return False
+        return True
+        
+    def synthesis_settings(self):
+        """Voice, speed and language, read on the Tk thread when a job is queued"""
+        return self.get_selected_voice(), self.speed_var.get(), self.language_var.get()
+        
+    def post(self, func, *args):
+        """Run func(*args) on the Tk thread; safe to call from any thread"""
+        self.ui_updates.put((func, args))
+        
+    def set_status(self, message):
+        """Show a status message; safe to call from any thread"""
+        self.post(self.status_var.set, message)
+        
+    def _poll_ui_updates(self):
+        """Apply the UI updates posted by background threads"""
+        while True:
+            try:
+                func, args = self.ui_updates.get_nowait()
+            except queue.Empty:
+                break
+            func(*args)
+        self.root.after(UI_POLL_MS, self._poll_ui_updates)
+        
+    def submit_job(self, description, func, *args, cancellable=True):
+        """Queue func(cancel, *args) to run on the job thread after earlier jobs"""
+        job = Job(description, func, args, cancellable)
+        with self.jobs_lock:
+            busy = self.running_job is not None or bool(self.pending_jobs)
+            self.pending_jobs.append(job)
+        self.jobs.put(job)
+        self.status_var.set(f"{description} (queued)" if busy else f"{description}...")
+        self._update_job_controls()
+        
+    def cancel_jobs(self):
+        """Cancel the running job and drop the queued ones (except model loads)"""
+        with self.jobs_lock:
+            jobs = [job for job in self.pending_jobs + [self.running_job] if job and job.cancellable]
+            self.pending_jobs = [job for job in self.pending_jobs if not job.cancellable]
+        for job in jobs:
+            job.cancel.set()
+        sd.stop()
+        if jobs:
+            self.status_var.set("Cancelling...")
+        self._update_job_controls()
+        
+    def _run_jobs(self):
+        """Job thread: the only thread that synthesizes or loads the model"""
+        while True:
+            job = self.jobs.get()
+            with self.jobs_lock:
+                if job.cancel.is_set():
+                    continue
+                self.pending_jobs.remove(job)
+                self.running_job = job
+            self.post(self._update_job_controls)
+            try:
+                job.func(job.cancel, *job.args)
+            except Exception as e:
+                self.set_status(f"Error in {job.description.lower()}: {str(e)}")
+            finally:
+                with self.jobs_lock:
+                    self.running_job = None
+                self.post(self._update_job_controls)
+                
+    def _update_job_controls(self):
+        with self.jobs_lock:
+            busy = self.running_job is not None or bool(self.pending_jobs)
+        for button in (self.cancel_text_btn, self.cancel_file_btn):
+            button.config(state=tk.NORMAL if busy else tk.DISABLED)
+            
+    def _require_model(self):
+        # Jobs queued while the model was loading run after the load job
+        if not self.model_loaded:
+            raise RuntimeError("model not loaded. Please check settings.")
+        return self.kokoro
+            
     def convert_text(self):
         """Convert entered text to speech"""
-        if not self.model_loaded:
-            messagebox.showerror("Error", "Model not loaded. Please check settings.")
+        if not self.model_available():
             return
             
         text = self.text_input.get("1.0", tk.END).strip()
@@ -288,32 +457,30 @@ class KokoroDesktopGUI:
             messagebox.showwarning("Warning", "Please enter some text to convert.")
             return
             
-        # Get selected voice or blend
-        voice = self.get_selected_voice()
+        self.submit_job("Converting text to speech", self._convert_text_worker, text, *self.synthesis_settings())
         
-        # Run conversion in a thread to prevent UI freezing
-        threading.Thread(target=self._convert_text_worker, args=(text, voice), daemon=True).start()
-        
-    def _convert_text_worker(self, text, voice):
-        """Worker function for text conversion"""
+    def _convert_text_worker(self, cancel, text, voice, speed, lang):
+        """Job that converts text and plays it"""
         try:
-            self.status_var.set("Converting text to speech...")
-            
-            samples, sample_rate = self.kokoro.create(
+            samples, sample_rate = self._require_model().create(
                 text, 
                 voice=voice, 
-                speed=self.speed_var.get(), 
-                lang=self.language_var.get()
+                speed=speed, 
+                lang=lang
             )
+            if cancel.is_set():
+                self.set_status("Cancelled")
+                return
             
             # Play the audio
+            self.set_status("Playing...")
             sd.play(samples, sample_rate)
             sd.wait()
             
-            self.status_var.set("Conversion completed successfully")
+            self.set_status("Cancelled" if cancel.is_set() else "Conversion completed successfully")
             
         except Exception as e:
-            self.status_var.set(f"Error during conversion: {str(e)}")
+            self.set_status(f"Error during conversion: {str(e)}")
             
     def play_text_preview(self):
         """Play a preview of the entered text"""
@@ -321,8 +488,7 @@ class KokoroDesktopGUI:
         
     def save_text_to_file(self):
         """Save the converted text to a file"""
-        if not self.model_loaded:
-            messagebox.showerror("Error", "Model not loaded. Please check settings.")
+        if not self.model_available():
             return
             
         text = self.text_input.get("1.0", tk.END).strip()
@@ -344,35 +510,31 @@ class KokoroDesktopGUI:
         if not output_file:
             return
             
-        # Get selected voice
-        voice = self.get_selected_voice()
-        
-        # Run save in a thread
-        threading.Thread(target=self._save_text_worker, args=(text, voice, output_file), daemon=True).start()
+        self.submit_job("Converting and saving", self._save_text_worker, text, output_file, *self.synthesis_settings())
         
-    def _save_text_worker(self, text, voice, output_file):
-        """Worker function for saving text to file"""
+    def _save_text_worker(self, cancel, text, output_file, voice, speed, lang):
+        """Job that saves converted text to a file"""
         try:
-            self.status_var.set("Converting and saving...")
-            
-            samples, sample_rate = self.kokoro.create(
+            samples, sample_rate = self._require_model().create(
                 text, 
                 voice=voice, 
-                speed=self.speed_var.get(), 
-                lang=self.language_var.get()
+                speed=speed, 
+                lang=lang
             )
+            if cancel.is_set():
+                self.set_status("Cancelled")
+                return
             
             sf.write(output_file, samples, sample_rate)
             
-            self.status_var.set(f"Saved to {output_file}")
+            self.set_status(f"Saved to {output_file}")
             
         except Exception as e:
-            self.status_var.set(f"Error saving file: {str(e)}")
+            self.set_status(f"Error saving file: {str(e)}")
             
     def convert_file(self):
         """Convert input file to speech"""
-        if not self.model_loaded:
-            messagebox.showerror("Error", "Model not loaded. Please check settings.")
+        if not self.model_available():
             return
             
         input_file = self.input_file_var.get()
@@ -385,39 +547,47 @@ class KokoroDesktopGUI:
             messagebox.showerror("Error", "Please specify an output file.")
             return
             
-        # Run conversion in a thread
-        threading.Thread(target=self._convert_file_worker, args=(input_file, output_file), daemon=True).start()
+        self.file_progress_var.set(0.0)
+        self.file_progress_text.set("")
+        self.submit_job("Converting file", self._convert_file_worker, input_file, output_file,
+                        *self.synthesis_settings())
         
-    def _convert_file_worker(self, input_file, output_file):
-        """Worker function for file conversion"""
+    def _convert_file_worker(self, cancel, input_file, output_file, voice, speed, lang):
+        """Job that converts a file"""
         try:
-            self.status_var.set("Converting file...")
-            
-            # For now, just read the text file and convert
-            # In a full implementation, this would handle EPUB/PDF processing
-            with open(input_file, 'r', encoding='utf-8') as f:
-                text = f.read()
-                
-            voice = self.get_selected_voice()
-            
-            samples, sample_rate = self.kokoro.create(
-                text, 
-                voice=voice, 
-                speed=self.speed_var.get(), 
-                lang=self.language_var.get()
+            self.set_status("Reading file...")
+            
+            # Same chunked pipeline as the CLI: chunks go to disk as they are
+            # rendered, and converting the same file again resumes
+            convert_file(
+                self._require_model(),
+                input_file,
+                output_file,
+                voice,
+                speed=speed,
+                lang=lang,
+                cancel=cancel,
+                on_progress=lambda progress: self.post(self._show_file_progress, progress.fraction,
+                                                       progress.describe())
             )
             
-            sf.write(output_file, samples, sample_rate)
-            
-            self.status_var.set(f"File converted and saved to {output_file}")
+            self.post(self.file_progress_var.set, 100.0)
+            self.set_status(f"File converted and saved to {output_file}")
             
+        except ConversionCancelled as e:
+            self.set_status(f"{e}; convert again to resume")
         except Exception as e:
-            self.status_var.set(f"Error converting file: {str(e)}")
+            self.set_status(f"Error converting file: {str(e)}")
+            
+    def _show_file_progress(self, fraction, description):
+        """Show conversion progress, throughput and time left"""
+        self.file_progress_var.set(fraction * 100)
+        self.file_progress_text.set(description)
+        self.status_var.set("Converting file...")
             
     def play_file_preview(self):
         """Play a preview of the input file"""
-        if not self.model_loaded:
-            messagebox.showerror("Error", "Model not loaded. Please check settings.")
+        if not self.model_available():
             return
             
         input_file = self.input_file_var.get()
@@ -425,34 +595,58 @@ class KokoroDesktopGUI:
             messagebox.showerror("Error", "Please select a valid input file.")
             return
             
-        # Run preview in a thread
-        threading.Thread(target=self._play_file_preview_worker, args=(input_file,), daemon=True).start()
+        self.submit_job("Preparing preview", self._play_file_preview_worker, input_file, *self.synthesis_settings())
         
-    def _play_file_preview_worker(self, input_file):
-        """Worker function for playing file preview"""
+    def _play_file_preview_worker(self, cancel, input_file, voice, speed, lang):
+        """Job that plays a file preview"""
         try:
-            self.status_var.set("Preparing preview...")
+            # Only the opening sentences are synthesized; playback starts after the first
+            play_preview(
+                self._require_model(),
+                input_file,
+                voice,
+                speed,
+                lang,
+                self.preview_cache,
+                on_status=self.set_status,
+                cancel=cancel
+            )
             
-            # Read the text file
-            with open(input_file, 'r', encoding='utf-8') as f:
-                text = f.read()
-                
-            voice = self.get_selected_voice()
+            self.set_status("Cancelled" if cancel.is_set() else "Preview completed")
             
-            samples, sample_rate = self.kokoro.create(
-                text, 
-                voice=voice, 
-                speed=self.speed_var.get(), 
-                lang=self.language_var.get()
-            )
+        except Exception as e:
+            self.set_status(f"Error in preview: {str(e)}")
             
-            sd.play(samples, sample_rate)
-            sd.wait()
+    def audition_voices(self):
+        """Render the entered text with every voice into a folder of clips"""
+        if not self.model_available():
+            return
             
-            self.status_var.set("Preview completed")
+        text = self.text_input.get("1.0", tk.END).strip()
+        if not text:
+            messagebox.showwarning("Warning", "Please enter some text on the Text Input tab to audition.")
+            return
+            
+        out_dir = filedialog.askdirectory(title="Folder for the audition clips")
+        if not out_dir:
+            return
+            
+        self.submit_job("Auditioning voices", self._audition_worker, text, out_dir,
+                        self.model_path.get(), self.voices_path.get(),
+                        self.speed_var.get(), self.language_var.get(), self.output_format_var.get())
+        
+    def _audition_worker(self, cancel, text, out_dir, model_path, voices_path, speed, lang, format):
+        """Job that renders the voice audition matrix"""
+        try:
+            # Clips rendered before come from the cache
+            index = run_audition(text, out_dir, model_path=model_path, voices_path=voices_path,
+                                 speed=speed, lang=lang, format=format,
+                                 kokoro=self._require_model(), cancel=cancel)
+            written = sum(clip["status"] != "failed" for clip in index["clips"])
+            self.set_status(f"Auditioned {written} voices; clips and index.json are in {out_dir}")
             
         except Exception as e:
-            self.status_var.set(f"Error in preview: {str(e)}")
+            self.set_status(f"Error auditioning voices: {str(e)}")
             
     def get_selected_voice(self):
         """Get the selected voice or voice blend"""
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+JSONL manifest mode for the Kokoro Desktop CLI
+Renders many prompts with one model load: every manifest line is one output
+file, synthesized on a pool of sessions that share the loaded weights.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import soundfile as sf
+import onnxruntime as rt
+from kokoro_onnx import Kokoro
+
+from kokoro_tts import chunk_text, process_chunk_sequential, validate_voice
+from kokoro_tts.session_pool import SessionPool, clone_kokoro
+
+# Written to the output directory: which settings produced each output, so
+# a rerun can skip outputs that are already up to date
+STATE_FILE = ".kokoro-manifest-state.json"
+SUMMARY_FILE = "summary.json"
+
+# Save the state file after this many finished items, so an interrupted
+# run loses little work
+STATE_SAVE_INTERVAL = 50
+
+
+def default_workers():
+    """Return the number of sessions to synthesize with (one per two cores, up to 4)."""
+    return max(1, min(4, (os.cpu_count() or 2) // 2))
+
+
+def read_manifest(path, voice="af_sarah", speed=1.0, lang="en-us", format="wav"):
+    """Read a JSONL manifest.
+
+    Each line is a JSON object with "text" and optionally "voice" (a name or
+    blend such as "af_sarah:60,am_adam:40"), "speed", "lang" and "out" (the
+    output file name, by default the line number). Missing settings fall back
+    to the command line values.
+
+    Returns:
+        tuple: (items, errors) where errors lists (line number, message)
+    """
+    items = []
+    errors = []
+    outputs = set()
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                entry = json.loads(line)
+                if not isinstance(entry, dict):
+                    raise ValueError("line must be a JSON object")
+                text = entry.get('text')
+                if not isinstance(text, str) or not text.strip():
+                    raise ValueError("missing \"text\"")
+                out = str(entry.get('out') or f"{line_number:06d}")
+                if os.path.isabs(out) or '..' in out.replace('\\', '/').split('/'):
+                    raise ValueError(f"output name must stay inside the output directory: {out}")
+                if not out.lower().endswith(('.wav', '.mp3')):
+                    out = f"{out}.{format}"
+                if out in outputs:
+                    raise ValueError(f"duplicate output name: {out}")
+                outputs.add(out)
+                items.append({
+                    'line': line_number,
+                    'text': text,
+                    'voice': str(entry.get('voice') or voice),
+                    'speed': float(entry.get('speed', speed)),
+                    'lang': entry.get('lang', lang),
+                    'out': out,
+                })
+            except (ValueError, TypeError) as e:
+                errors.append((line_number, str(e)))
+    return items, errors
+
+
+def model_fingerprint(*paths):
+    """Absolute path, size and modification time of each model file.
+
+    Two models with the same file name in different directories, or a model
+    file replaced in place, give different fingerprints.
+    """
+    fingerprint = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            fingerprint.append([os.path.abspath(path), stat.st_size, stat.st_mtime_ns])
+        except OSError:
+            fingerprint.append([os.path.abspath(path), None, None])
+    return fingerprint
+
+
+def item_key(item, model_path, voices_path):
+    """Hash of everything that determines an item's audio."""
+    settings = [item['text'], item['voice'], round(item['speed'], 3), item['lang'],
+                model_fingerprint(model_path, voices_path), os.path.splitext(item['out'])[1].lower()]
+    return hashlib.sha256(json.dumps(settings).encode('utf-8')).hexdigest()
+
+
+def load_state(out_dir):
+    try:
+        with open(os.path.join(out_dir, STATE_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(out_dir, state):
+    path = os.path.join(out_dir, STATE_FILE)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(path + '.tmp', path)
+
+
+def check_voice(voice, kokoro):
+    """Raise ValueError unless a voice name or blend spec is usable."""
+    supported = set(kokoro.get_voices())
+    for part in voice.split(','):
+        name, _, weight = part.partition(':')
+        if name.strip() not in supported:
+            raise ValueError(f"Unsupported voice: {name.strip()}")
+        if weight:
+            float(weight)
+
+
+def create_sessions(model_path, voices_path, workers):
+    """Load the model once and wrap it in a pool of ``workers`` sessions."""
+    options = rt.SessionOptions()
+    # The sessions run side by side, so give each its share of the cores
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    options.intra_op_num_threads = threads
+    options.inter_op_num_threads = threads
+    providers = [os.getenv("ONNX_PROVIDER")] if os.getenv("ONNX_PROVIDER") else ["CPUExecutionProvider"]
+    session = rt.InferenceSession(model_path, sess_options=options, providers=providers)
+    kokoro = Kokoro.from_session(session, voices_path)
+    return SessionPool([kokoro] + [clone_kokoro(kokoro) for _ in range(workers - 1)])
+
+
+def run_manifest(manifest_path, out_dir, model_path="kokoro-v1.0.onnx", voices_path="voices-v1.0.bin",
+                 voice="af_sarah", speed=1.0, lang="en-us", format="wav", workers=None, debug=False):
+    """Render every item of a JSONL manifest into ``out_dir``.
+
+    Outputs whose file exists and was produced from the same settings are
+    skipped; an item whose settings match an output already rendered (in
+    this run or an earlier one) is copied from it instead of synthesized.
+    A summary of per-item durations and failures is written to summary.json.
+
+    Returns:
+        dict: The summary
+    """
+    items, errors = read_manifest(manifest_path, voice, speed, lang, format)
+    for line_number, message in errors:
+        print(f"Error: {manifest_path} line {line_number}: {message}")
+    if not items:
+        print("Error: No items to render in the manifest")
+        sys.exit(1)
+
+    os.makedirs(out_dir, exist_ok=True)
+    state = load_state(out_dir)
+    results = {}
+
+    # Up to date: the file exists and the state says it came from these settings
+    todo = []
+    for item in items:
+        item['key'] = item_key(item, model_path, voices_path)
+        if state.get(item['out']) == item['key'] and os.path.exists(os.path.join(out_dir, item['out'])):
+            results[item['out']] = {"status": "skipped"}
+        else:
+            todo.append(item)
+
+    # Existing outputs that are not about to be rewritten can stand in for new items
+    rewritten = {item['out'] for item in todo}
+    cached = {}
+    for out, key in state.items():
+        if out not in rewritten and os.path.exists(os.path.join(out_dir, out)):
+            cached.setdefault(key, out)
+
+    print(f"Manifest: {len(items)} items, {len(items) - len(todo)} already up to date, "
+          f"{len(errors)} invalid lines")
+    start = time.perf_counter()
+
+    if todo:
+        workers = max(1, min(workers or default_workers(), len(todo)))
+        print(f"Loading model with {workers} session(s)...")
+        sessions = create_sessions(model_path, voices_path, workers)
+        kokoro = sessions.sessions[0]
+
+        # Voice blends and languages are checked once each, not once per item
+        voices = {}
+        languages = set(kokoro.get_languages())
+        for item in todo:
+            if item['voice'] not in voices:
+                try:
+                    check_voice(item['voice'], kokoro)
+                    voices[item['voice']] = validate_voice(item['voice'], kokoro)
+                except ValueError as e:
+                    voices[item['voice']] = e
+
+        def render(item):
+            voice_style = voices[item['voice']]
+            if isinstance(voice_style, Exception):
+                raise voice_style
+            if item['lang'] not in languages:
+                raise ValueError(f"Unsupported language: {item['lang']}")
+            with sessions.session() as session:
+                started = time.perf_counter()
+                parts = []
+                sample_rate = None
+                for chunk in chunk_text(item['text'], initial_chunk_size=1000):
+                    samples, sample_rate = process_chunk_sequential(
+                        chunk, session, voice_style, item['speed'], item['lang'], debug=debug)
+                    if samples is None:
+                        raise RuntimeError("Synthesis failed")
+                    parts.append(np.asarray(samples, dtype=np.float32))
+                seconds = time.perf_counter() - started
+            samples = np.concatenate(parts)
+            path = os.path.join(out_dir, item['out'])
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            sf.write(path, samples, sample_rate)
+            return seconds, len(samples) / sample_rate
+
+        # Items with identical settings are rendered once; the rest copy the file
+        groups = {}
+        for item in todo:
+            groups.setdefault(item['key'], []).append(item)
+
+        def finish(item, result):
+            results[item['out']] = result
+            if result["status"] == "failed":
+                state.pop(item['out'], None)
+            else:
+                state[item['out']] = item['key']
+            done = len(results)
+            if done % STATE_SAVE_INTERVAL == 0:
+                save_state(out_dir, state)
+            sys.stdout.write(f"\rRendered {done}/{len(items)} items")
+            sys.stdout.flush()
+
+        def copy_from(source, group):
+            for item in group:
+                if item['out'] != source:
+                    target = os.path.join(out_dir, item['out'])
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    shutil.copyfile(os.path.join(out_dir, source), target)
+                    finish(item, {"status": "cached", "source": source})
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = {}
+            for key, group in groups.items():
+                if key in cached:
+                    copy_from(cached[key], group)
+                else:
+                    futures[executor.submit(render, group[0])] = group
+            for future in as_completed(futures):
+                group = futures[future]
+                try:
+                    seconds, audio_seconds = future.result()
+                except Exception as e:
+                    for item in group:
+                        finish(item, {"status": "failed", "error": str(e)})
+                    continue
+                finish(group[0], {"status": "synthesized", "seconds": round(seconds, 3),
+                                  "audio_seconds": round(audio_seconds, 3)})
+                copy_from(group[0]['out'], group[1:])
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            save_state(out_dir, state)
+        print()
+
+    summary = build_summary(items, results, errors, time.perf_counter() - start)
+    with open(os.path.join(out_dir, SUMMARY_FILE), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+
+    counts = summary["counts"]
+    print(f"Done in {summary['total_seconds']}s: {counts['synthesized']} synthesized, {counts['cached']} cached, "
+          f"{counts['skipped']} up to date, {counts['failed']} failed")
+    if summary["failures"]:
+        print(f"Failures are listed in {os.path.join(out_dir, SUMMARY_FILE)}")
+    return summary
+
+
+def build_summary(items, results, errors, total_seconds):
+    """Collect per-item durations and failures."""
+    entries = []
+    counts = {"synthesized": 0, "cached": 0, "skipped": 0, "failed": 0}
+    for item in items:
+        result = results.get(item['out'], {"status": "failed", "error": "Interrupted"})
+        counts[result["status"]] += 1
+        entries.append(dict(out=item['out'], line=item['line'], characters=len(item['text']), **result))
+
+    synthesized = [entry for entry in entries if entry["status"] == "synthesized"]
+    synthesis_seconds = sum(entry["seconds"] for entry in synthesized)
+    audio_seconds = sum(entry["audio_seconds"] for entry in synthesized)
+    failures = [{"out": entry["out"], "line": entry["line"], "error": entry["error"]}
+                for entry in entries if entry["status"] == "failed"]
+    failures += [{"line": line_number, "error": message} for line_number, message in errors]
+    return {
+        "counts": counts,
+        "total_seconds": round(total_seconds, 3),
+        "synthesis_seconds": round(synthesis_seconds, 3),
+        "audio_seconds": round(audio_seconds, 3),
+        "realtime_factor": round(synthesis_seconds / audio_seconds, 3) if audio_seconds else None,
+        "failures": failures,
+        "items": entries,
+    }
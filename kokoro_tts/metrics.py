@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+In-process metrics for the Kokoro Desktop web applications
+Counters, gauges and histograms rendered in the Prometheus text exposition format
+"""
+
+import os
+import sys
+import threading
+from bisect import bisect_left
+
+# Optional dependency for process memory statistics
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# Latency buckets in seconds, from cached hits up to long synthesis jobs
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Real-time factor buckets (seconds of compute per second of audio)
+RTF_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 5.0)
+# Throughput buckets in characters per second
+CPS_BUCKETS = (10, 25, 50, 100, 200, 400, 800, 1600, 3200, 6400)
+
+
+def _format_labels(labelnames, labelvalues, extra=None):
+    pairs = list(zip(labelnames, labelvalues))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = []
+    for name, value in pairs:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        escaped.append(f'{name}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Common state for a named metric with optional labels."""
+
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+        self._function = None
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def set_function(self, function):
+        """Compute the value at scrape time instead of storing it.
+
+        The function returns a number, or a dict mapping label-value tuples to numbers.
+        """
+        self._function = function
+
+    def samples(self):
+        if self._function is not None:
+            value = self._function()
+            if isinstance(value, dict):
+                return [(self.name, key, None, v) for key, v in value.items()]
+            return [(self.name, (), None, value)]
+        with self._lock:
+            return [(self.name, key, None, v) for key, v in self._values.items()]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for name, labelvalues, extra, value in self.samples():
+            lines.append(f"{name}{_format_labels(self.labelnames, labelvalues, extra)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """A monotonically increasing value."""
+
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """A value that can go up and down."""
+
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, with a running sum."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (plus +Inf), sum, count
+                state = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._values[key] = state
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def snapshot(self, **labels):
+        """Return (count, sum) for one label set."""
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            return (state[2], state[1]) if state else (0, 0.0)
+
+    def samples(self):
+        with self._lock:
+            items = [(key, (list(state[0]), state[1], state[2])) for key, state in self._values.items()]
+        samples = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                samples.append((f"{self.name}_bucket", key, ("le", _format_value(bound)), cumulative))
+            samples.append((f"{self.name}_sum", key, None, total))
+            samples.append((f"{self.name}_count", key, None, count))
+        return samples
+
+
+class MetricsRegistry:
+    """Holds every metric and renders them for a scrape."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def render(self):
+        """Render all metrics in the Prometheus text format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def get_process_rss():
+    """Return the resident set size of this process in bytes."""
+    if PSUTIL_AVAILABLE:
+        return psutil.Process(os.getpid()).memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return 0
+
+
+# Shared registry and the metrics recorded by the web applications
+REGISTRY = MetricsRegistry()
+
+http_requests = REGISTRY.counter(
+    "kokoro_http_requests_total", "HTTP requests handled, by endpoint and status code.",
+    ("endpoint", "status"))
+http_latency = REGISTRY.histogram(
+    "kokoro_http_request_duration_seconds", "End-to-end HTTP request latency.",
+    ("endpoint",))
+stage_latency = REGISTRY.histogram(
+    "kokoro_synthesis_stage_duration_seconds",
+    "Synthesis latency split into queue, phonemize, inference and encode stages.",
+    ("stage",))
+realtime_factor = REGISTRY.histogram(
+    "kokoro_realtime_factor", "Synthesis seconds per second of generated audio, per request.",
+    buckets=RTF_BUCKETS)
+characters_per_second = REGISTRY.histogram(
+    "kokoro_characters_per_second", "Input characters synthesized per second, per request.",
+    buckets=CPS_BUCKETS)
+characters_total = REGISTRY.counter(
+    "kokoro_characters_total", "Input characters synthesized.")
+audio_seconds_total = REGISTRY.counter(
+    "kokoro_audio_seconds_total", "Seconds of audio generated.")
+cache_requests = REGISTRY.counter(
+    "kokoro_cache_requests_total", "Cache lookups, by cache and result (hit or miss).",
+    ("cache", "result"))
+cache_hit_ratio = REGISTRY.gauge(
+    "kokoro_cache_hit_ratio", "Fraction of lookups served from each cache.",
+    ("cache",))
+session_pool_size = REGISTRY.gauge(
+    "kokoro_session_pool_size", "Model sessions available for synthesis.")
+session_pool_busy = REGISTRY.gauge(
+    "kokoro_session_pool_busy", "Model sessions currently synthesizing.")
+session_pool_utilization = REGISTRY.gauge(
+    "kokoro_session_pool_utilization", "Fraction of model sessions currently synthesizing.")
+session_busy_seconds = REGISTRY.counter(
+    "kokoro_session_busy_seconds_total",
+    "Seconds model sessions spent synthesizing; rate() divided by pool size gives utilization.")
+scheduler_running = REGISTRY.gauge(
+    "kokoro_scheduler_running", "Synthesis requests running, by priority class.",
+    ("priority",))
+scheduler_waiting = REGISTRY.gauge(
+    "kokoro_scheduler_waiting", "Synthesis requests waiting for a session, by priority class.",
+    ("priority",))
+admission_decisions = REGISTRY.counter(
+    "kokoro_admission_decisions_total",
+    "Deadline admission decisions, by priority class and decision (admitted, degraded, rejected).",
+    ("priority", "decision"))
+estimated_rtf = REGISTRY.gauge(
+    "kokoro_estimated_realtime_factor", "Smoothed real-time factor used for deadline admission.")
+model_resident = REGISTRY.gauge(
+    "kokoro_model_resident", "1 while the model sessions are loaded, 0 after an idle unload.")
+model_unloads = REGISTRY.counter(
+    "kokoro_model_unloads_total", "Times the model was unloaded after sitting idle.")
+model_reloads = REGISTRY.counter(
+    "kokoro_model_reloads_total", "Times an idle-unloaded model was reloaded for a request.")
+model_reload_seconds = REGISTRY.gauge(
+    "kokoro_model_load_seconds", "Duration of the last model load, by kind (cold_load or reload).",
+    ("kind",))
+model_reclaimed_bytes = REGISTRY.gauge(
+    "kokoro_model_reclaimed_bytes", "Resident memory released by the last idle unload.")
+model_requests = REGISTRY.counter(
+    "kokoro_model_requests_total", "Synthesis requests, by model.", ("model",))
+model_loads = REGISTRY.counter(
+    "kokoro_model_loads_total", "On-demand model loads, by model.", ("model",))
+model_evictions = REGISTRY.counter(
+    "kokoro_model_evictions_total", "On-demand models evicted to stay within the memory budget.",
+    ("model",))
+registry_resident_bytes = REGISTRY.gauge(
+    "kokoro_model_registry_resident_bytes", "Estimated memory held by on-demand models.")
+streams_open = REGISTRY.gauge(
+    "kokoro_streams_open", "Incremental synthesis streams currently open.")
+stream_frames = REGISTRY.counter(
+    "kokoro_stream_frames_total", "Audio frames pushed to incremental streams.")
+stream_ttfa = REGISTRY.histogram(
+    "kokoro_stream_time_to_first_audio_seconds",
+    "Time from a stream's first text fragment to its first audio frame.")
+stream_gap = REGISTRY.histogram(
+    "kokoro_stream_inter_chunk_gap_seconds",
+    "Time between consecutive frames of a stream, counted from when the later sentence was complete.")
+stream_underrun_seconds = REGISTRY.counter(
+    "kokoro_stream_underrun_seconds_total",
+    "Silence clients heard because a frame arrived after the previous one finished playing.")
+batch_items = REGISTRY.counter(
+    "kokoro_batch_items_total",
+    "Batch synthesis items, by result (synthesized, shared with an identical item, failed).",
+    ("result",))
+ready = REGISTRY.gauge(
+    "kokoro_ready", "1 once the model is loaded and the startup warmup has finished.")
+process_rss = REGISTRY.gauge(
+    "process_resident_memory_bytes", "Resident memory size in bytes.")
+process_rss.set_function(get_process_rss)
+
+_cache_lock = threading.Lock()
+_cache_counts = {}
+
+
+def record_cache(cache, hit):
+    """Count a cache lookup and keep its hit ratio current."""
+    cache_requests.inc(cache=cache, result="hit" if hit else "miss")
+    with _cache_lock:
+        hits, total = _cache_counts.get(cache, (0, 0))
+        _cache_counts[cache] = (hits + (1 if hit else 0), total + 1)
+
+
+def _cache_ratios():
+    with _cache_lock:
+        return {(cache,): hits / total for cache, (hits, total) in _cache_counts.items() if total}
+
+
+cache_hit_ratio.set_function(_cache_ratios)
+
+
+def record_synthesis(characters, audio_seconds, synthesis_seconds):
+    """Record throughput figures for one synthesized request."""
+    characters_total.inc(characters)
+    audio_seconds_total.inc(audio_seconds)
+    if audio_seconds > 0:
+        realtime_factor.observe(synthesis_seconds / audio_seconds)
+    if synthesis_seconds > 0:
+        characters_per_second.observe(characters / synthesis_seconds)
+
+
+def render_metrics():
+    """Render the shared registry in the Prometheus text format."""
+    return REGISTRY.render()
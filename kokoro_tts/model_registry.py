@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Model registry for Kokoro Desktop
+Maps model names (full, quantized, ...) to model and voices files, and keeps
+on-demand models resident in a memory-budgeted least-recently-used cache.
+"""
+
+import os
+import json
+import time
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+DEFAULT_MODEL_NAME = "kokoro-v1.0"
+DEFAULT_MODEL_PATH = "./kokoro-v1.0.onnx"
+DEFAULT_VOICES_PATH = "./voices-v1.0.bin"
+
+# Registry file looked up when no path is given (KOKORO_MODELS overrides it)
+DEFAULT_CONFIG_FILE = "models.json"
+
+# Load and evict events kept for /api/models
+MAX_EVENTS = 100
+
+
+class UnknownModel(Exception):
+    """Raised when a request names a model that is not in the registry."""
+
+
+def load_model_config(path=None):
+    """Read the model registry file.
+
+    The file is JSON::
+
+        {
+            "default": "full",
+            "memory_budget_mb": 2048,
+            "models": {
+                "full": {"model": "./kokoro-v1.0.onnx", "voices": "./voices-v1.0.bin"},
+                "int8": {"model": "./kokoro-v1.0.int8.onnx", "voices": "./voices-v1.0.bin"}
+            }
+        }
+
+    Relative paths are resolved against the file's directory. Without a file
+    the registry holds the single model in the current directory.
+
+    Args:
+        path: Registry file (default: $KOKORO_MODELS or ./models.json if present)
+
+    Returns:
+        dict: default, memory_budget_mb and models ({name: {"model", "voices"}})
+
+    Raises:
+        ValueError: If the file is not a valid registry
+    """
+    path = path or os.getenv("KOKORO_MODELS")
+    if not path:
+        if not os.path.exists(DEFAULT_CONFIG_FILE):
+            return {
+                'default': DEFAULT_MODEL_NAME,
+                'memory_budget_mb': None,
+                'models': {DEFAULT_MODEL_NAME: {'model': DEFAULT_MODEL_PATH, 'voices': DEFAULT_VOICES_PATH}},
+            }
+        path = DEFAULT_CONFIG_FILE
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Could not read model registry {path}: {e}")
+
+    models = data.get('models')
+    if not isinstance(models, dict) or not models:
+        raise ValueError(f"Model registry {path} must define at least one model under \"models\"")
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    resolved = {}
+    for name, entry in models.items():
+        if not isinstance(entry, dict) or 'model' not in entry:
+            raise ValueError(f"Model \"{name}\" in {path} needs a \"model\" path")
+        resolved[name] = {
+            'model': os.path.join(base_dir, entry['model']),
+            'voices': os.path.join(base_dir, entry.get('voices', DEFAULT_VOICES_PATH)),
+        }
+
+    default = data.get('default') or next(iter(resolved))
+    if default not in resolved:
+        raise ValueError(f"Default model \"{default}\" is not defined in {path}")
+
+    return {
+        'default': default,
+        'memory_budget_mb': data.get('memory_budget_mb'),
+        'models': resolved,
+    }
+
+
+def resolve_model_paths(model_path, voices_path, default_voices_path=DEFAULT_VOICES_PATH):
+    """Turn a --model value that names a registry entry into file paths.
+
+    Existing files are used as given. A registry name picks up the entry's
+    voices file unless ``voices_path`` was changed from the default.
+    """
+    if os.path.exists(model_path):
+        return model_path, voices_path
+    try:
+        models = load_model_config()['models']
+    except ValueError:
+        return model_path, voices_path
+    entry = models.get(model_path)
+    if entry is None:
+        return model_path, voices_path
+    if voices_path == default_voices_path:
+        voices_path = entry['voices']
+    return entry['model'], voices_path
+
+
+class _ResidentModel:
+    """An on-demand model and the sessions serving it."""
+
+    def __init__(self, name):
+        self.name = name
+        self.sessions = None
+        self.bytes = 0
+        self.active = 0
+        self.lock = threading.Lock()
+
+
+class ModelRegistry:
+    """Named models with the default kept resident and the rest loaded on demand.
+
+    On-demand models live in an LRU cache bounded by a memory budget: before a
+    model is loaded, the least recently used models with no request in flight
+    are evicted until the new one fits. A model is never evicted while it is
+    serving a request, so a burst of traffic can briefly exceed the budget.
+    """
+
+    def __init__(self, models=None, default=None, memory_budget=None, loader=None):
+        """Initialize the registry.
+
+        Args:
+            models: Mapping of name to {"model": path, "voices": path}
+            default: Name of the always-resident model
+            memory_budget: Bytes available to on-demand models (None = unbounded)
+            loader: Function (model_path, voices_path) returning loaded sessions
+        """
+        self._lock = threading.Lock()
+        self._resident = OrderedDict()
+        self.loader = loader
+        self.events = deque(maxlen=MAX_EVENTS)
+        self.requests = {}
+        self.loads = {}
+        self.evictions = {}
+        self.configure(models, default, memory_budget)
+
+    def configure(self, models=None, default=None, memory_budget=None):
+        """Replace the set of known models."""
+        if not models:
+            models = {DEFAULT_MODEL_NAME: {'model': DEFAULT_MODEL_PATH, 'voices': DEFAULT_VOICES_PATH}}
+        with self._lock:
+            self.models = dict(models)
+            self.default = default if default in self.models else next(iter(self.models))
+            self.memory_budget = memory_budget
+            self.requests = {name: self.requests.get(name, 0) for name in self.models}
+            self.loads = {name: self.loads.get(name, 0) for name in self.models}
+            self.evictions = {name: self.evictions.get(name, 0) for name in self.models}
+
+    def names(self):
+        """Return the known model names, default first."""
+        return [self.default] + [name for name in self.models if name != self.default]
+
+    def resolve(self, name=None):
+        """Return the model name to use for a request (None picks the default).
+
+        Raises:
+            UnknownModel: If the name is not in the registry
+        """
+        if not name:
+            return self.default
+        if name not in self.models:
+            raise UnknownModel(f"Unknown model: {name}. Available models: {', '.join(self.names())}")
+        return name
+
+    def paths(self, name=None):
+        """Return (model_path, voices_path) for a model."""
+        entry = self.models[self.resolve(name)]
+        return entry['model'], entry['voices']
+
+    def estimate_bytes(self, name):
+        """Estimate a model's resident size from its files."""
+        size = 0
+        for path in self.paths(name):
+            try:
+                size += os.path.getsize(path)
+            except OSError:
+                pass
+        return size
+
+    def record_request(self, name):
+        """Count a request served by a model."""
+        with self._lock:
+            self.requests[name] = self.requests.get(name, 0) + 1
+
+    def _record_event(self, event, name, **details):
+        self.events.append(dict(time=round(time.time(), 3), event=event, model=name, **details))
+
+    def _resident_bytes(self):
+        return sum(model.bytes for model in self._resident.values() if model.sessions is not None)
+
+    def _make_room(self, name, needed):
+        # Called with the registry lock held
+        if self.memory_budget is None:
+            return
+        for other in list(self._resident.values()):
+            if self._resident_bytes() + needed <= self.memory_budget:
+                break
+            if other.name == name or other.active or other.sessions is None:
+                continue
+            self._evict(other)
+        if self._resident_bytes() + needed > self.memory_budget:
+            print(f"Model {name} exceeds the memory budget while other models are busy; loading anyway")
+
+    def _evict(self, model):
+        # Called with the registry lock held
+        freed = model.bytes
+        model.sessions = None
+        model.bytes = 0
+        del self._resident[model.name]
+        self.evictions[model.name] += 1
+        self._record_event('evict', model.name, bytes=freed)
+        print(f"Evicted model {model.name} ({freed / (1024 * 1024):.0f} MB)")
+
+    @contextmanager
+    def lease(self, name):
+        """Use an on-demand model for the duration of a ``with`` block.
+
+        Loads the model if it is not resident (evicting idle models to stay
+        within the budget) and yields its sessions.
+        """
+        with self._lock:
+            self.requests[name] = self.requests.get(name, 0) + 1
+            model = self._resident.get(name)
+            if model is None:
+                model = _ResidentModel(name)
+                self._resident[name] = model
+            self._resident.move_to_end(name)
+            model.active += 1
+
+        try:
+            with model.lock:
+                if model.sessions is None:
+                    self._load(model)
+            yield model.sessions
+        finally:
+            with self._lock:
+                model.active -= 1
+                if model.sessions is None and not model.active and self._resident.get(name) is model:
+                    # The load failed; forget the placeholder
+                    del self._resident[name]
+
+    def _load(self, model):
+        # Called with the model's own lock held, so other models stay usable
+        model_path, voices_path = self.paths(model.name)
+        needed = self.estimate_bytes(model.name)
+        with self._lock:
+            self._make_room(model.name, needed)
+
+        start = time.perf_counter()
+        sessions = self.loader(model_path, voices_path)
+        seconds = round(time.perf_counter() - start, 3)
+
+        with self._lock:
+            model.sessions = sessions
+            model.bytes = needed
+            self._resident[model.name] = model
+            self.loads[model.name] += 1
+            self._record_event('load', model.name, bytes=needed, seconds=seconds)
+        print(f"Loaded model {model.name} in {seconds}s ({needed / (1024 * 1024):.0f} MB)")
+
+    def evict(self, name):
+        """Evict an on-demand model if it is idle; returns True if it was evicted."""
+        with self._lock:
+            model = self._resident.get(name)
+            if model is None or model.active or model.sessions is None:
+                return False
+            self._evict(model)
+            return True
+
+    def is_resident(self, name):
+        with self._lock:
+            model = self._resident.get(name)
+            return model is not None and model.sessions is not None
+
+    def stats(self):
+        """Return per-model state, counters and recent load/evict events."""
+        with self._lock:
+            models = {}
+            for name in self.names():
+                model = self._resident.get(name)
+                models[name] = {
+                    "model_path": self.models[name]['model'],
+                    "voices_path": self.models[name]['voices'],
+                    "default": name == self.default,
+                    "resident": model is not None and model.sessions is not None,
+                    "resident_bytes": model.bytes if model is not None else 0,
+                    "active": model.active if model is not None else 0,
+                    "requests": self.requests.get(name, 0),
+                    "loads": self.loads.get(name, 0),
+                    "evictions": self.evictions.get(name, 0),
+                }
+            return {
+                "default": self.default,
+                "memory_budget_bytes": self.memory_budget,
+                "resident_bytes": self._resident_bytes(),
+                "lru": list(self._resident),
+                "models": models,
+                "events": list(self.events),
+            }
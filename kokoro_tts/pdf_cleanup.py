@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Page analysis for PDF text extraction
+Finds running headers and footers (page numbers, running titles) by position
+and text across pages, footnote markers and blocks that are mostly digits or
+symbols (tables of numbers, equations), so they are not synthesized.
+"""
+
+import re
+from collections import Counter
+
+from kokoro_tts.scheduler import DEFAULT_CHARS_PER_AUDIO_SECOND
+
+# Blocks this close to the top or bottom edge (fraction of the page height)
+# are candidates for running headers and footers
+MARGIN_FRACTION = 0.12
+# A margin block is a running header/footer when the same text appears at the
+# same height on at least this many pages within RUNNING_WINDOW pages either
+# side, which also catches running titles that change with the chapter
+MIN_REPEAT_PAGES = 3
+RUNNING_WINDOW = 10
+# Heights are compared in buckets of this many points
+Y_BUCKET = 10
+
+# Blocks with at least this many visible characters, of which fewer than
+# this fraction are letters, are treated as non-speech (tables, equations)
+MIN_SYMBOL_BLOCK_CHARS = 12
+MIN_LETTER_RATIO = 0.5
+
+# Real-time factor assumed when estimating the synthesis time saved
+ESTIMATED_RTF = 0.3
+
+# PyMuPDF span flag for superscript text
+_SUPERSCRIPT = 1
+_FOOTNOTE_MARKER = re.compile(r'^[\d*†‡§¶,\s]+$')
+
+
+def block_signature(text):
+    """Text of a margin block with numbers masked, so "Page 3" matches "Page 4"."""
+    return re.sub(r'\d+', '#', ' '.join(text.lower().split()))
+
+
+def is_non_speech(text):
+    """True for a block that is mostly digits and symbols."""
+    visible = [c for c in text if not c.isspace()]
+    if len(visible) < MIN_SYMBOL_BLOCK_CHARS:
+        return False
+    letters = sum(1 for c in visible if c.isalpha())
+    return letters / len(visible) < MIN_LETTER_RATIO
+
+
+def _is_footnote_marker(span):
+    return bool(span['flags'] & _SUPERSCRIPT) and bool(_FOOTNOTE_MARKER.match(span['text'])) \
+        and bool(span['text'].strip())
+
+
+def read_page_blocks(page):
+    """Text blocks of a page as (margin key or None, text, footnote marker characters)."""
+    height = page.rect.height
+    blocks = []
+    for block in page.get_text("dict")["blocks"]:
+        if block.get("type") != 0:
+            continue  # Images carry no text
+        markers = 0
+        lines = []
+        for line in block["lines"]:
+            spans = []
+            for span in line["spans"]:
+                if _is_footnote_marker(span):
+                    markers += len(span['text'].strip())
+                else:
+                    spans.append(span['text'])
+            lines.append("".join(spans))
+        text = "\n".join(lines).strip()
+
+        key = None
+        y0, y1 = block["bbox"][1], block["bbox"][3]
+        if text and (y1 <= height * MARGIN_FRACTION or y0 >= height * (1 - MARGIN_FRACTION)):
+            key = (round(y0 / Y_BUCKET), block_signature(text))
+        blocks.append((key, text, markers))
+    return blocks
+
+
+class PageCleaner:
+    """Page text for a PDF with running headers/footers and non-speech removed.
+
+    Pages are added in order as they are read (see ``read_page_blocks``). A
+    page's text is final once the pages within RUNNING_WINDOW after it have
+    been added, or once every page has, so chapters can be assembled while
+    later pages are still being read.
+    """
+
+    def __init__(self, window=RUNNING_WINDOW):
+        self.window = window
+        self.pages = []
+        self.keys = []
+        self.complete = False
+        self.removed = Counter()
+
+    def add(self, blocks):
+        """Add the next page's blocks."""
+        self.pages.append(blocks)
+        self.keys.append({key for key, _text, _markers in blocks if key})
+
+    def ready(self, page_num):
+        """True once enough pages around page_num are known to clean it."""
+        return self.complete or page_num + self.window < len(self.pages)
+
+    def is_running(self, key, page_num):
+        if key is None:
+            return False
+        pages = self.keys[max(0, page_num - self.window):page_num + self.window + 1]
+        return sum(1 for keys in pages if key in keys) >= MIN_REPEAT_PAGES
+
+    def page_text(self, page_num):
+        """Return one page's speakable text, counting what was removed."""
+        kept = []
+        for key, text, markers in self.pages[page_num]:
+            self.removed['footnote_markers'] += markers
+            if self.is_running(key, page_num):
+                self.removed['running_headers'] += len(text)
+            elif is_non_speech(text):
+                self.removed['non_speech'] += len(text)
+            elif text:
+                kept.append(text)
+        return "\n".join(kept)
+
+    def report(self):
+        """Print how much text was dropped and the synthesis time that saves."""
+        characters = sum(self.removed.values())
+        if not characters:
+            return
+        audio_seconds = characters / DEFAULT_CHARS_PER_AUDIO_SECOND
+        print(f"\nRemoved {characters:,} characters of non-speech PDF content "
+              f"({self.removed['running_headers']:,} running headers/footers, "
+              f"{self.removed['non_speech']:,} tables and symbols, "
+              f"{self.removed['footnote_markers']:,} footnote markers): "
+              f"about {audio_seconds / 60:.1f} min of audio and "
+              f"{audio_seconds * ESTIMATED_RTF / 60:.1f} min of synthesis")
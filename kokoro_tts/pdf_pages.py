@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Parallel page extraction for PDF input
+Pages are read in fixed-size ranges by a pool of processes, each opening its
+own copy of the document, and handed back in page order so chapters can be
+assembled as soon as their pages are in. Only a few ranges are read ahead of
+the caller, so memory stays bounded however long the document is.
+"""
+
+import os
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz
+import pymupdf4llm
+
+from kokoro_tts.pdf_cleanup import read_page_blocks
+
+# Pages per task handed to a worker process
+PAGES_PER_TASK = 16
+
+# Pages per Markdown conversion window
+MARKDOWN_WINDOW_PAGES = 20
+
+# Documents shorter than this are read in-process; each worker takes a couple
+# of seconds to start, which only pays off on long documents
+PARALLEL_MIN_PAGES = 200
+
+# Tasks in flight (or finished but not yet consumed) per worker
+READ_AHEAD = 2
+
+
+def default_page_workers():
+    """One process per CPU core, at most eight."""
+    return max(1, min(os.cpu_count() or 1, 8))
+
+
+def read_page_range(task):
+    """Read some pages of a PDF: block lists if ``blocks``, else plain text."""
+    pdf_path, page_numbers, blocks = task
+    with fitz.open(pdf_path) as doc:
+        return [read_page_blocks(doc[page_num]) if blocks else doc[page_num].get_text()
+                for page_num in page_numbers]
+
+
+def markdown_window(task):
+    """Convert some pages of a PDF to Markdown."""
+    pdf_path, page_numbers = task
+    return pymupdf4llm.to_markdown(pdf_path, pages=list(page_numbers), show_progress=False)
+
+
+def _ordered_map(func, tasks, workers, pages):
+    """Yield func(task) for each task in order, a few tasks ahead in a process pool."""
+    workers = min(workers or default_page_workers(), len(tasks))
+    if workers <= 1 or pages < PARALLEL_MIN_PAGES:
+        for task in tasks:
+            yield func(task)
+        return
+
+    # Spawned rather than forked: the caller may already run threads (ONNX Runtime, servers)
+    pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+    pending = deque()
+    remaining = iter(tasks)
+    try:
+        while True:
+            while len(pending) < workers * READ_AHEAD:
+                task = next(remaining, None)
+                if task is None:
+                    break
+                pending.append(pool.submit(func, task))
+            if not pending:
+                return
+            yield pending.popleft().result()
+    finally:
+        # Stop reading if the caller stopped early
+        pool.shutdown(cancel_futures=True)
+
+
+def iter_pages(pdf_path, page_numbers, workers=None, blocks=True):
+    """Yield the given pages of a PDF in order, read by a pool of processes.
+
+    Args:
+        pdf_path: Path to the PDF file
+        page_numbers: 0-based page numbers to read, e.g. range(page_count)
+        workers: Worker processes (default: one per core, at most eight)
+        blocks: Yield ``read_page_blocks`` lists instead of plain page text
+    """
+    page_numbers = list(page_numbers)
+    tasks = [(pdf_path, page_numbers[start:start + PAGES_PER_TASK], blocks)
+             for start in range(0, len(page_numbers), PAGES_PER_TASK)]
+    for pages in _ordered_map(read_page_range, tasks, workers, len(page_numbers)):
+        yield from pages
+
+
+def iter_markdown_windows(pdf_path, page_numbers, workers=None):
+    """Yield (first page, last page, markdown) for each window of the given pages, in order."""
+    page_numbers = list(page_numbers)
+    tasks = [(pdf_path, page_numbers[start:start + MARKDOWN_WINDOW_PAGES])
+             for start in range(0, len(page_numbers), MARKDOWN_WINDOW_PAGES)]
+    for task, markdown in zip(tasks, _ordered_map(markdown_window, tasks, workers, len(page_numbers))):
+        yield task[1][0] + 1, task[1][-1] + 1, markdown
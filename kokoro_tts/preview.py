@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Quick previews of an input file for the desktop GUI
+Only the opening sentences of a book are read and synthesized, one sentence
+at a time, and playback starts as soon as the first one is ready. Finished
+previews are kept per file, voice, speed and language, so going back to a
+voice that was already heard plays it again at once.
+"""
+
+import os
+import queue
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import sounddevice as sd
+
+from kokoro_tts import PdfParser
+from kokoro_tts.epub_reader import iter_epub_text
+from kokoro_tts.selection import estimate_seconds
+from kokoro_tts.streaming import SentenceCutter
+
+# A preview ends after this many sentences or this much estimated audio
+PREVIEW_SENTENCES = 5
+PREVIEW_SECONDS = 30
+
+# Characters read at a time from a text file
+TEXT_READ_CHARS = 4096
+
+# Previews kept in memory, least recently played dropped first
+PREVIEW_CACHE_ENTRIES = 32
+
+
+def _text_fragments(input_file):
+    """Yield the text of a book from the start, a piece at a time."""
+    if input_file.endswith('.epub'):
+        for text in iter_epub_text(input_file):
+            yield text + "\n"
+    elif input_file.endswith('.pdf'):
+        for chapter in PdfParser(input_file, interactive=False).iter_chapters():
+            yield chapter['content'] + "\n"
+    else:
+        with open(input_file, 'r', encoding='utf-8', errors='replace') as f:
+            for block in iter(lambda: f.read(TEXT_READ_CHARS), ''):
+                yield block
+
+
+def preview_sentences(input_file, max_sentences=PREVIEW_SENTENCES, max_seconds=PREVIEW_SECONDS, speed=1.0):
+    """The opening sentences of a book, reading no more of it than needed."""
+    cutter = SentenceCutter()
+    sentences = []
+    seconds = 0.0
+    fragments = _text_fragments(input_file)
+    try:
+        for fragment in fragments:
+            for sentence in cutter.feed(fragment):
+                sentences.append(sentence)
+                seconds += estimate_seconds(sentence, speed)
+                if len(sentences) >= max_sentences or seconds >= max_seconds:
+                    return sentences
+    finally:
+        fragments.close()
+    return (sentences + cutter.flush())[:max_sentences]
+
+
+class PreviewCache:
+    """Finished preview audio keyed by file, voice, speed and language."""
+
+    def __init__(self, max_entries=PREVIEW_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(input_file, voice, speed, lang):
+        # An edited file gets new previews
+        stat = os.stat(input_file)
+        return (os.path.abspath(input_file), stat.st_mtime_ns, stat.st_size, voice, round(speed, 2), lang)
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.entries:
+                return None
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+    def put(self, key, samples, sample_rate):
+        with self.lock:
+            self.entries[key] = (samples, sample_rate)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+
+class SentencePlayer:
+    """Play sentences in order on a background thread while later ones are synthesized."""
+
+    def __init__(self):
+        self.pending = queue.Queue()
+        self.stopped = False
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def add(self, samples, sample_rate):
+        self.pending.put((samples, sample_rate))
+
+    def finish(self):
+        """Play what has been added, then stop; wait() returns when it is done."""
+        self.pending.put(None)
+
+    def wait(self):
+        self.thread.join()
+
+    def stop(self):
+        self.stopped = True
+        self.pending.put(None)
+        sd.stop()
+
+    def _run(self):
+        while True:
+            item = self.pending.get()
+            if item is None or self.stopped:
+                return
+            sd.play(*item)
+            sd.wait()
+
+
+def play_preview(kokoro, input_file, voice, speed, lang, cache, on_status=None, cancel=None):
+    """Play the opening of input_file, from the cache or sentence by sentence.
+
+    Args:
+        kokoro: Loaded Kokoro model
+        input_file: Text, EPUB or PDF file
+        cache: PreviewCache the finished preview is stored in
+        on_status: Called with a progress message
+        cancel: threading.Event that stops synthesis and playback when set
+
+    Returns:
+        True if the preview came from the cache
+    """
+    on_status = on_status or (lambda message: None)
+    key = cache.key(input_file, voice, speed, lang)
+    cached = cache.get(key)
+    if cached is not None:
+        on_status("Playing preview")
+        sd.play(*cached)
+        sd.wait()
+        return True
+
+    on_status("Preparing preview...")
+    sentences = preview_sentences(input_file, speed=speed)
+    player = SentencePlayer()
+    parts = []
+    sample_rate = None
+    try:
+        for number, sentence in enumerate(sentences, 1):
+            if cancel is not None and cancel.is_set():
+                player.stop()
+                return False
+            samples, sample_rate = kokoro.create(sentence, voice=voice, speed=speed, lang=lang)
+            parts.append(samples)
+            player.add(samples, sample_rate)
+            on_status(f"Playing preview ({number}/{len(sentences)} sentences synthesized)")
+        player.finish()
+        player.wait()
+    except BaseException:
+        player.stop()
+        raise
+
+    if parts:
+        cache.put(key, np.concatenate(parts), sample_rate)
+    return False
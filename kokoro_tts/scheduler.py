@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Synthesis scheduler for the Kokoro Desktop web applications
+Orders waiting requests by priority class, caps how many of each class run at
+once, and estimates completion times so requests that cannot meet their
+deadline are turned away (or shortened) before they take a session.
+"""
+
+import re
+import threading
+import time
+import itertools
+from contextlib import contextmanager
+
+# Priority classes, highest precedence first
+PRIORITY_CLASSES = ('interactive', 'bulk')
+
+# Texts up to this many characters count as interactive when the client does not say
+INTERACTIVE_MAX_CHARS = 1000
+
+# Typical characters spoken per second of audio at speed 1.0, used until measured
+DEFAULT_CHARS_PER_AUDIO_SECOND = 14.0
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request's estimated completion is past its deadline."""
+
+    def __init__(self, estimated_seconds, deadline_seconds):
+        super().__init__(f"Estimated completion in {estimated_seconds:.2f}s exceeds the "
+                         f"{deadline_seconds:.2f}s deadline")
+        self.estimated_seconds = estimated_seconds
+        self.deadline_seconds = deadline_seconds
+
+
+class RateEstimator:
+    """Running estimate of synthesis speed from recent requests.
+
+    Keeps exponentially weighted averages of the real-time factor (synthesis
+    seconds per audio second) and of characters spoken per audio second.
+    """
+
+    def __init__(self, alpha=0.2):
+        self.alpha = alpha
+        self.rtf = None
+        self.chars_per_audio_second = DEFAULT_CHARS_PER_AUDIO_SECOND
+        self.samples = 0
+        self._lock = threading.Lock()
+
+    def observe(self, characters, audio_seconds, synthesis_seconds):
+        """Fold one finished synthesis into the averages."""
+        if audio_seconds <= 0 or characters <= 0:
+            return
+        rtf = synthesis_seconds / audio_seconds
+        cps = characters / audio_seconds
+        with self._lock:
+            if self.rtf is None:
+                self.rtf = rtf
+                self.chars_per_audio_second = cps
+            else:
+                self.rtf += self.alpha * (rtf - self.rtf)
+                self.chars_per_audio_second += self.alpha * (cps - self.chars_per_audio_second)
+            self.samples += 1
+
+    def estimate(self, characters, speed=1.0):
+        """Return the estimated synthesis seconds for a text, or None before any measurement."""
+        if self.rtf is None:
+            return None
+        audio_seconds = characters / (self.chars_per_audio_second * max(speed, 0.1))
+        return audio_seconds * self.rtf
+
+    def characters_within(self, seconds, speed=1.0):
+        """Return roughly how many characters can be synthesized in ``seconds``."""
+        if self.rtf is None or self.rtf <= 0:
+            return None
+        return int(seconds / self.rtf * self.chars_per_audio_second * max(speed, 0.1))
+
+
+def truncate_to_sentences(text, max_chars):
+    """Return the longest run of whole sentences from the start of ``text`` within ``max_chars``."""
+    if len(text) <= max_chars:
+        return text
+    cut = ""
+    for match in re.finditer(r'[^.!?。！？]+[.!?。！？]*\s*', text):
+        if match.end() > max_chars:
+            break
+        cut = text[:match.end()]
+    return cut.strip()
+
+
+class _Ticket:
+    """A request waiting for (or holding) a synthesis slot."""
+
+    def __init__(self, priority, seq, estimate):
+        self.priority = priority
+        self.rank = PRIORITY_CLASSES.index(priority)
+        self.seq = seq
+        self.estimate = estimate or 0.0
+
+
+class SynthesisScheduler:
+    """Admit synthesis requests by priority class within per-class concurrency limits.
+
+    At most ``capacity`` syntheses run at once (one per model session; a
+    request split into sentences takes a slot per sentence). When a slot
+    frees up it goes to the oldest waiting request of the highest
+    priority class that is still under its own limit, so interactive previews
+    overtake queued bulk jobs, and a bulk limit below the capacity keeps
+    sessions free for interactive traffic.
+    """
+
+    def __init__(self, capacity=1, limits=None):
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._waiting = []
+        self.running = {priority: 0 for priority in PRIORITY_CLASSES}
+        self.admitted = {priority: 0 for priority in PRIORITY_CLASSES}
+        self.rejected = {priority: 0 for priority in PRIORITY_CLASSES}
+        self.degraded = {priority: 0 for priority in PRIORITY_CLASSES}
+        self._outstanding = {priority: 0.0 for priority in PRIORITY_CLASSES}
+        self.estimator = RateEstimator()
+        self.requested_limits = dict(limits or {})
+        self.configure(capacity)
+
+    def configure(self, capacity, limits=None):
+        """Set the number of sessions and the per-class limits (defaults derive from capacity)."""
+        with self._cond:
+            if limits is not None:
+                self.requested_limits = dict(limits)
+            self.capacity = max(1, capacity)
+            default_limits = {
+                'interactive': self.capacity,
+                # Leave a session for interactive requests whenever there is more than one
+                'bulk': max(1, self.capacity - 1),
+            }
+            self.limits = {
+                priority: max(1, self.requested_limits.get(priority) or default_limits[priority])
+                for priority in PRIORITY_CLASSES
+            }
+            self._cond.notify_all()
+
+    def classify(self, text, requested=None):
+        """Return the priority class for a request, trusting a valid client hint."""
+        if requested in PRIORITY_CLASSES:
+            return requested
+        return 'interactive' if len(text) <= INTERACTIVE_MAX_CHARS else 'bulk'
+
+    def estimate_wait(self, priority):
+        """Estimate seconds until a new request of this class would get a slot."""
+        rank = PRIORITY_CLASSES.index(priority)
+        with self._cond:
+            # Work admitted ahead of this request: same or higher precedence classes
+            ahead = sum(self._outstanding[p] for p in PRIORITY_CLASSES[:rank + 1])
+            return ahead / self.capacity
+
+    def admit(self, text, speed=1.0, priority='interactive', deadline=None, degrade=False, parallelism=1):
+        """Decide whether a request can finish within its deadline.
+
+        Args:
+            text: Text to synthesize
+            speed: Requested speech speed
+            priority: Priority class of the request
+            deadline: Seconds the client is willing to wait (None = no deadline)
+            degrade: Shorten the text to whole sentences that fit instead of rejecting
+            parallelism: Sessions the request's sentences can be spread across
+
+        Returns:
+            tuple: (text to synthesize, estimated seconds or None, whether it was shortened)
+
+        Raises:
+            DeadlineExceeded: If the request cannot finish in time
+        """
+        parallelism = max(1, parallelism)
+        synthesis = self.estimator.estimate(len(text), speed)
+        if synthesis is not None:
+            synthesis /= parallelism
+        if deadline is None or synthesis is None:
+            # Nothing to check against until a synthesis has been measured
+            self._count(self.admitted, priority)
+            return text, synthesis, False
+
+        wait = self.estimate_wait(priority)
+        estimated = wait + synthesis
+        if estimated <= deadline:
+            self._count(self.admitted, priority)
+            return text, estimated, False
+
+        if degrade:
+            max_chars = self.estimator.characters_within(deadline - wait, speed)
+            if max_chars:
+                max_chars *= parallelism
+            shortened = truncate_to_sentences(text, max_chars) if max_chars and max_chars > 0 else ""
+            if shortened:
+                self._count(self.degraded, priority)
+                return shortened, wait + self.estimator.estimate(len(shortened), speed) / parallelism, True
+
+        self._count(self.rejected, priority)
+        raise DeadlineExceeded(estimated, deadline)
+
+    def _count(self, counter, priority):
+        with self._cond:
+            counter[priority] += 1
+
+    def _next_runnable(self):
+        if sum(self.running.values()) >= self.capacity:
+            return None
+        for ticket in sorted(self._waiting, key=lambda t: (t.rank, t.seq)):
+            if self.running[ticket.priority] < self.limits[ticket.priority]:
+                return ticket
+        return None
+
+    @contextmanager
+    def slot(self, priority='interactive', estimate=None):
+        """Wait for a synthesis slot for the duration of a ``with`` block.
+
+        Yields the seconds spent waiting for the slot.
+        """
+        start = time.perf_counter()
+        with self._cond:
+            ticket = _Ticket(priority, next(self._seq), estimate)
+            self._waiting.append(ticket)
+            self._outstanding[priority] += ticket.estimate
+            while self._next_runnable() is not ticket:
+                self._cond.wait()
+            self._waiting.remove(ticket)
+            self.running[priority] += 1
+        try:
+            yield time.perf_counter() - start
+        finally:
+            with self._cond:
+                self.running[priority] -= 1
+                self._outstanding[priority] -= ticket.estimate
+                self._cond.notify_all()
+
+    def waiting(self):
+        """Return the number of queued requests per class."""
+        with self._cond:
+            counts = {priority: 0 for priority in PRIORITY_CLASSES}
+            for ticket in self._waiting:
+                counts[ticket.priority] += 1
+            return counts
+
+    def stats(self):
+        """Return scheduler counters as a dictionary."""
+        waiting = self.waiting()
+        with self._cond:
+            return {
+                "capacity": self.capacity,
+                "limits": dict(self.limits),
+                "running": dict(self.running),
+                "waiting": waiting,
+                "admitted": dict(self.admitted),
+                "degraded": dict(self.degraded),
+                "rejected": dict(self.rejected),
+                "rtf": self.estimator.rtf,
+                "chars_per_audio_second": self.estimator.chars_per_audio_second,
+            }
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Selective rendering for the Kokoro Desktop CLI
+Parses --chapters and --pages ranges and trims a book to a --max-seconds
+budget of estimated audio. Chapters are filtered as they are extracted, so
+extraction stops once the last wanted chapter (or the budget) is reached.
+"""
+
+from kokoro_tts import chapter_chunks
+from kokoro_tts.scheduler import DEFAULT_CHARS_PER_AUDIO_SECOND
+
+
+def parse_ranges(spec):
+    """Parse "3-5,9" into [(3, 5), (9, 9)] (1-based, inclusive).
+
+    Raises:
+        ValueError: If the spec is empty, malformed or not in ascending order
+    """
+    ranges = []
+    for part in spec.split(','):
+        part = part.strip()
+        first, sep, last = part.partition('-')
+        try:
+            first = int(first)
+            last = int(last) if sep else first
+        except ValueError:
+            raise ValueError(f"Invalid range '{part}': use numbers like 3-5,9")
+        if first < 1 or last < first:
+            raise ValueError(f"Invalid range '{part}': numbers start at 1 and ranges go upwards")
+        ranges.append((first, last))
+    return ranges
+
+
+def in_ranges(number, ranges):
+    return any(first <= number <= last for first, last in ranges)
+
+
+def select_chapters(chapters, ranges):
+    """Yield the chapters whose 1-based position is in ranges, with that 'number'.
+
+    Stops reading chapters after the last wanted one.
+    """
+    last = max(last for _first, last in ranges)
+    for number, chapter in enumerate(chapters, 1):
+        if number > last:
+            return
+        if in_ranges(number, ranges):
+            yield dict(chapter, number=number)
+
+
+def estimate_seconds(text, speed=1.0):
+    """Estimated audio length of text at the given speed."""
+    return len(text) / DEFAULT_CHARS_PER_AUDIO_SECOND / speed
+
+
+def limit_duration(chapters, max_seconds, speed=1.0):
+    """Yield chapters until about max_seconds of audio is covered.
+
+    The chapter that crosses the budget is cut after the chunk that reaches
+    it, and no further chapters are read.
+    """
+    remaining = max_seconds
+    for chapter in chapters:
+        chunks = chapter_chunks(chapter)
+        kept = []
+        for chunk in chunks:
+            if remaining <= 0:
+                break
+            kept.append(chunk)
+            remaining -= estimate_seconds(chunk, speed)
+        if len(kept) < len(chunks):
+            chapter = dict(chapter, content=' '.join(kept), chunks=kept)
+        if kept:
+            yield chapter
+        if remaining <= 0:
+            print(f"\nStopped at --max-seconds {max_seconds:g} "
+                  f"(about {max_seconds - remaining:.0f}s of estimated audio)")
+            return
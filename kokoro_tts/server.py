@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Production server for the Kokoro Desktop web applications
+A pre-forking server: with several workers the master process loads the model
+and voices once, then forks worker processes that share the read-only weights
+copy-on-write; a single worker loads the model itself, after the fork.
+"""
+
+import os
+import sys
+import gc
+import time
+import random
+import signal
+import socket
+import threading
+from werkzeug.serving import make_server
+from kokoro_tts import web_service
+
+# Seconds a worker waits in accept() before re-checking its shutdown flags
+WORKER_POLL_INTERVAL = 1.0
+
+DEFAULT_SERVER_OPTIONS = {
+    'dev': False,
+    'host': '127.0.0.1',
+    'port': 5001,
+    'workers': 1,
+    'sessions': None,
+    'max_requests': 1000,
+    'max_requests_jitter': 50,
+    'warmup': True,
+    'warmup_langs': None,
+    'warmup_lengths': None,
+    'interactive_concurrency': None,
+    'bulk_concurrency': None,
+    'idle_unload': None,
+    'models': None,
+    'model_memory': None,
+}
+
+def print_server_usage(prog):
+    print(f"""
+Usage: {prog} [options]
+
+Options:
+    --dev                       Run the Flask development server (debug mode, auto-reload)
+    --host <str>                Interface to listen on (default: 127.0.0.1)
+    --port <int>                Port to listen on (default: 5001)
+    --workers <int>             Number of worker processes (default: 1). One worker loads the model
+                                itself with multi-threaded sessions (and reloads it when recycled);
+                                several share one copy loaded by the master, with single-threaded sessions
+    --sessions <int>            Model sessions per process that synthesize sentences in parallel
+                                (default: half the cores, up to 4, with one worker or --dev;
+                                CPU cores / workers with several workers)
+    --max-requests <int>        Recycle a worker after this many requests (default: 1000, 0 = never)
+    --max-requests-jitter <int> Random extra requests per worker so recycling is staggered (default: 50)
+    --warmup-langs <list>       Comma separated languages to warm up at startup (default: all)
+    --warmup-lengths <list>     Comma separated warmup text lengths in characters (default: 40,200,500)
+    --no-warmup                 Skip the startup warmup; /readyz reports ready once the model loads
+    --models <file>             Model registry file naming the models requests can pick
+                                (default: $KOKORO_MODELS, or models.json if present)
+    --model-memory <MB>         Memory budget for models loaded on demand (default: from the registry, else unbounded)
+    --idle-unload <minutes>     Release the model after this many minutes without requests and
+                                reload it when the next request arrives (default: never)
+    --interactive-concurrency <int>  Interactive requests synthesizing at once per process (default: all sessions)
+    --bulk-concurrency <int>    Bulk requests synthesizing at once per process (default: all sessions but one, at least 1)
+    -h, --help                  Show this help message
+
+With several workers, /api/status, /metrics and the scheduler and coalescing
+counters describe only the worker process that answered the request.
+    """)
+
+def parse_server_args(argv, prog="kokoro-web"):
+    """Parse web server command line options into a dictionary"""
+    options = dict(DEFAULT_SERVER_OPTIONS)
+    int_options = {
+        '--port': 'port',
+        '--workers': 'workers',
+        '--sessions': 'sessions',
+        '--max-requests': 'max_requests',
+        '--max-requests-jitter': 'max_requests_jitter',
+        '--interactive-concurrency': 'interactive_concurrency',
+        '--bulk-concurrency': 'bulk_concurrency',
+    }
+    at_least_one = ('--workers', '--sessions', '--interactive-concurrency', '--bulk-concurrency')
+
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg in ('-h', '--help'):
+            print_server_usage(prog)
+            sys.exit(0)
+        elif arg == '--dev':
+            options['dev'] = True
+        elif arg == '--no-warmup':
+            options['warmup'] = False
+        elif arg == '--warmup-langs' and i + 1 < len(argv):
+            options['warmup_langs'] = [lang.strip() for lang in argv[i + 1].split(',') if lang.strip()]
+            i += 1
+        elif arg == '--warmup-lengths' and i + 1 < len(argv):
+            try:
+                options['warmup_lengths'] = [int(length) for length in argv[i + 1].split(',') if length.strip()]
+            except ValueError:
+                print("Error: --warmup-lengths must be comma separated whole numbers")
+                sys.exit(1)
+            i += 1
+        elif arg == '--models' and i + 1 < len(argv):
+            options['models'] = argv[i + 1]
+            i += 1
+        elif arg == '--model-memory' and i + 1 < len(argv):
+            try:
+                options['model_memory'] = float(argv[i + 1])
+            except ValueError:
+                print("Error: --model-memory must be a number of megabytes")
+                sys.exit(1)
+            i += 1
+        elif arg == '--idle-unload' and i + 1 < len(argv):
+            try:
+                options['idle_unload'] = float(argv[i + 1])
+            except ValueError:
+                print("Error: --idle-unload must be a number of minutes")
+                sys.exit(1)
+            if options['idle_unload'] <= 0:
+                print("Error: --idle-unload must be greater than 0")
+                sys.exit(1)
+            i += 1
+        elif arg == '--host' and i + 1 < len(argv):
+            options['host'] = argv[i + 1]
+            i += 1
+        elif arg in int_options and i + 1 < len(argv):
+            try:
+                value = int(argv[i + 1])
+            except ValueError:
+                print(f"Error: {arg} must be a whole number")
+                sys.exit(1)
+            if value < 0 or (arg in at_least_one and value < 1):
+                print(f"Error: {arg} must be {'at least 1' if arg in at_least_one else 'zero or more'}")
+                sys.exit(1)
+            options[int_options[arg]] = value
+            i += 1
+        else:
+            print(f"Error: Unknown option: {arg}")
+            print_server_usage(prog)
+            sys.exit(1)
+        i += 1
+
+    return options
+
+def _create_listener(host, port):
+    """Bind the listening socket that every worker accepts from"""
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(128)
+    sock.set_inheritable(True)
+    return sock
+
+def _run_worker(app, load_model, listener, host, port, max_requests, master_pid):
+    """Serve requests on the inherited socket until recycled or told to stop"""
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.set())
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    served = [0]
+    served_lock = threading.Lock()
+
+    def counting_app(environ, start_response):
+        with served_lock:
+            served[0] += 1
+        return app(environ, start_response)
+
+    server = make_server(host, port, counting_app, threaded=True, fd=listener.fileno())
+    server.timeout = WORKER_POLL_INTERVAL
+    # Track request threads so server_close() lets in-flight responses finish
+    server.daemon_threads = False
+    server.block_on_close = True
+
+    # Warm this worker in the background; /readyz reports 503 until it is done
+    web_service.start_background_startup(load_model)
+
+    while not stopping.is_set():
+        if max_requests and served[0] >= max_requests:
+            break
+        # Exit if the master went away
+        if os.getppid() != master_pid:
+            break
+        server.handle_request()
+
+    # Waits for in-flight request threads before returning
+    server.server_close()
+
+def run_prefork_server(app, load_model, options):
+    """Load the model once (when there are several workers), then fork and supervise worker processes
+
+    Args:
+        app: Flask application to serve
+        load_model: Function that loads the model into the application's globals
+        options: Parsed server options (see parse_server_args)
+    """
+    if not hasattr(os, 'fork'):
+        print("Multi-process mode needs fork(); serving from a single threaded process instead.")
+        web_service.start_background_startup(load_model)
+        app.run(host=options['host'], port=options['port'], threaded=True)
+        return
+
+    if options['workers'] > 1:
+        # ONNX Runtime thread pools do not survive fork(), so each worker runs
+        # single-threaded sessions and the worker count provides the parallelism
+        web_service.session_threads = 1
+        if web_service.pool_size is None:
+            # Single-threaded sessions, so spread the cores over workers and sessions
+            web_service.pool_size = max(1, (os.cpu_count() or 1) // options['workers'])
+    if web_service.idle_config['timeout']:
+        # Memory shared with the master could not be released by a worker's
+        # idle unload, so each worker loads its own copy instead
+        print("Idle unloading enabled: workers load the model themselves")
+    elif options['workers'] > 1:
+        # A single worker has nothing to share, so it loads the model itself
+        # after the fork and its sessions keep ONNX Runtime's thread pools
+        load_model()
+
+        # Keep the garbage collector from touching (and so copying) the loaded objects
+        gc.collect()
+        if hasattr(gc, 'freeze'):
+            gc.freeze()
+
+    listener = _create_listener(options['host'], options['port'])
+    master_pid = os.getpid()
+    workers = {}
+    stopping = False
+
+    def spawn_worker():
+        limit = options['max_requests']
+        if limit and options['max_requests_jitter']:
+            limit += random.randint(0, options['max_requests_jitter'])
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                _run_worker(app, load_model, listener, options['host'], options['port'], limit, master_pid)
+            except Exception as e:
+                print(f"Worker {os.getpid()} failed: {e}")
+                exit_code = 1
+            finally:
+                # os._exit skips atexit, so remove this worker's optimized graph here
+                web_service.remove_optimized_models()
+                os._exit(exit_code)
+        workers[pid] = time.time()
+        return pid
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    print(f"Serving on http://{options['host']}:{options['port']} with {options['workers']} worker(s)"
+          f" (master pid {master_pid})")
+    for _ in range(options['workers']):
+        spawn_worker()
+
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        started = workers.pop(pid, None)
+        if started is None or stopping:
+            continue
+
+        if os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0:
+            print(f"Worker {pid} recycled after {time.time() - started:.0f}s")
+        else:
+            print(f"Worker {pid} exited unexpectedly (status {status}); restarting")
+            # Avoid a tight respawn loop if workers die on startup
+            if time.time() - started < 1:
+                time.sleep(1)
+        spawn_worker()
+
+    listener.close()
+    print("Server stopped")
+
+def serve(app, load_model, argv=None, prog="kokoro-web"):
+    """Run a web application from command line options
+
+    Production (multi-process) mode is the default; --dev keeps the
+    Flask development server with the debugger and reloader.
+    """
+    options = parse_server_args(sys.argv[1:] if argv is None else argv, prog)
+    web_service.configure_warmup(options['warmup'], options['warmup_langs'], options['warmup_lengths'])
+    try:
+        web_service.configure_models(options['models'], options['model_memory'])
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    web_service.pool_size = options['sessions']
+    web_service.configure_idle_unload(options['idle_unload'])
+    web_service.configure_scheduler(options['interactive_concurrency'], options['bulk_concurrency'])
+    if options['dev']:
+        # Serve right away; the model loads and warms up in the background
+        web_service.start_background_startup(load_model)
+        app.run(debug=True, host=options['host'], port=options['port'])
+    else:
+        run_prefork_server(app, load_model, options)
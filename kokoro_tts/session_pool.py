@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Session pool for Kokoro Desktop
+Lends loaded model sessions to synthesis requests, one request per session at a time
+"""
+
+import copy
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from kokoro_onnx import Kokoro
+
+
+def clone_kokoro(kokoro):
+    """Make another Kokoro wrapper around the same loaded inference session
+
+    ONNX Runtime sessions can run from several threads at once, so the
+    weights are loaded once; each wrapper gets its own tokenizer and voices
+    file handle, which are not safe to share between threads.
+    """
+    if not isinstance(kokoro, Kokoro):
+        return copy.copy(kokoro)
+    return Kokoro.from_session(kokoro.sess, kokoro.config.voices_path, kokoro.config.espeak_config)
+
+
+class SessionPool:
+    """A fixed set of model sessions handed out to callers in turn.
+
+    Callers that find every session busy queue until one is released, so the
+    time spent in ``acquire`` is the request's queueing delay.
+    """
+
+    def __init__(self, sessions):
+        """Initialize the pool.
+
+        Args:
+            sessions: Loaded Kokoro instances to lend out
+        """
+        self.sessions = list(sessions)
+        self.size = len(self.sessions)
+        self._idle = queue.LifoQueue()
+        for session in self.sessions:
+            self._idle.put(session)
+        self._lock = threading.Lock()
+        self.busy = 0
+        self.leases = 0
+        self.busy_seconds = 0.0
+        self._lease_started = {}
+
+    def acquire(self, timeout=None):
+        """Take an idle session, waiting up to ``timeout`` seconds.
+
+        Returns:
+            tuple: (session, seconds spent waiting)
+
+        Raises:
+            queue.Empty: If no session became idle in time
+        """
+        start = time.perf_counter()
+        session = self._idle.get(timeout=timeout)
+        waited = time.perf_counter() - start
+        with self._lock:
+            self.busy += 1
+            self.leases += 1
+            self._lease_started[id(session)] = time.perf_counter()
+        return session, waited
+
+    def release(self, session):
+        """Return a session taken with ``acquire``."""
+        with self._lock:
+            self.busy -= 1
+            started = self._lease_started.pop(id(session), None)
+            if started is not None:
+                self.busy_seconds += time.perf_counter() - started
+        self._idle.put(session)
+
+    @contextmanager
+    def session(self, timeout=None):
+        """Borrow a session for the duration of a ``with`` block."""
+        session, _ = self.acquire(timeout)
+        try:
+            yield session
+        finally:
+            self.release(session)
+
+    def utilization(self):
+        """Return the fraction of sessions currently in use."""
+        return self.busy / self.size if self.size else 0.0
+
+    def stats(self):
+        """Return pool counters as a dictionary."""
+        with self._lock:
+            return {
+                "size": self.size,
+                "busy": self.busy,
+                "leases": self.leases,
+                "busy_seconds": self.busy_seconds,
+                "utilization": self.busy / self.size if self.size else 0.0,
+            }
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Incremental text-in / audio-out streaming for the Kokoro Desktop web applications
+Text fragments are cut into sentences as they arrive; each sentence is
+synthesized as soon as it is complete and sent back as a numbered PCM frame.
+"""
+
+import re
+import time
+import uuid
+import base64
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Sentences shorter than this wait for more text ("Mr.", "No.") before being cut
+MIN_SENTENCE_CHARS = 24
+# Text without a sentence end is cut at a comma or space once it grows this long
+MAX_SENTENCE_CHARS = 300
+
+# Silence put between separately synthesized sentences; the model trims the
+# pause at each end of its output, so joined sentences would otherwise run together
+SENTENCE_GAP_SECONDS = 0.15
+
+# Streams with no activity for this long are closed and forgotten
+STREAM_IDLE_TIMEOUT = 300
+# Seconds between keep-alive comments on an idle event stream
+KEEPALIVE_INTERVAL = 15
+
+# A sentence end followed by whitespace; the whitespace shows the text after
+# the punctuation has arrived, so "3." in "3.14" is not cut too early
+_SENTENCE_END = re.compile(r'[.!?;。！？]+["\')\]]*\s+|\n+')
+
+
+class SentenceCutter:
+    """Accumulate text fragments and hand back sentences once they are complete."""
+
+    def __init__(self, min_chars=MIN_SENTENCE_CHARS, max_chars=MAX_SENTENCE_CHARS):
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self.buffer = ""
+
+    def feed(self, fragment):
+        """Add a fragment and return the sentences it completed."""
+        self.buffer += fragment
+        sentences = []
+        while True:
+            cut = self._find_cut()
+            if cut is None:
+                break
+            sentence = self.buffer[:cut].strip()
+            self.buffer = self.buffer[cut:].lstrip()
+            if sentence:
+                sentences.append(sentence)
+        return sentences
+
+    def flush(self):
+        """Return whatever text is left as the final sentence(s)."""
+        rest = self.buffer.strip()
+        self.buffer = ""
+        if not rest:
+            return []
+        sentences = []
+        while len(rest) > self.max_chars:
+            cut = self._soft_cut(rest)
+            sentences.append(rest[:cut].strip())
+            rest = rest[cut:].strip()
+        if rest:
+            sentences.append(rest)
+        return sentences
+
+    def _find_cut(self):
+        for match in _SENTENCE_END.finditer(self.buffer):
+            if match.end() > self.max_chars:
+                break
+            if len(self.buffer[:match.start()].strip()) >= self.min_chars:
+                return match.end()
+        if len(self.buffer) > self.max_chars:
+            return self._soft_cut(self.buffer)
+        return None
+
+    def _soft_cut(self, text):
+        # No sentence end in reach: break at the last comma, then space, before the limit
+        cut = text.rfind(', ', 0, self.max_chars)
+        if cut <= 0:
+            cut = text.rfind(' ', 0, self.max_chars)
+        return cut + 1 if cut > 0 else self.max_chars
+
+
+def sentence_gap(sample_rate):
+    """Silence to put between two sentences synthesized by separate calls."""
+    return np.zeros(int(sample_rate * SENTENCE_GAP_SECONDS), dtype=np.float32)
+
+def encode_pcm_frame(samples):
+    """Encode float samples as base64 16-bit little-endian PCM."""
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype('<i2')
+    return base64.b64encode(pcm.tobytes()).decode('ascii')
+
+
+class AudioStream:
+    """One client's stream: sentences are synthesized ahead, frames are sent in order.
+
+    Sentences are submitted to a small per-stream executor as soon as they are
+    cut, so the next sentence synthesizes while the current frame plays, and
+    the event generator hands frames out strictly by sequence number.
+    """
+
+    def __init__(self, synthesize, voice, speed, language, model=None, workers=2, on_frame=None):
+        """Initialize the stream.
+
+        Args:
+            synthesize: Function (sentence, voice, speed, language, model) returning (samples, sample_rate)
+            voice, speed, language, model: Synthesis settings for every sentence
+            workers: Sentences synthesized ahead at once
+            on_frame: Optional callback(stream, frame_timing) after each frame is sent
+        """
+        self.id = uuid.uuid4().hex
+        self.synthesize = synthesize
+        self.voice = voice
+        self.speed = speed
+        self.language = language
+        self.model = model
+        self.on_frame = on_frame
+        self.cutter = SentenceCutter()
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers))
+        self._cond = threading.Condition()
+        self._pending = []  # (seq, sentence, submitted_at, future)
+        self._next_seq = 0
+        self.closed = False
+        self.created = time.time()
+        self.last_activity = self.created
+        self.first_text_at = None
+        self.first_audio_at = None
+        self.last_frame_at = None
+        self.last_frame_seconds = 0.0
+        self.frames_sent = 0
+        self.audio_seconds = 0.0
+        self.underrun_seconds = 0.0
+
+    def add_text(self, fragment, final=False):
+        """Feed a text fragment; returns the number of sentences queued."""
+        with self._cond:
+            if self.closed:
+                raise ValueError("Stream is closed")
+            now = time.time()
+            self.last_activity = now
+            if self.first_text_at is None and fragment.strip():
+                self.first_text_at = now
+            sentences = self.cutter.feed(fragment)
+            if final:
+                sentences += self.cutter.flush()
+                self.closed = True
+            for sentence in sentences:
+                future = self.executor.submit(self.synthesize, sentence, self.voice, self.speed,
+                                              self.language, self.model)
+                self._pending.append((self._next_seq, sentence, now, future))
+                self._next_seq += 1
+            self._cond.notify_all()
+            return len(sentences)
+
+    def close(self):
+        """Finish the stream, synthesizing any text still buffered."""
+        if not self.closed:
+            self.add_text("", final=True)
+
+    def abort(self):
+        """Stop the stream without synthesizing what is left."""
+        with self._cond:
+            self.closed = True
+            for _, _, _, future in self._pending:
+                future.cancel()
+            self._pending = []
+            self._cond.notify_all()
+        self.executor.shutdown(wait=False)
+
+    def events(self):
+        """Yield ("audio", frame), ("error", details) and finally ("end", stats) events.
+
+        Yields (None, None) as a keep-alive while waiting for text.
+        """
+        while True:
+            item = None
+            with self._cond:
+                if not self._pending and not self.closed:
+                    self._cond.wait(KEEPALIVE_INTERVAL)
+                if self._pending:
+                    item = self._pending.pop(0)
+                elif self.closed:
+                    break
+            if item is None:
+                yield None, None
+                continue
+
+            seq, sentence, submitted_at, future = item
+            try:
+                samples, sample_rate = future.result()
+            except Exception as e:
+                yield "error", {"seq": seq, "text": sentence, "error": str(e)}
+                continue
+            if seq > 0:
+                # Lead with the pause that ends the previous sentence
+                samples = np.concatenate([sentence_gap(sample_rate), samples])
+
+            frame = {
+                "seq": seq,
+                "text": sentence,
+                "format": "pcm_s16le",
+                "sample_rate": sample_rate,
+                "duration": round(len(samples) / sample_rate, 3),
+                "audio": encode_pcm_frame(samples),
+            }
+            timing = self._record_frame(submitted_at, frame["duration"])
+            yield "audio", frame
+            if self.on_frame:
+                self.on_frame(self, timing)
+
+        self.executor.shutdown(wait=False)
+        yield "end", self.stats()
+
+    def _record_frame(self, submitted_at, duration):
+        now = time.time()
+        timing = {"ttfa": None, "gap": None, "underrun": 0.0}
+        if self.first_audio_at is None:
+            self.first_audio_at = now
+            timing["ttfa"] = now - (self.first_text_at or self.created)
+        else:
+            # Time the server took beyond the moment this sentence could have been sent
+            timing["gap"] = now - max(self.last_frame_at, submitted_at)
+            # Silence the client hears if the previous frame finished playing first
+            playback_end = self.last_frame_at + self.last_frame_seconds
+            if submitted_at <= playback_end and now > playback_end:
+                timing["underrun"] = now - playback_end
+                self.underrun_seconds += timing["underrun"]
+        self.last_frame_at = now
+        self.last_frame_seconds = duration
+        self.frames_sent += 1
+        self.audio_seconds += duration
+        self.last_activity = now
+        return timing
+
+    def stats(self):
+        """Return timing figures for this stream."""
+        ttfa = None
+        if self.first_audio_at is not None:
+            ttfa = round(self.first_audio_at - (self.first_text_at or self.created), 3)
+        return {
+            "stream_id": self.id,
+            "frames": self.frames_sent,
+            "audio_seconds": round(self.audio_seconds, 3),
+            "time_to_first_audio": ttfa,
+            "underrun_seconds": round(self.underrun_seconds, 3),
+            "closed": self.closed,
+        }
+
+
+class StreamRegistry:
+    """Open streams by id, forgetting ones that have gone quiet."""
+
+    def __init__(self, idle_timeout=STREAM_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._streams = {}
+
+    def add(self, stream):
+        self.expire()
+        with self._lock:
+            self._streams[stream.id] = stream
+        return stream
+
+    def get(self, stream_id):
+        with self._lock:
+            return self._streams.get(stream_id)
+
+    def remove(self, stream_id):
+        with self._lock:
+            return self._streams.pop(stream_id, None)
+
+    def expire(self):
+        """Close and drop streams with no activity within the idle timeout."""
+        cutoff = time.time() - self.idle_timeout
+        with self._lock:
+            stale = [s for s in self._streams.values() if s.last_activity < cutoff]
+            for stream in stale:
+                del self._streams[stream.id]
+        for stream in stale:
+            stream.abort()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._streams)
@@ -5,16 +5,17 @@ A web interface for the text-to-speech application with multi-voice blending
 """
 
 import os
-import tempfile
 import threading
 from flask import Flask, render_template_string, request, jsonify, send_file
-from kokoro_onnx import Kokoro
 import numpy as np
-import soundfile as sf
 import io
-import base64
+from kokoro_tts.server import serve
+from kokoro_tts.web_service import service_api, create_kokoro, attach_model, wake_model, model_resident, model_available, synthesize, get_coalescing_stats, admit_request, get_scheduler_stats, get_idle_stats, ModelUnavailable, get_model_paths
+from kokoro_tts.model_registry import UnknownModel
+from kokoro_tts.scheduler import DeadlineExceeded
 
 app = Flask(__name__)
+app.register_blueprint(service_api)
 
 # HTML template as a string
 HTML_TEMPLATE = '''
@@ -160,6 +161,9 @@ HTML_TEMPLATE = '''
                         <button type="button" class="btn btn-primary flex-fill" id="convertBtn">
                             <i class="fas fa-bolt"></i> Convert & Download
                         </button>
+                        <button type="button" class="btn btn-outline-secondary flex-fill" id="auditionBtn">
+                            <i class="fas fa-th-list"></i> Audition All Voices
+                        </button>
                     </div>
 
                     <!-- Progress Bar -->
@@ -175,6 +179,12 @@ HTML_TEMPLATE = '''
                         <label class="form-label">Audio Preview:</label>
                         <audio class="audio-player" id="audioPlayer" controls></audio>
                     </div>
+
+                    <!-- Voice Audition -->
+                    <div id="auditionContainer" class="mt-3" style="display: none;">
+                        <label class="form-label">Voice Audition:</label>
+                        <div id="auditionClips"></div>
+                    </div>
                 </div>
             </div>
         </div>
@@ -200,6 +210,9 @@ HTML_TEMPLATE = '''
         const audioPlayerContainer = document.getElementById('audioPlayerContainer');
         const audioPlayer = document.getElementById('audioPlayer');
         const voiceBlendingControls = document.getElementById('voiceBlendingControls');
+        const auditionBtn = document.getElementById('auditionBtn');
+        const auditionContainer = document.getElementById('auditionContainer');
+        const auditionClips = document.getElementById('auditionClips');
 
         // Initialize
         document.addEventListener('DOMContentLoaded', function() {
@@ -230,6 +243,7 @@ HTML_TEMPLATE = '''
             // Button clicks
             previewBtn.addEventListener('click', handlePreview);
             convertBtn.addEventListener('click', handleConvert);
+            auditionBtn.addEventListener('click', handleAudition);
         }
 
         // Load available voices
@@ -574,6 +588,65 @@ HTML_TEMPLATE = '''
             });
         }
 
+        // Render the text with every voice and list a player for each
+        function handleAudition() {
+            const text = textInput.value.trim();
+            if (!text) {
+                alert('Please enter some text to convert.');
+                return;
+            }
+
+            showProgress('Rendering every voice...');
+
+            fetch('/api/audition', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({
+                    text: text,
+                    speed: parseFloat(speedSlider.value),
+                    language: languageSelect.value
+                })
+            })
+            .then(response => response.json())
+            .then(data => {
+                hideProgress();
+
+                if (!data.clips) {
+                    alert('Error: ' + (data.error || 'Unknown error'));
+                    return;
+                }
+                auditionClips.innerHTML = '';
+                data.clips.forEach(clip => {
+                    const row = document.createElement('div');
+                    row.className = 'mb-2';
+                    const label = document.createElement('div');
+                    label.className = 'small';
+                    if (clip.status === 'failed') {
+                        label.textContent = `${clip.voice}: ${clip.error}`;
+                        row.appendChild(label);
+                    } else {
+                        label.textContent = `${clip.voice} (${clip.duration.toFixed(1)}s, rendered in ` +
+                            `${clip.render_seconds.toFixed(1)}s${clip.status === 'cached' ? ', cached' : ''})`;
+                        const audio = document.createElement('audio');
+                        audio.className = 'audio-player';
+                        audio.controls = true;
+                        audio.src = 'data:audio/wav;base64,' + clip.audio_data;
+                        row.appendChild(label);
+                        row.appendChild(audio);
+                    }
+                    auditionClips.appendChild(row);
+                });
+                auditionContainer.style.display = 'block';
+            })
+            .catch(error => {
+                hideProgress();
+                alert('Error: ' + error.message);
+                console.error('Error:', error);
+            });
+        }
+
         // Initialize with one voice control for multi-voice mode
         window.onload = function() {
             // Wait for voices to load before adding controls
@@ -587,23 +660,22 @@ HTML_TEMPLATE = '''
 </html>
 '''
 
-# Global variables for the Kokoro model
-kokoro = None
-model_loaded = False
+# Voices and languages of the loaded model (the model itself lives in web_service's session pool)
 available_voices = []
 available_languages = []
 
 def load_model():
     """Load the Kokoro model if files exist"""
-    global kokoro, model_loaded, available_voices, available_languages
+    global available_voices, available_languages
     
-    model_path = "./kokoro-v1.0.onnx"
-    voices_path = "./voices-v1.0.bin"
+    # Default model from the registry (models.json, or the files in the current directory)
+    model_path, voices_path = get_model_paths()
     
     if os.path.exists(model_path) and os.path.exists(voices_path):
         try:
-            kokoro = Kokoro(model_path, voices_path)
-            model_loaded = True
+            # The session pool owns the model, so an idle unload can release it
+            kokoro = create_kokoro(model_path, voices_path)
+            attach_model(kokoro)
             
             # Get available voices and languages
             available_voices = sorted(list(kokoro.get_voices()))
@@ -612,20 +684,19 @@ def load_model():
             print(f"Model loaded successfully. Available voices: {len(available_voices)}, languages: {len(available_languages)}")
         except Exception as e:
             print(f"Failed to load model: {str(e)}")
-            model_loaded = False
     else:
-        print("Model files not found. Please check that kokoro-v1.0.onnx and voices-v1.0.bin are in the current directory.")
+        print(f"Model files not found. Please check that {model_path} and {voices_path} exist.")
 
 @app.route('/')
 def index():
-    if not model_loaded:
-        load_model()
+    # Load (or reload after an idle unload) in the background rather than blocking this request
+    wake_model(load_model)
 
     return render_template_string(HTML_TEMPLATE)
 
 @app.route('/api/convert', methods=['POST'])
 def convert_text():
-    if not model_loaded:
+    if not model_available():
         return jsonify({"error": "Model not loaded"}), 500
 
     data = request.json
@@ -634,60 +705,68 @@ def convert_text():
     speed = float(data.get('speed', 1.0))
     language = data.get('language', 'en-us')
     effect = data.get('effect', 'none')  # New effect parameter
+    model = data.get('model')  # Registry model name (default model if omitted)
 
     if not text:
         return jsonify({"error": "No text provided"}), 400
 
     try:
-        # Process the voice blend if it contains commas (indicating multiple voices)
-        processed_voice = voice
-        if ',' in voice:
-            # Use validate_voice to process the voice blend
-            from kokoro_tts import validate_voice
-            processed_voice = validate_voice(voice, kokoro)
-        elif voice not in kokoro.get_voices():
-            # Validate single voice
-            from kokoro_tts import validate_voice
-            processed_voice = validate_voice(voice, kokoro)
-
-        # Create audio using the processed voice
-        samples, sample_rate = kokoro.create(text, voice=processed_voice, speed=speed, lang=language)
+        # Pick the priority class and turn away requests that cannot meet their deadline
+        admission = admit_request(text, speed, data.get('priority'))
+    except DeadlineExceeded as e:
+        return jsonify({
+            "error": str(e),
+            "estimated_seconds": round(e.estimated_seconds, 3)
+        }), 503
+    except ValueError:
+        return jsonify({"error": "X-Deadline-Ms must be a number of milliseconds"}), 400
+
+    try:
+        # Identical requests already in flight share a single synthesis
+        audio_data = synthesize(admission["text"], voice, speed, language, admission["priority"], model)
 
         # Note: Actual audio effects would be applied here if the kokoro library supported them
         # For now, we pass the parameters along but the actual effects depend on the underlying library
 
-        # Write to temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as tmp_file:
-            sf.write(tmp_file.name, samples, sample_rate)
-            audio_path = tmp_file.name
-
-        # Encode to base64 for transmission
-        with open(audio_path, 'rb') as f:
-            audio_data = base64.b64encode(f.read()).decode('utf-8')
-
-        # Clean up temp file
-        os.unlink(audio_path)
-
         return jsonify({
             "success": True,
             "audio_data": audio_data,
             "format": "audio/wav",
-            "effect": effect
+            "effect": effect,
+            "priority": admission["priority"],
+            "estimated_seconds": admission["estimated_seconds"],
+            "truncated": admission["truncated"]
         })
 
+    except UnknownModel as e:
+        return jsonify({"error": str(e)}), 400
+
+    except ModelUnavailable as e:
+        return jsonify({"error": str(e)}), 503
+
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/voices')
 def get_voices():
-    if not model_loaded:
-        load_model()
+    # Load (or reload after an idle unload) in the background rather than blocking this request
+    wake_model(load_model)
     return jsonify({"voices": available_voices})
 
+@app.route('/api/status')
+def get_status():
+    return jsonify({
+        "model_loaded": model_resident(),
+        "voices_count": len(available_voices) if available_voices else 0,
+        "languages_count": len(available_languages) if available_languages else 0,
+        "coalescing": get_coalescing_stats(),
+        "scheduler": get_scheduler_stats(),
+        "idle": get_idle_stats()
+    })
+
 def main():
     """Main function to run the web GUI"""
-    load_model()
-    app.run(debug=True, port=5001)
+    serve(app, load_model, prog="kokoro-web")
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
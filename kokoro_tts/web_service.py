@@ -0,0 +1,948 @@
+#!/usr/bin/env python3
+"""
+Shared synthesis service for the Kokoro Desktop web applications
+Used by both kokoro-app (app.py) and kokoro-web (web_gui.py)
+"""
+
+import os
+import gc
+import io
+import re
+import json
+import atexit
+import ctypes
+import tempfile
+import base64
+import time
+import threading
+import numpy as np
+import soundfile as sf
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, ExitStack
+import onnxruntime as rt
+from flask import Blueprint, Response, g, request, jsonify
+from kokoro_onnx import Kokoro
+from kokoro_tts import validate_voice
+from kokoro_tts.coalesce import RequestCoalescer, make_request_key
+from kokoro_tts.session_pool import SessionPool, clone_kokoro
+from kokoro_tts.scheduler import SynthesisScheduler, PRIORITY_CLASSES
+from kokoro_tts.model_registry import ModelRegistry, UnknownModel, load_model_config
+from kokoro_tts.streaming import AudioStream, StreamRegistry, sentence_gap
+from kokoro_tts.batch import (parse_batch_items, run_batch, build_manifest, iter_zip, iter_multipart,
+                              multipart_boundary, BATCH_FORMATS)
+from kokoro_tts.audition import list_voices, pick_voices, render_matrix, cached_clip, clip_key
+from kokoro_tts import metrics
+
+# Routes shared by both web applications
+service_api = Blueprint('service_api', __name__)
+
+# Identical requests that are in flight at the same time share one synthesis
+coalescer = RequestCoalescer()
+
+# Sessions used to serve synthesis requests (set by attach_model)
+pool = None
+
+# Orders requests by priority class and decides deadline admission
+scheduler = SynthesisScheduler()
+
+# ONNX Runtime threads per inference session (None keeps the runtime default,
+# or splits the cores between pool sessions). The multi-process server sets
+# this to 1 because runtime thread pools do not survive fork().
+session_threads = None
+
+# Sessions in the pool, each synthesizing one sentence at a time
+# (None = one per two CPU cores, up to 4)
+pool_size = None
+
+# Longest text sent to the model in one call; longer sentences are split at
+# commas or spaces so their phonemes stay within the model's context
+SENTENCE_MAX_CHARS = 300
+# Shorter fragments (abbreviations, "Yes.") are joined to the next sentence
+SENTENCE_MIN_CHARS = 24
+
+# A sentence ends at a terminator followed by whitespace or the end of the text
+# (so "3.5" and "e.g." stay whole); full-width terminators need no space
+_SENTENCE_END = re.compile(r'[.!?;]+["\')\]]*(?:\s+|$)|[。！？]+["\')\]]*\s*')
+
+# Speeds the model accepts (kokoro_onnx asserts on anything else)
+MIN_SPEED = 0.5
+MAX_SPEED = 2.0
+
+# Idle unloading: release the sessions after this many seconds without
+# synthesis requests (None keeps the model resident)
+idle_config = {
+    'timeout': None,
+}
+
+idle_state = {
+    'state': 'resident',
+    'unloads': 0,
+    'reloads': 0,
+    'reclaimed_bytes': None,
+    'cold_load_seconds': None,
+    'reload_seconds': None,
+}
+
+# How long a request waits for an idle-unloaded model to come back
+RELOAD_WAIT_SECONDS = 60
+
+# Guards pool swaps against in-flight requests
+_model_lock = threading.Condition()
+_active_requests = 0
+_last_request = time.time()
+_load_model = None
+_reload_thread = None
+
+# Graphs saved by ONNX Runtime after optimization, by source model path
+_optimized_models = {}
+
+
+class ModelUnavailable(Exception):
+    """Raised when the model is not resident and did not reload in time."""
+
+
+def get_pool_size():
+    """Return the number of sessions to put in the pool"""
+    if pool_size:
+        return pool_size
+    return max(1, min(4, (os.cpu_count() or 2) // 2))
+
+def create_kokoro(model_path, voices_path):
+    """Load a Kokoro model, honouring the configured session thread count"""
+    threads = session_threads
+    if threads is None and get_pool_size() > 1:
+        # Sessions run side by side, so give each its share of the cores
+        threads = max(1, (os.cpu_count() or 1) // get_pool_size())
+    if threads is None and not idle_config['timeout']:
+        return Kokoro(model_path, voices_path)
+
+    options = rt.SessionOptions()
+    if threads is not None:
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = threads
+
+    load_path = model_path
+    if idle_config['timeout']:
+        # Save the optimized graph on the first load; reloading it after an
+        # idle unload skips graph optimization, which is most of a cold start
+        optimized = _optimized_models.get(model_path)
+        if optimized and os.path.exists(optimized):
+            options.graph_optimization_level = rt.GraphOptimizationLevel.ORT_DISABLE_ALL
+            load_path = optimized
+        else:
+            optimized = os.path.join(tempfile.gettempdir(),
+                                     f"kokoro-optimized-{os.getpid()}-{os.path.basename(model_path)}")
+            options.optimized_model_filepath = optimized
+            _optimized_models[model_path] = optimized
+
+    providers = [os.getenv("ONNX_PROVIDER")] if os.getenv("ONNX_PROVIDER") else ["CPUExecutionProvider"]
+    session = rt.InferenceSession(load_path, sess_options=options, providers=providers)
+    return Kokoro.from_session(session, voices_path)
+
+@atexit.register
+def remove_optimized_models():
+    """Delete the optimized graphs saved for idle reloads
+
+    Registered with atexit; processes that leave through os._exit (prefork
+    workers) must call it themselves.
+    """
+    for path in _optimized_models.values():
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+    _optimized_models.clear()
+
+def build_pool(kokoro):
+    """Wrap a loaded model in a pool of sessions that share its weights"""
+    return SessionPool([kokoro] + [clone_kokoro(kokoro) for _ in range(get_pool_size() - 1)])
+
+def attach_model(kokoro):
+    """Serve synthesis requests for the default model from a loaded Kokoro model"""
+    global pool
+    sessions = build_pool(kokoro)
+    with _model_lock:
+        pool = sessions
+        scheduler.configure(pool.size)
+        _model_lock.notify_all()
+
+# Named models; the default one is served from ``pool``, the others are
+# loaded on demand and kept in a memory-budgeted LRU
+registry = ModelRegistry(loader=lambda model_path, voices_path: build_pool(create_kokoro(model_path, voices_path)))
+
+def configure_models(path=None, memory_budget_mb=None):
+    """Load the model registry file and set the on-demand memory budget
+
+    Args:
+        path: Registry file (default: $KOKORO_MODELS or ./models.json if present)
+        memory_budget_mb: Megabytes for on-demand models (None = the file's value, or unbounded)
+    """
+    config = load_model_config(path)
+    budget = memory_budget_mb if memory_budget_mb is not None else config['memory_budget_mb']
+    registry.configure(config['models'], config['default'],
+                       int(budget * 1024 * 1024) if budget else None)
+
+def get_model_paths(name=None):
+    """Return (model_path, voices_path) for a registry model (None = the default)"""
+    return registry.paths(name)
+
+def get_model_stats():
+    """Return per-model state, request counts and load/evict events"""
+    stats = registry.stats()
+    stats['models'][registry.default]['resident'] = pool is not None
+    stats['models'][registry.default]['active'] = _active_requests
+    return stats
+
+def configure_scheduler(interactive_limit=None, bulk_limit=None):
+    """Set per-class concurrency limits (None derives the limit from the pool size)"""
+    scheduler.configure(pool.size if pool else 1, {'interactive': interactive_limit, 'bulk': bulk_limit})
+
+# Warmup synthesis run at startup so the first real request is not the slow one
+WARMUP_SAMPLES = {
+    'en-us': "The quick brown fox jumps over the lazy dog.",
+    'en-gb': "The quick brown fox jumps over the lazy dog.",
+    'fr-fr': "Le vif renard brun saute par-dessus le chien paresseux.",
+    'it': "La volpe marrone veloce salta sopra il cane pigro.",
+    'ja': "すばやい茶色の狐がのろまな犬を飛び越える。",
+    'cmn': "敏捷的棕色狐狸跳过了懒狗。",
+}
+
+# Voice name prefixes by language (a = American English, b = British English, ...)
+VOICE_PREFIXES = {'en-us': 'a', 'en-gb': 'b', 'fr-fr': 'f', 'it': 'i', 'ja': 'j', 'cmn': 'z'}
+
+# Warmup settings: languages (None = every language the model supports) and
+# text lengths in characters, covering short previews up to a full chunk
+warmup_config = {
+    'enabled': True,
+    'languages': None,
+    'lengths': [40, 200, 500],
+}
+
+warmup_state = {
+    'state': 'pending',
+    'completed': 0,
+    'total': 0,
+    'seconds': None,
+    'error': None,
+}
+
+_startup_lock = threading.Lock()
+_startup_thread = None
+
+def configure_warmup(enabled=True, languages=None, lengths=None):
+    """Set which languages and text lengths are synthesized during warmup"""
+    warmup_config['enabled'] = enabled
+    warmup_config['languages'] = languages
+    if lengths:
+        warmup_config['lengths'] = sorted(lengths)
+
+def build_warmup_plan(languages, lengths):
+    """Return the (language, text) pairs to synthesize during warmup"""
+    plan = []
+    for lang in languages:
+        sample = WARMUP_SAMPLES.get(lang)
+        if not sample:
+            continue
+        for length in lengths:
+            text = sample
+            while len(text) < length:
+                text = f"{text} {sample}"
+            plan.append((lang, text[:length]))
+    return plan
+
+def pick_voice(kokoro, lang):
+    """Pick a voice that matches the language, falling back to the first voice"""
+    voices = list(kokoro.get_voices())
+    prefix = VOICE_PREFIXES.get(lang)
+    for voice in voices:
+        if prefix and voice.startswith(prefix):
+            return voice
+    return voices[0]
+
+def run_warmup():
+    """Synthesize the warmup set so runtime arenas and the phonemizer are initialized"""
+    if not warmup_config['enabled']:
+        warmup_state['state'] = 'disabled'
+        return
+
+    with pool.session() as session:
+        languages = warmup_config['languages'] or list(session.get_languages())
+    plan = build_warmup_plan(languages, warmup_config['lengths'])
+    warmup_state.update(state='running', completed=0, total=len(plan), error=None)
+
+    start = time.perf_counter()
+    try:
+        for lang, text in plan:
+            with pool.session() as session:
+                synthesis_start = time.perf_counter()
+                samples, sample_rate = session.create(text, voice=pick_voice(session, lang), speed=1.0, lang=lang)
+            # Warmup timings give deadline admission a real-time factor to start from
+            scheduler.estimator.observe(len(text), len(samples) / sample_rate,
+                                        time.perf_counter() - synthesis_start)
+            warmup_state['completed'] += 1
+    except Exception as e:
+        # A failed warmup leaves a slower first request, not a broken server
+        print(f"Warmup failed: {e}")
+        warmup_state['error'] = str(e)
+    # The other sessions share the inference session, but each has its own phonemizer
+    try:
+        for session in pool.sessions[1:]:
+            tokenizer = getattr(session, 'tokenizer', None)
+            if tokenizer is not None:
+                for lang in languages:
+                    if lang in WARMUP_SAMPLES:
+                        tokenizer.phonemize(WARMUP_SAMPLES[lang], lang)
+    except Exception as e:
+        print(f"Phonemizer warmup failed: {e}")
+    warmup_state['seconds'] = round(time.perf_counter() - start, 3)
+    warmup_state['state'] = 'done'
+    print(f"Warmup finished: {warmup_state['completed']}/{warmup_state['total']} syntheses"
+          f" in {warmup_state['seconds']}s")
+
+def _load_and_warm(load_model):
+    global _load_model
+    _load_model = load_model
+    if pool is None:
+        start = time.perf_counter()
+        load_model()
+        if pool is not None:
+            idle_state['cold_load_seconds'] = round(time.perf_counter() - start, 3)
+    if pool is None:
+        warmup_state['state'] = 'failed'
+        warmup_state['error'] = "Model could not be loaded"
+        return
+    run_warmup()
+
+def start_background_startup(load_model):
+    """Load the model (if needed) and run the warmup set without blocking the caller"""
+    global _startup_thread
+    with _startup_lock:
+        if _startup_thread is not None and (_startup_thread.is_alive() or pool is not None):
+            return _startup_thread
+        _startup_thread = threading.Thread(target=_load_and_warm, args=(load_model,), daemon=True)
+        _startup_thread.start()
+        if idle_config['timeout']:
+            threading.Thread(target=_idle_monitor, daemon=True).start()
+        return _startup_thread
+
+def model_resident():
+    """True while the default model's sessions are loaded"""
+    return pool is not None
+
+def model_available():
+    """True if the default model is loaded, or was unloaded while idle and reloads on demand"""
+    return pool is not None or idle_state['state'] in ('unloaded', 'reloading')
+
+def wake_model(load_model):
+    """Bring the default model back without blocking the caller
+
+    Reloads a model that was unloaded while idle, or starts the first load
+    with ``load_model`` if it never loaded.
+    """
+    global _last_request
+    with _model_lock:
+        if pool is not None or idle_state['state'] == 'reloading':
+            return
+        if idle_state['state'] == 'unloaded' and _load_model is not None:
+            # Counts as activity, so the idle monitor does not unload it again at once
+            _last_request = time.time()
+            _start_reload()
+            return
+    start_background_startup(load_model)
+
+def is_ready():
+    """True once the model is loaded and the warmup set has run
+
+    An idle-unloaded model still counts as ready: the next request reloads it.
+    """
+    return model_available() and warmup_state['state'] in ('done', 'disabled')
+
+def configure_idle_unload(minutes=None):
+    """Unload the model after ``minutes`` without synthesis requests (None = never)"""
+    idle_config['timeout'] = minutes * 60 if minutes else None
+
+def _trim_heap():
+    # Hand freed heap pages back to the OS; glibc keeps them otherwise
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+def unload_model():
+    """Release the sessions and voices, keeping the process serving
+
+    Returns:
+        int: Bytes of resident memory reclaimed, or None if nothing was unloaded
+    """
+    global pool
+    with _model_lock:
+        if pool is None or _active_requests:
+            return None
+        rss_before = metrics.get_process_rss()
+        pool = None
+        idle_state['state'] = 'unloaded'
+
+    gc.collect()
+    _trim_heap()
+    reclaimed = max(0, rss_before - metrics.get_process_rss())
+    idle_state['unloads'] += 1
+    idle_state['reclaimed_bytes'] = reclaimed
+    print(f"Model unloaded after {time.time() - _last_request:.0f}s idle; "
+          f"reclaimed {reclaimed / (1024 * 1024):.1f} MB")
+    return reclaimed
+
+def _reload():
+    start = time.perf_counter()
+    try:
+        _load_model()
+    except Exception as e:
+        print(f"Model reload failed: {e}")
+    with _model_lock:
+        if pool is None:
+            idle_state['state'] = 'unloaded'
+            _model_lock.notify_all()
+            return
+        idle_state['state'] = 'resident'
+    idle_state['reloads'] += 1
+    idle_state['reload_seconds'] = round(time.perf_counter() - start, 3)
+    print(f"Model reloaded in {idle_state['reload_seconds']}s"
+          f" (cold start took {idle_state['cold_load_seconds']}s)")
+
+def _start_reload():
+    # Called with _model_lock held
+    global _reload_thread
+    if _reload_thread is not None and _reload_thread.is_alive():
+        return
+    idle_state['state'] = 'reloading'
+    _reload_thread = threading.Thread(target=_reload, daemon=True)
+    _reload_thread.start()
+
+def _idle_monitor():
+    timeout = idle_config['timeout']
+    interval = max(0.05, min(30.0, timeout / 4))
+    while True:
+        time.sleep(interval)
+        if pool is None or warmup_state['state'] == 'running':
+            continue
+        if time.time() - _last_request >= timeout and pool.busy == 0:
+            unload_model()
+
+@contextmanager
+def model_lease(timeout=RELOAD_WAIT_SECONDS):
+    """Keep the model resident for the duration of a ``with`` block
+
+    Starts a background reload if the model was unloaded while idle and waits
+    for it, so unloading never pulls sessions from under a running request.
+
+    Raises:
+        ModelUnavailable: If the model is not resident within ``timeout`` seconds
+    """
+    global _active_requests, _last_request
+    with _model_lock:
+        _last_request = time.time()
+        if pool is None and idle_state['state'] == 'unloaded' and _load_model is not None:
+            _start_reload()
+        deadline = time.time() + timeout
+        while pool is None and idle_state['state'] == 'reloading' and time.time() < deadline:
+            _model_lock.wait(deadline - time.time())
+        if pool is None:
+            raise ModelUnavailable("Model is reloading, please retry shortly")
+        _active_requests += 1
+    try:
+        yield
+    finally:
+        with _model_lock:
+            _active_requests -= 1
+            _last_request = time.time()
+
+def get_idle_stats():
+    """Return idle unloading state and timings"""
+    stats = dict(idle_state)
+    stats['enabled'] = idle_config['timeout'] is not None
+    stats['idle_seconds'] = round(time.time() - _last_request, 1)
+    return stats
+
+def resolve_voice(voice, kokoro):
+    """Turn a voice name or blend spec into something kokoro.create accepts"""
+    if ',' in voice:
+        # Use validate_voice to process the voice blend
+        return validate_voice(voice, kokoro)
+    elif voice not in kokoro.get_voices():
+        # Validate single voice
+        return validate_voice(voice, kokoro)
+    return voice
+
+def create_samples(kokoro, text, voice, speed, language):
+    """Run phonemization and inference separately so each stage is timed"""
+    start = time.perf_counter()
+    phonemes = None
+    tokenizer = getattr(kokoro, 'tokenizer', None)
+    if tokenizer is not None:
+        phonemes = tokenizer.phonemize(text, language)
+        metrics.stage_latency.observe(time.perf_counter() - start, stage="phonemize")
+
+    inference_start = time.perf_counter()
+    if phonemes:
+        samples, sample_rate = kokoro.create(text, voice=voice, speed=speed, lang=language, phonemes=phonemes)
+    else:
+        samples, sample_rate = kokoro.create(text, voice=voice, speed=speed, lang=language)
+    metrics.stage_latency.observe(time.perf_counter() - inference_start, stage="inference")
+
+    synthesis_seconds = time.perf_counter() - start
+    metrics.record_synthesis(len(text), len(samples) / sample_rate, synthesis_seconds)
+    scheduler.estimator.observe(len(text), len(samples) / sample_rate, synthesis_seconds)
+    return samples, sample_rate
+
+def encode_wav_bytes(samples, sample_rate):
+    """Encode samples as an in-memory WAV file"""
+    start = time.perf_counter()
+    buffer = io.BytesIO()
+    sf.write(buffer, samples, sample_rate, format='WAV')
+    metrics.stage_latency.observe(time.perf_counter() - start, stage="encode")
+    return buffer.getvalue()
+
+def encode_wav_base64(samples, sample_rate):
+    """Encode samples as a base64 WAV file"""
+    return base64.b64encode(encode_wav_bytes(samples, sample_rate)).decode('utf-8')
+
+def parse_speed(value):
+    """Read a request's speed
+
+    Raises:
+        ValueError, TypeError: If it is not a number within the model's range
+    """
+    speed = float(value)
+    if not MIN_SPEED <= speed <= MAX_SPEED:
+        raise ValueError(f"Speed must be between {MIN_SPEED} and {MAX_SPEED}")
+    return speed
+
+def split_sentences(text):
+    """Split text into sentences short enough for a single model call"""
+    sentences = []
+    start = 0  # Start of the text not yet assigned to a sentence
+    last = None  # Span of the text behind the last sentences
+    for match in _SENTENCE_END.finditer(text):
+        sentence = text[start:match.end()].strip()
+        # Short fragments are joined to the next one with their original spacing
+        if len(sentence) >= SENTENCE_MIN_CHARS:
+            sentences.extend(_split_long(sentence))
+            last = (start, match.end())
+            start = match.end()
+    pending = text[start:].strip()
+    if pending:
+        if sentences and len(sentences[-1]) + len(pending) < SENTENCE_MAX_CHARS:
+            sentence_end = last[0] + len(text[last[0]:last[1]].rstrip())
+            sentences[-1] += text[sentence_end:].rstrip()
+        else:
+            sentences.extend(_split_long(pending))
+    return sentences
+
+def _split_long(sentence):
+    # Break an overlong sentence at the last comma (or space) before the limit
+    parts = []
+    while len(sentence) > SENTENCE_MAX_CHARS:
+        cut = sentence.rfind(', ', 0, SENTENCE_MAX_CHARS)
+        if cut <= 0:
+            cut = sentence.rfind(' ', 0, SENTENCE_MAX_CHARS)
+        cut = cut + 1 if cut > 0 else SENTENCE_MAX_CHARS
+        parts.append(sentence[:cut].strip())
+        sentence = sentence[cut:].strip()
+    if sentence:
+        parts.append(sentence)
+    return parts
+
+def synthesize_sentence(sentence, voice, speed, language, priority='interactive', sessions=None):
+    """Synthesize one sentence on a pooled session, waiting for its priority slot"""
+    sessions = sessions or pool
+    estimate = scheduler.estimator.estimate(len(sentence), speed)
+    with scheduler.slot(priority, estimate) as slot_wait:
+        session, waited = sessions.acquire()
+        metrics.stage_latency.observe(slot_wait + waited, stage="queue")
+        try:
+            processed_voice = resolve_voice(voice, session)
+            return create_samples(session, sentence, processed_voice, speed, language)
+        finally:
+            sessions.release(session)
+
+def render_samples(text, voice, speed, language, priority='interactive', sessions=None):
+    """Synthesize text sentence by sentence across a session pool
+
+    Sentences run concurrently on up to ``sessions.size`` sessions (the
+    default model's pool unless another is given) and are joined in their
+    original order, so latency follows the longest sentence rather than the
+    length of the whole text.
+    """
+    sessions = sessions or pool
+    sentences = split_sentences(text) or [text]
+    workers = min(len(sentences), sessions.size)
+    if workers == 1:
+        results = [synthesize_sentence(s, voice, speed, language, priority, sessions) for s in sentences]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                lambda sentence: synthesize_sentence(sentence, voice, speed, language, priority, sessions),
+                sentences))
+    # The model trims each sentence's pauses, so put one back between them
+    sample_rate = results[0][1]
+    parts = []
+    for samples, _ in results:
+        if parts:
+            parts.append(sentence_gap(sample_rate))
+        parts.append(samples)
+    return np.concatenate(parts), sample_rate
+
+def render_audio(text, voice, speed, language, priority='interactive', sessions=None):
+    """Synthesize text and return the WAV file encoded as base64"""
+    samples, sample_rate = render_samples(text, voice, speed, language, priority, sessions)
+
+    # Encoding does not need the model, so the sessions are already back in the pool
+    return encode_wav_base64(samples, sample_rate)
+
+@contextmanager
+def model_sessions(model):
+    """Lease the sessions serving a registry model for a ``with`` block
+
+    Yields None for the default model (the render functions then use
+    ``pool``); other models load on demand and may evict idle ones.
+    """
+    if model == registry.default:
+        registry.record_request(model)
+        with model_lease():
+            yield None
+    else:
+        with registry.lease(model) as sessions:
+            yield sessions
+
+def synthesize(text, voice, speed, language, priority='interactive', model=None):
+    """Render a request, sharing the result with identical requests already in flight
+
+    Raises:
+        UnknownModel: If ``model`` is not in the registry
+    """
+    model = registry.resolve(model)
+    key = make_request_key(text, voice, speed, language, model)
+    executed = []
+
+    def render(sessions=None):
+        executed.append(True)
+        return render_audio(text, voice, speed, language, priority, sessions)
+
+    with model_sessions(model) as sessions:
+        audio_data = coalescer.run(key, render, sessions)
+    metrics.record_cache("coalesce", hit=not executed)
+    return audio_data
+
+# Open incremental text-in / audio-out streams
+streams = StreamRegistry()
+
+def synthesize_stream_sentence(sentence, voice, speed, language, model=None):
+    """Synthesize one streamed sentence; streams are interactive by nature"""
+    with model_sessions(model) as sessions:
+        return render_samples(sentence, voice, speed, language, 'interactive', sessions)
+
+def _record_stream_frame(stream, timing):
+    metrics.stream_frames.inc()
+    if timing["ttfa"] is not None:
+        metrics.stream_ttfa.observe(timing["ttfa"])
+    if timing["gap"] is not None:
+        metrics.stream_gap.observe(timing["gap"])
+    if timing["underrun"]:
+        metrics.stream_underrun_seconds.inc(timing["underrun"])
+
+def open_stream(voice, speed, language, model=None):
+    """Start an incremental synthesis stream
+
+    Raises:
+        UnknownModel: If ``model`` is not in the registry
+    """
+    model = registry.resolve(model)
+    workers = min(2, pool.size) if pool else 1
+    stream = AudioStream(synthesize_stream_sentence, voice, speed, language, model,
+                         workers=workers, on_frame=_record_stream_frame)
+    return streams.add(stream)
+
+def get_coalescing_stats():
+    """Return the request coalescing counters"""
+    return coalescer.stats()
+
+def admit_request(text, speed, requested_priority=None):
+    """Classify the current request and check it against the client's deadline
+
+    Clients send ``X-Priority: interactive|bulk`` to pick a class (otherwise
+    short texts are interactive and long ones bulk), ``X-Deadline-Ms`` with the
+    time they are willing to wait, and ``X-Deadline-Policy: degrade`` to get
+    the leading sentences that fit instead of a rejection.
+
+    Returns:
+        dict: priority, text (possibly shortened), estimated_seconds and truncated
+
+    Raises:
+        DeadlineExceeded: If the request cannot finish before the deadline
+        ValueError: If the deadline header is not a number
+    """
+    priority = scheduler.classify(text, request.headers.get('X-Priority', requested_priority))
+    deadline = request.headers.get('X-Deadline-Ms')
+    if deadline is not None:
+        deadline = float(deadline) / 1000.0
+    degrade = request.headers.get('X-Deadline-Policy', 'reject').lower() == 'degrade'
+
+    parallelism = min(len(split_sentences(text)), pool.size if pool else 1)
+    admitted_text, estimated, truncated = scheduler.admit(text, speed, priority, deadline, degrade,
+                                                          parallelism=parallelism)
+    return {
+        "priority": priority,
+        "text": admitted_text,
+        "estimated_seconds": round(estimated, 3) if estimated is not None else None,
+        "truncated": truncated,
+    }
+
+def get_scheduler_stats():
+    """Return the priority scheduler counters"""
+    return scheduler.stats()
+
+metrics.session_pool_size.set_function(lambda: pool.size if pool else 0)
+metrics.session_pool_busy.set_function(lambda: pool.busy if pool else 0)
+metrics.session_pool_utilization.set_function(lambda: pool.utilization() if pool else 0.0)
+metrics.session_busy_seconds.set_function(lambda: pool.busy_seconds if pool else 0.0)
+metrics.scheduler_running.set_function(lambda: {(p,): n for p, n in scheduler.running.items()})
+metrics.scheduler_waiting.set_function(lambda: {(p,): n for p, n in scheduler.waiting().items()})
+metrics.admission_decisions.set_function(lambda: {
+    (p, decision): getattr(scheduler, decision)[p]
+    for p in PRIORITY_CLASSES for decision in ('admitted', 'degraded', 'rejected')
+})
+metrics.estimated_rtf.set_function(lambda: scheduler.estimator.rtf or 0.0)
+metrics.model_resident.set_function(lambda: 1 if pool is not None else 0)
+metrics.model_unloads.set_function(lambda: idle_state['unloads'])
+metrics.model_reloads.set_function(lambda: idle_state['reloads'])
+metrics.model_reload_seconds.set_function(lambda: {
+    (kind,): idle_state[f'{kind}_seconds'] for kind in ('cold_load', 'reload') if idle_state[f'{kind}_seconds'] is not None
+})
+metrics.model_reclaimed_bytes.set_function(lambda: idle_state['reclaimed_bytes'] or 0)
+metrics.model_requests.set_function(lambda: {(name,): n for name, n in registry.requests.items()})
+metrics.model_loads.set_function(lambda: {(name,): n for name, n in registry.loads.items()})
+metrics.model_evictions.set_function(lambda: {(name,): n for name, n in registry.evictions.items()})
+metrics.registry_resident_bytes.set_function(lambda: registry.stats()['resident_bytes'])
+metrics.streams_open.set_function(lambda: len(streams))
+metrics.ready.set_function(lambda: 1 if is_ready() else 0)
+
+@service_api.before_app_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@service_api.after_app_request
+def record_request(response):
+    start = g.get('request_start')
+    if start is not None:
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        metrics.http_latency.observe(time.perf_counter() - start, endpoint=endpoint)
+        metrics.http_requests.inc(endpoint=endpoint, status=response.status_code)
+    return response
+
+@service_api.route('/healthz')
+def healthz():
+    # Liveness: the process is up and answering requests
+    return jsonify({"status": "ok"})
+
+@service_api.route('/readyz')
+def readyz():
+    # Readiness: only route traffic here once the model is loaded and warm
+    body = {
+        "ready": is_ready(),
+        "model_loaded": pool is not None,
+        "warmup": dict(warmup_state),
+        "idle": get_idle_stats(),
+    }
+    return jsonify(body), (200 if body["ready"] else 503)
+
+@service_api.route('/api/models')
+def list_models():
+    return jsonify(get_model_stats())
+
+@service_api.route('/api/stream', methods=['POST'])
+def create_stream():
+    # Open a stream: POST text fragments to /api/stream/<id>/text and read
+    # numbered PCM frames from the server-sent events at /api/stream/<id>/events
+    if not model_available():
+        return jsonify({"error": "Model not loaded"}), 503
+
+    data = request.get_json(silent=True) or {}
+    try:
+        stream = open_stream(data.get('voice', 'af_sarah'), parse_speed(data.get('speed', 1.0)),
+                             data.get('language', 'en-us'), data.get('model'))
+    except (ValueError, TypeError, UnknownModel) as e:
+        return jsonify({"error": str(e)}), 400
+
+    if data.get('text'):
+        stream.add_text(data['text'], final=bool(data.get('final')))
+    return jsonify({
+        "stream_id": stream.id,
+        "text_url": f"/api/stream/{stream.id}/text",
+        "events_url": f"/api/stream/{stream.id}/events",
+    })
+
+def _unknown_stream():
+    # Streams live in the process that opened them
+    return jsonify({"error": "Unknown stream. With several --workers, route a stream's "
+                             "requests to one worker (sticky sessions) or use --workers 1"}), 404
+
+@service_api.route('/api/stream/<stream_id>/text', methods=['POST'])
+def add_stream_text(stream_id):
+    stream = streams.get(stream_id)
+    if stream is None:
+        return _unknown_stream()
+
+    data = request.get_json(silent=True) or {}
+    try:
+        queued = stream.add_text(data.get('text', ''), final=bool(data.get('final')))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 409
+    return jsonify({"queued": queued, "closed": stream.closed})
+
+@service_api.route('/api/stream/<stream_id>', methods=['DELETE'])
+def delete_stream(stream_id):
+    stream = streams.remove(stream_id)
+    if stream is None:
+        return _unknown_stream()
+    stream.abort()
+    return jsonify(stream.stats())
+
+@service_api.route('/api/stream/<stream_id>/events')
+def stream_events(stream_id):
+    stream = streams.get(stream_id)
+    if stream is None:
+        return _unknown_stream()
+
+    def generate():
+        try:
+            for event, payload in stream.events():
+                if event is None:
+                    yield ": keep-alive\n\n"
+                elif event == "audio":
+                    yield f"event: audio\nid: {payload['seq']}\ndata: {json.dumps(payload)}\n\n"
+                else:
+                    yield f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+        finally:
+            streams.remove(stream.id)
+            stream.abort()
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@service_api.route('/api/convert_batch', methods=['POST'])
+def convert_batch():
+    # Synthesize many short items in one request. The items run concurrently
+    # across the session pool and are streamed back as they finish: a zip of
+    # WAV files (default) or multipart/mixed, with per-item timings in manifest.json
+    if not model_available():
+        return jsonify({"error": "Model not loaded"}), 503
+
+    data = request.get_json(silent=True) or {}
+    response_format = data.get('format', 'zip')
+    priority = request.headers.get('X-Priority', data.get('priority', 'bulk'))
+    if response_format not in BATCH_FORMATS:
+        return jsonify({"error": f"Unsupported format: {response_format}. Use one of: {', '.join(BATCH_FORMATS)}"}), 400
+    if priority not in PRIORITY_CLASSES:
+        return jsonify({"error": f"Unknown priority: {priority}"}), 400
+    try:
+        items = parse_batch_items(data.get('items'), data.get('voice', 'af_sarah'),
+                                  data.get('speed', 1.0), data.get('language', 'en-us'))
+        model = registry.resolve(data.get('model'))
+    except (ValueError, UnknownModel) as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Hold the model for as long as the response is being sent
+    lease = ExitStack()
+    try:
+        sessions = lease.enter_context(model_sessions(model))
+    except ModelUnavailable as e:
+        lease.close()
+        return jsonify({"error": str(e)}), 503
+    workers = (sessions or pool).size
+
+    start = time.perf_counter()
+    timings = {}
+
+    def results():
+        for item, samples, sample_rate, timing in run_batch(
+                items,
+                lambda item: render_samples(item['text'], item['voice'], item['speed'],
+                                            item['language'], priority, sessions),
+                lambda item: make_request_key(item['text'], item['voice'], item['speed'],
+                                              item['language'], model),
+                workers):
+            timings[item['id']] = timing
+            if samples is None:
+                metrics.batch_items.inc(result="failed")
+                yield item, None, timing
+            else:
+                metrics.batch_items.inc(result="shared" if timing["shared"] else "synthesized")
+                yield item, encode_wav_bytes(samples, sample_rate), timing
+
+    def finish():
+        return build_manifest(items, timings, time.perf_counter() - start, workers)
+
+    if response_format == 'zip':
+        response = Response(iter_zip(results(), finish), mimetype='application/zip',
+                            headers={'Content-Disposition': 'attachment; filename="batch.zip"'})
+    else:
+        boundary = multipart_boundary()
+        response = Response(iter_multipart(results(), finish, boundary),
+                            mimetype=f'multipart/mixed; boundary={boundary}')
+    response.call_on_close(lease.close)
+    return response
+
+@service_api.route('/api/audition', methods=['POST'])
+def audition():
+    # Render one sample text with every voice ("voices" narrows it down, as in
+    # --audition-voices) across the session pool. Clips are cached on disk, so
+    # a matrix that was rendered before comes back without touching the model
+    data = request.get_json(silent=True) or {}
+    text = (data.get('text') or '').strip()
+    if not text:
+        return jsonify({"error": "No text provided"}), 400
+    try:
+        speed = parse_speed(data.get('speed', 1.0))
+        language = data.get('language', 'en-us')
+        model = registry.resolve(data.get('model'))
+        model_path, voices_path = get_model_paths(model)
+        spec = data.get('voices')
+        voices = pick_voices(' '.join(spec) if isinstance(spec, list) else spec, list_voices(voices_path))
+    except (ValueError, TypeError, OSError, UnknownModel) as e:
+        return jsonify({"error": str(e)}), 400
+
+    uncached = [voice for voice in voices
+                if not cached_clip(clip_key(text, voice, speed, language, model_path, voices_path))]
+    if uncached and not model_available():
+        return jsonify({"error": "Model not loaded"}), 503
+
+    with ExitStack() as lease:
+        sessions = None
+        if uncached:
+            try:
+                sessions = lease.enter_context(model_sessions(model))
+            except ModelUnavailable as e:
+                return jsonify({"error": str(e)}), 503
+        results = render_matrix(
+            text, voices, speed, language, model_path, voices_path,
+            lambda voice: render_samples(text, voice, speed, language, 'bulk', sessions),
+            workers=(sessions or pool).size if uncached else 1)
+
+    clips = []
+    for result in results:
+        clip = {"voice": result['voice'], "label": result['label'], "status": result['status']}
+        if result['status'] == "failed":
+            clip["error"] = result['error']
+        else:
+            clip["duration"] = result['duration']
+            clip["render_seconds"] = result['render_seconds']
+            if result['path']:
+                with open(result['path'], 'rb') as f:
+                    clip["audio_data"] = base64.b64encode(f.read()).decode('utf-8')
+            else:
+                clip["audio_data"] = encode_wav_base64(result['samples'], result['sample_rate'])
+        clips.append(clip)
+    return jsonify({"clips": clips})
+
+@service_api.route('/metrics')
+def get_metrics():
+    return Response(metrics.render_metrics(), mimetype='text/plain; version=0.0.4')
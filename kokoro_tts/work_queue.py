@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Shared-filesystem work queue for rendering one book on several machines
+A coordinator splits a book into chunk work items in a queue directory;
+any number of worker processes, on any host that mounts the directory,
+claim items by renaming them, render them and write the chunk files back.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import threading
+
+import soundfile as sf
+
+from kokoro_tts import chapter_chunks, process_chunk_sequential, validate_voice, validate_language, \
+    merge_chunks_to_chapters
+from kokoro_tts.batch_dir import load_chapters
+from kokoro_tts.manifest import create_sessions, check_voice, default_workers
+
+# A claimed item whose lease file has not been touched for this long is
+# handed to another worker (the hosts' clocks are assumed to agree)
+LEASE_SECONDS = 600
+
+# An item that failed this many times is moved to failed/ instead of retried
+MAX_ATTEMPTS = 3
+
+# Seconds between queue scans while waiting for work or for workers
+POLL_SECONDS = 2
+
+JOB_FILE = "job.json"
+
+
+class WorkQueue:
+    """Work items stored as files in a queue directory.
+
+    Items move between pending/, leased/, done/ and failed/ by rename, which
+    is atomic on a shared filesystem, so exactly one worker wins each claim.
+    A leased item's file name carries its owner, so a worker that lost its
+    lease cannot complete another worker's claim.
+    """
+
+    STATES = ('pending', 'leased', 'done', 'failed')
+
+    def __init__(self, path, lease_seconds=LEASE_SECONDS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        for state in self.STATES + ('tmp',):
+            os.makedirs(os.path.join(path, state), exist_ok=True)
+
+    def _dir(self, state):
+        return os.path.join(self.path, state)
+
+    def _write(self, state, name, data):
+        # Write under tmp/ and rename, so readers never see a half-written item
+        tmp = os.path.join(self._dir('tmp'), f"{name}.{os.getpid()}.{threading.get_ident()}")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, os.path.join(self._dir(state), name))
+
+    def job(self):
+        """Return the job settings, or None until the coordinator has published them."""
+        try:
+            with open(os.path.join(self.path, JOB_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def publish(self, job):
+        """Write the job settings; workers start claiming once they exist."""
+        tmp = os.path.join(self._dir('tmp'), JOB_FILE)
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(job, f, indent=2)
+        os.replace(tmp, os.path.join(self.path, JOB_FILE))
+
+    def enqueue(self, name, item):
+        self._write('pending', name, dict(item, attempts=0))
+
+    def names(self, state):
+        return sorted(name for name in os.listdir(self._dir(state)) if not name.startswith('.'))
+
+    def counts(self):
+        return {state: len(self.names(state)) for state in self.STATES}
+
+    def claim(self, owner):
+        """Claim the first pending item; returns (lease, item) or None."""
+        for name in self.names('pending'):
+            lease = f"{name}~{owner}"
+            try:
+                os.rename(os.path.join(self._dir('pending'), name), os.path.join(self._dir('leased'), lease))
+            except FileNotFoundError:
+                continue  # Another worker claimed it first
+            path = os.path.join(self._dir('leased'), lease)
+            try:
+                # The rename kept the enqueue time; start the lease now
+                os.utime(path)
+                with open(path, 'r', encoding='utf-8') as f:
+                    item = json.load(f)
+            except FileNotFoundError:
+                continue  # Reclaimed in the instant before the lease was renewed
+            item['attempts'] += 1
+            item['owner'] = owner
+            self._write('leased', lease, item)
+            return lease, item
+        return None
+
+    def complete(self, lease):
+        """Mark a claimed item done; False if the lease was lost meanwhile."""
+        name = lease.split('~', 1)[0]
+        try:
+            os.rename(os.path.join(self._dir('leased'), lease), os.path.join(self._dir('done'), name))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def release(self, lease, item, error):
+        """Give a failed item back for a retry, or park it in failed/."""
+        name = lease.split('~', 1)[0]
+        item = dict(item, error=error)
+        item.pop('owner', None)
+        state = 'failed' if item['attempts'] >= MAX_ATTEMPTS else 'pending'
+        try:
+            os.unlink(os.path.join(self._dir('leased'), lease))
+        except FileNotFoundError:
+            return  # Reclaimed by someone else; they will retry it
+        self._write(state, name, item)
+
+    def reclaim_expired(self):
+        """Return leases nobody has touched within the lease time to pending/."""
+        reclaimed = 0
+        cutoff = time.time() - self.lease_seconds
+        for lease in self.names('leased'):
+            path = os.path.join(self._dir('leased'), lease)
+            try:
+                if os.path.getmtime(path) >= cutoff:
+                    continue
+                os.rename(path, os.path.join(self._dir('pending'), lease.split('~', 1)[0]))
+                reclaimed += 1
+            except FileNotFoundError:
+                continue
+        return reclaimed
+
+    def retry_failed(self):
+        """Move failed items back to pending with a fresh attempt count."""
+        for name in self.names('failed'):
+            with open(os.path.join(self._dir('failed'), name), 'r', encoding='utf-8') as f:
+                item = json.load(f)
+            item.pop('error', None)
+            self.enqueue(name, item)
+            os.unlink(os.path.join(self._dir('failed'), name))
+
+    def finished(self):
+        return not self.names('pending') and not self.names('leased')
+
+
+def enqueue_book(input_file, queue_dir, out_dir, voice="af_sarah", speed=1.0, lang="en-us",
+                 format="wav", debug=False, lease_seconds=LEASE_SECONDS):
+    """Split a book into chunk work items for the workers.
+
+    Chunks that already have an output file are not queued again, and items
+    that failed in an earlier run are retried.
+
+    Returns:
+        WorkQueue: The queue
+    """
+    queue = WorkQueue(queue_dir, lease_seconds)
+    queue.retry_failed()
+    active = set(queue.names('pending')) | {lease.split('~', 1)[0] for lease in queue.names('leased')}
+    done = set(queue.names('done'))
+
+    chapters = load_chapters(input_file, debug)
+    total = 0
+    added = 0
+    for chapter_num, chapter in enumerate(chapters, 1):
+        chapter_dir = os.path.join(out_dir, f"chapter_{chapter_num:03d}")
+        os.makedirs(chapter_dir, exist_ok=True)
+        with open(os.path.join(chapter_dir, "info.txt"), "w", encoding="utf-8") as f:
+            f.write(f"Title: {chapter['title']}\n")
+        for chunk_num, chunk in enumerate(chapter_chunks(chapter), 1):
+            total += 1
+            name = f"{chapter_num:03d}-{chunk_num:03d}.json"
+            output = os.path.join(f"chapter_{chapter_num:03d}", f"chunk_{chunk_num:03d}.{format}")
+            if os.path.exists(os.path.join(out_dir, output)) or name in active:
+                continue
+            if name in done:
+                # Done earlier, but the chunk file has gone since
+                os.unlink(os.path.join(queue_dir, 'done', name))
+            queue.enqueue(name, {'text': chunk, 'output': output})
+            added += 1
+
+    queue.publish({
+        'input': os.path.abspath(input_file),
+        # Relative to the queue, so hosts may mount the shared filesystem at different paths
+        'output_dir': os.path.relpath(os.path.abspath(out_dir), os.path.abspath(queue_dir)),
+        'voice': voice,
+        'speed': speed,
+        'lang': lang,
+        'format': format,
+        'chunks': total,
+        'lease_seconds': lease_seconds,
+        'created': time.time(),
+    })
+    print(f"Queued {added} of {total} chunks from {len(chapters)} chapters in {queue_dir}")
+    return queue
+
+
+def run_coordinator(input_file, queue_dir, out_dir, voice="af_sarah", speed=1.0, lang="en-us",
+                    format="wav", debug=False, poll_seconds=POLL_SECONDS):
+    """Queue a book, wait for the workers to render it and merge the chapters.
+
+    Returns:
+        bool: True if every chunk was rendered and the chapters were merged
+    """
+    queue = enqueue_book(input_file, queue_dir, out_dir, voice, speed, lang, format, debug)
+    print(f"Start workers with: kokoro-desktop --worker --queue {queue_dir}")
+
+    last = None
+    while not queue.finished():
+        reclaimed = queue.reclaim_expired()
+        if reclaimed:
+            print(f"\nReclaimed {reclaimed} expired lease(s)")
+        counts = queue.counts()
+        if counts != last:
+            sys.stdout.write(f"\rPending {counts['pending']}, rendering {counts['leased']}, "
+                             f"done {counts['done']}, failed {counts['failed']}")
+            sys.stdout.flush()
+            last = counts
+        time.sleep(poll_seconds)
+    print()
+
+    failed = queue.names('failed')
+    if failed:
+        print(f"Error: {len(failed)} chunk(s) failed after {MAX_ATTEMPTS} attempts; "
+              f"run the coordinator again to retry them")
+        return False
+    merge_chunks_to_chapters(out_dir, format)
+    return True
+
+
+def run_worker(queue_dir, model_path="kokoro-v1.0.onnx", voices_path="voices-v1.0.bin", workers=None,
+               debug=False, poll_seconds=POLL_SECONDS):
+    """Claim and render work items until the queue is finished.
+
+    Returns:
+        int: Chunks rendered by this process
+    """
+    queue = WorkQueue(queue_dir)
+    job = queue.job()
+    while job is None:
+        print(f"Waiting for a job in {queue_dir}...")
+        time.sleep(poll_seconds)
+        job = queue.job()
+    queue.lease_seconds = job.get('lease_seconds', LEASE_SECONDS)
+
+    workers = workers or default_workers()
+    print(f"Loading model with {workers} session(s)...")
+    sessions = create_sessions(model_path, voices_path, workers)
+    kokoro = sessions.sessions[0]
+    lang = validate_language(job['lang'], kokoro)
+    try:
+        check_voice(job['voice'], kokoro)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    voice_style = validate_voice(job['voice'], kokoro)
+
+    owner = f"{socket.gethostname()}-{os.getpid()}"
+    rendered = []
+
+    def work(index, session):
+        while True:
+            claim = queue.claim(f"{owner}-{index}")
+            if claim is None:
+                if queue.finished():
+                    return
+                # Items may come back from workers that died holding a lease
+                queue.reclaim_expired()
+                time.sleep(poll_seconds)
+                continue
+
+            lease, item = claim
+            try:
+                samples, sample_rate = process_chunk_sequential(item['text'], session, voice_style,
+                                                                job['speed'], lang, debug=debug)
+                if samples is None:
+                    raise RuntimeError("Synthesis failed")
+                output = os.path.join(queue_dir, job['output_dir'], item['output'])
+                partial = os.path.join(os.path.dirname(output), f".{os.path.basename(output)}.{owner}-{index}.part")
+                sf.write(partial, samples, sample_rate, format=job['format'].upper())
+                os.replace(partial, output)
+            except Exception as e:
+                print(f"\nError rendering {item['output']}: {e}")
+                queue.release(lease, item, str(e))
+                continue
+            queue.complete(lease)
+            rendered.append(item['output'])
+            sys.stdout.write(f"\rRendered {len(rendered)} chunk(s)")
+            sys.stdout.flush()
+
+    threads = [threading.Thread(target=work, args=(index, session), daemon=True)
+               for index, session in enumerate(sessions.sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(f"\nQueue finished; this worker rendered {len(rendered)} chunk(s)")
+    return len(rendered)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test script for the parallel voice audition matrix
+"""
+
+import sys
+import os
+import json
+import tempfile
+import threading
+import numpy as np
+import soundfile as sf
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '.'))
+
+from kokoro_tts import audition
+
+VOICES = ["af_bella", "af_sarah", "am_adam", "bf_emma"]
+
+class MockKokoro:
+    def __init__(self):
+        self.created = []
+        self.lock = threading.Lock()
+
+    def get_voices(self):
+        return VOICES
+
+    def get_voice_style(self, voice):
+        return np.ones(256, dtype=np.float32)
+
+    def create(self, text, voice, speed=1.0, lang="en-us"):
+        with self.lock:
+            self.created.append(text)
+        return np.zeros(4800, dtype=np.float32), 24000
+
+def write_voices(directory):
+    path = os.path.join(directory, "voices.bin")
+    with open(path, 'wb') as f:
+        np.savez(f, **{voice: np.ones(4, dtype=np.float32) for voice in VOICES})
+    return path
+
+def test_pick_voices():
+    """Test voice lists with wildcards and blends"""
+    print("Testing voice selection...")
+
+    assert audition.pick_voices(None, VOICES) == VOICES, "Default should be every voice"
+    assert audition.pick_voices("af_* am_adam", VOICES) == ["af_bella", "af_sarah", "am_adam"], "Wildcards not expanded"
+    assert audition.pick_voices("af_sarah;af_sarah:60,am_adam:40", VOICES) == \
+        ["af_sarah", "af_sarah:60,am_adam:40"], "Blends not kept"
+    try:
+        audition.pick_voices("zz_*", VOICES)
+        raise AssertionError("Unknown voice should be rejected")
+    except ValueError:
+        pass
+    assert audition.clip_label("af_sarah:60,am_adam:40") == "af_sarah-60+am_adam-40", "Blend label incorrect"
+    assert audition.clip_key("Hi.", "af_sarah", 1.0, "en-us", "/models/v1/kokoro.onnx", "voices.bin") != \
+        audition.clip_key("Hi.", "af_sarah", 1.0, "en-us", "/models/v2/kokoro.onnx", "voices.bin"), \
+        "Models with the same file name should not share clips"
+
+    print("✓ Voice selection works")
+
+
+def test_run_audition_cached():
+    """Test every voice is rendered once, then served from the cache"""
+    print("Testing audition matrix...")
+
+    original = audition.AUDITION_CACHE_DIR
+    with tempfile.TemporaryDirectory() as directory:
+        audition.AUDITION_CACHE_DIR = os.path.join(directory, "cache")
+        try:
+            voices_path = write_voices(directory)
+            out_dir = os.path.join(directory, "audition")
+            kokoro = MockKokoro()
+            index = audition.run_audition("The quick brown fox.", out_dir, model_path="model.onnx",
+                                          voices_path=voices_path, voices="af_* af_sarah:60,am_adam:40",
+                                          workers=2, kokoro=kokoro)
+
+            assert [clip["voice"] for clip in index["clips"]] == ["af_bella", "af_sarah", "af_sarah:60,am_adam:40"]
+            assert all(clip["status"] == "synthesized" for clip in index["clips"]), index["clips"]
+            assert len(kokoro.created) == 3, "Expected one synthesis per voice"
+            assert sf.info(os.path.join(out_dir, "af_sarah-60+am_adam-40.wav")).duration == 0.2, "Clip not written"
+            with open(os.path.join(out_dir, audition.INDEX_FILE), encoding='utf-8') as f:
+                assert json.load(f)["clips"][0]["duration"] == 0.2, "Index durations missing"
+
+            # A later open needs no model at all
+            again = audition.run_audition("The quick brown fox.", os.path.join(directory, "again"),
+                                          model_path="model.onnx", voices_path=voices_path, voices="af_*")
+            assert [clip["status"] for clip in again["clips"]] == ["cached", "cached"], "Matrix not cached"
+            assert again["clips"][0]["render_seconds"] == index["clips"][0]["render_seconds"], \
+                "Cached clips should keep their render timings"
+        finally:
+            audition.AUDITION_CACHE_DIR = original
+
+    print("✓ Audition matrix works")
+
+
+def test_render_matrix_failures():
+    """Test a failing voice is reported without stopping the others"""
+    print("Testing audition failures...")
+
+    original = audition.AUDITION_CACHE_DIR
+    with tempfile.TemporaryDirectory() as directory:
+        audition.AUDITION_CACHE_DIR = os.path.join(directory, "cache")
+        try:
+            def render(voice):
+                if voice == "am_adam":
+                    raise RuntimeError("broken voice")
+                return np.zeros(2400, dtype=np.float32), 24000
+
+            results = audition.render_matrix("Hello.", VOICES, 1.0, "en-us", "model.onnx", "voices.bin",
+                                             render, workers=4)
+        finally:
+            audition.AUDITION_CACHE_DIR = original
+
+    assert [result["status"] for result in results] == ["synthesized", "synthesized", "failed", "synthesized"]
+    assert results[2]["error"] == "broken voice", "Failure not reported"
+
+    print("✓ Audition failures are reported")
+
+
+if __name__ == "__main__":
+    test_pick_voices()
+    test_run_audition_cached()
+    test_render_matrix_failures()
+    print("All audition tests passed! ✓")
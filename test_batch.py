@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for the batch synthesis endpoint
+"""
+
+import sys
+import os
+import io
+import json
+import zipfile
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '.'))
+
+from kokoro_tts.batch import parse_batch_items, run_batch
+
+def test_parse_items():
+    """Test batch items are validated and given defaults"""
+    print("Testing batch item parsing...")
+
+    items = parse_batch_items([
+        {"id": "welcome", "text": "Welcome to the service."},
+        {"id": "a b", "text": "Press one.", "voice": "am_adam", "speed": "1.2"},
+        {"id": "a_b", "text": "Press two.", "lang": "en-gb"},
+    ], voice="af_sarah")
+    assert items[0]['voice'] == "af_sarah" and items[0]['speed'] == 1.0, "Defaults not applied"
+    assert items[1]['speed'] == 1.2, "Speed not parsed"
+    assert items[2]['language'] == "en-gb", "Language not read from lang"
+    assert [item['filename'] for item in items] == ["welcome.wav", "a_b.wav", "a_b-2.wav"], \
+        "Filenames should be sanitized and unique"
+
+    for bad in ([], [{"text": ""}], [{"id": 1, "text": "x"}, {"id": "1", "text": "y"}], "text"):
+        try:
+            parse_batch_items(bad)
+            assert False, f"Invalid batch accepted: {bad}"
+        except ValueError:
+            pass
+
+    print("✓ Batch item parsing works")
+
+
+def test_run_batch_shares_duplicates():
+    """Test identical items are synthesized once and failures stay per item"""
+    print("Testing batch execution...")
+
+    rendered = []
+
+    def render(item):
+        rendered.append(item['text'])
+        if item['text'] == "fail":
+            raise ValueError("Unsupported voice")
+        return np.zeros(2400, dtype=np.float32), 24000
+
+    items = parse_batch_items([
+        {"id": "1", "text": "Short."},
+        {"id": "2", "text": "A much longer prompt than the others."},
+        {"id": "3", "text": "Short."},
+        {"id": "4", "text": "fail"},
+    ])
+    results = list(run_batch(items, render, lambda item: item['text'], workers=1))
+
+    assert sorted(rendered) == sorted(["Short.", "A much longer prompt than the others.", "fail"]), \
+        "Duplicates should be synthesized once"
+    assert rendered[0] == "A much longer prompt than the others.", "Longest item should start first"
+    timings = {item['id']: timing for item, _, _, timing in results}
+    assert len(timings) == 4, "Every item should be reported"
+    assert timings['3']['shared'] and not timings['1']['shared'], "Shared item not marked"
+    assert timings['1']['audio_seconds'] == 0.1, "Audio duration incorrect"
+    assert "error" in timings['4'], "Failure not reported"
+
+    print("✓ Batch execution works")
+
+
+def test_batch_endpoint():
+    """Test the zip and multipart responses"""
+    print("Testing batch endpoint...")
+
+    from kokoro_tts import web_service
+    from kokoro_tts.web_gui import app
+
+    class MockKokoro:
+        def get_voices(self):
+            return ["af_sarah"]
+
+        def create(self, text, voice, speed=1.0, lang="en-us", phonemes=None):
+            return np.zeros(240, dtype=np.float32), 24000
+
+    web_service.attach_model(MockKokoro())
+    client = app.test_client()
+    items = [{"id": "hello", "text": "Hello there."}, {"id": "bye", "text": "Goodbye for now."}]
+
+    response = client.post('/api/convert_batch', json={"items": items})
+    assert response.status_code == 200 and response.mimetype == 'application/zip', "Zip response expected"
+    with zipfile.ZipFile(io.BytesIO(response.data)) as archive:
+        assert sorted(archive.namelist()) == ["bye.wav", "hello.wav", "manifest.json"], "Archive contents incorrect"
+        manifest = json.loads(archive.read("manifest.json"))
+        assert archive.read("hello.wav")[:4] == b"RIFF", "Item is not a WAV file"
+    assert [entry["id"] for entry in manifest["items"]] == ["hello", "bye"], "Manifest should keep request order"
+    assert manifest["failed"] == 0 and "synthesis_seconds" in manifest["items"][0], "Timings missing"
+
+    response = client.post('/api/convert_batch', json={"items": items, "format": "multipart"})
+    assert response.mimetype == 'multipart/mixed', "Multipart response expected"
+    boundary = response.headers['Content-Type'].split('boundary=')[1]
+    parts = response.data.split(f"--{boundary}".encode())
+    assert len(parts) == 5 and parts[-1].strip() == b"--", "Expected two items, the manifest and a closing boundary"
+    assert b"X-Item-Timing:" in parts[1], "Per-item timing header missing"
+
+    assert client.post('/api/convert_batch', json={"items": []}).status_code == 400, "Empty batch accepted"
+    assert client.post('/api/convert_batch', json={"items": items, "format": "tar"}).status_code == 400, \
+        "Unknown format accepted"
+
+    print("✓ Batch endpoint works")
+
+
+if __name__ == "__main__":
+    test_parse_items()
+    test_run_batch_shares_duplicates()
+    test_batch_endpoint()
+    print("All batch tests passed! ✓")
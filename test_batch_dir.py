@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test script for the directory batch mode of the CLI
+"""
+
+import sys
+import os
+import json
+import tempfile
+from collections import deque
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '.'))
+
+from kokoro_tts import batch_dir
+from kokoro_tts.session_pool import SessionPool
+
+class MockKokoro:
+    def __init__(self):
+        self.created = []
+
+    def get_voices(self):
+        return ["af_sarah"]
+
+    def get_languages(self):
+        return ["en-us"]
+
+    def create(self, text, voice, speed=1.0, lang="en-us"):
+        self.created.append(text)
+        return np.full(2400, 0.1, dtype=np.float32), 24000
+
+class FakeBook:
+    def __init__(self, name, chunks):
+        self.name = name
+        self.pending = deque((f"{name}-{n}", "text") for n in range(chunks))
+        self.outstanding = 0
+        self.failed = 0
+
+def test_fair_scheduler():
+    """Test chunks are handed out round-robin between books"""
+    print("Testing fair scheduling...")
+
+    scheduler = batch_dir.FairScheduler()
+    big = FakeBook("big", 5)
+    small = FakeBook("small", 2)
+    scheduler.add(big)
+    scheduler.add(small)
+    scheduler.close()
+
+    order = []
+    while True:
+        unit = scheduler.next()
+        if unit is None:
+            break
+        order.append(unit[1])
+        scheduler.done(unit[0], True)
+    assert order[:4] == ["big-0", "small-0", "big-1", "small-1"], f"Books not interleaved: {order}"
+    assert len(order) == 7, "Every chunk should be handed out"
+
+    print("✓ Fair scheduling works")
+
+
+def test_run_batch_dir():
+    """Test books are converted once and skipped on the next run"""
+    print("Testing directory batch mode...")
+
+    kokoro = MockKokoro()
+    original = batch_dir.create_sessions
+    batch_dir.create_sessions = lambda model_path, voices_path, workers: SessionPool([kokoro])
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            in_dir = os.path.join(directory, "spool")
+            out_dir = os.path.join(directory, "out")
+            os.makedirs(in_dir)
+            with open(os.path.join(in_dir, "one.txt"), 'w') as f:
+                f.write("The first book has a single short sentence.")
+            with open(os.path.join(in_dir, "two.txt"), 'w') as f:
+                f.write("The second book. " * 100)
+            with open(os.path.join(in_dir, "notes.md"), 'w') as f:
+                f.write("Not a book.")
+
+            results = batch_dir.run_batch_dir(in_dir, out_dir, workers=1)
+            assert sorted(results) == ["one.txt", "two.txt"], f"Unexpected books: {sorted(results)}"
+            assert os.path.exists(os.path.join(out_dir, "one", "Chapter 1.wav")), "Chapter not merged"
+            with open(os.path.join(out_dir, "two", batch_dir.BOOK_STATE_FILE)) as f:
+                state = json.load(f)
+            assert state["done"] and state["chapters"][0]["chunks"] == 2, "Book state incorrect"
+
+            # Finished books are skipped; a changed book is converted again
+            kokoro.created = []
+            with open(os.path.join(in_dir, "one.txt"), 'w') as f:
+                f.write("The first book now says something else entirely.")
+            results = batch_dir.run_batch_dir(in_dir, out_dir, workers=1)
+            assert list(results) == ["one.txt"], "Only the changed book should be converted"
+            assert kokoro.created == ["The first book now says something else entirely."], \
+                "Changed book not re-rendered"
+    finally:
+        batch_dir.create_sessions = original
+
+    print("✓ Directory batch mode works")
+
+
+if __name__ == "__main__":
+    test_fair_scheduler()
+    test_run_batch_dir()
+    print("All directory batch tests passed! ✓")
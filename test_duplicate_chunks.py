@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test script for duplicate chunk reuse within a book
+"""
+
+import sys
+import os
+import tempfile
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '.'))
+
+import kokoro_tts
+from kokoro_tts import DuplicateChunks, normalize_chunk
+
+class MockKokoro:
+    def __init__(self, *args):
+        self.created = []
+
+    def get_voices(self):
+        return ["af_sarah"]
+
+    def get_languages(self):
+        return ["en-us"]
+
+    def create(self, text, voice, speed=1.0, lang="en-us"):
+        self.created.append(text)
+        return np.full(2400, len(self.created) / 100, dtype=np.float32), 24000
+
+def test_duplicate_samples():
+    """Test repeated chunks reuse audio and memory is released after the last repeat"""
+    print("Testing duplicate chunk reuse...")
+
+    assert normalize_chunk("  * *  * ") == "* * *", "Whitespace not normalized"
+
+    chapters = [{'title': 'One', 'content': "Scene break."}, {'title': 'Two', 'content': "Scene  break."},
+                {'title': 'Three', 'content': "Something new."}]
+    duplicates = DuplicateChunks(chapters)
+    assert (duplicates.total, duplicates.unique) == (3, 2), "Pre-pass counts incorrect"
+
+    assert duplicates.lookup_samples("Scene break.") is None, "First occurrence must be synthesized"
+    duplicates.store_samples("Scene break.", np.ones(10), 24000, 2.5)
+    assert duplicates.lookup_samples("Scene  break.")[1] == 24000, "Repeat should reuse the audio"
+    assert not duplicates.samples, "Audio should be dropped after its last repeat"
+    assert duplicates.lookup_samples("Something new.") is None, "Distinct chunk should not match"
+    duplicates.store_samples("Something new.", np.ones(10), 24000, 1.0)
+    assert not duplicates.samples, "Chunks that never repeat should not be kept"
+    assert duplicates.reused == 1 and duplicates.saved_seconds == 2.5, "Saved inference not reported"
+
+    print("✓ Duplicate chunk reuse works")
+
+
+def test_split_output_reuses_files():
+    """Test convert_text_to_audio synthesizes a repeated chapter once"""
+    print("Testing duplicate chunks in split output...")
+
+    model = MockKokoro()
+    originals = kokoro_tts.Kokoro, kokoro_tts.check_required_files
+    kokoro_tts.Kokoro = lambda *args: model
+    kokoro_tts.check_required_files = lambda *args: None
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            book = os.path.join(directory, "book.txt")
+            with open(book, 'w') as f:
+                f.write("The same epigraph opens the book. " * 60)
+            out_dir = os.path.join(directory, "out")
+            kokoro_tts.convert_text_to_audio(book, voice="af_sarah", split_output=out_dir)
+
+            chunks = sorted(os.listdir(os.path.join(out_dir, "chapter_001")))
+            assert chunks.count("info.txt") == 1 and len(chunks) == 3, f"Unexpected files: {chunks}"
+            assert len(model.created) == 1, f"Expected the repeated chunk to be synthesized once, got {len(model.created)}"
+    finally:
+        kokoro_tts.Kokoro, kokoro_tts.check_required_files = originals
+
+    print("✓ Duplicate chunks in split output work")
+
+
+if __name__ == "__main__":
+    test_duplicate_samples()
+    test_split_output_reuses_files()
+    print("All duplicate chunk tests passed! ✓")
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test script for indexed EPUB chapter extraction
+"""
+
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '.'))
+
+from ebooklib import epub
+from kokoro_tts import extract_chapters_from_epub, extract_text_from_epub
+from kokoro_tts import epub_reader
+
+def make_book(path, chapters=20):
+    """Write a book whose chapters are anchors in one large document."""
+    book = epub.EpubBook()
+    book.set_identifier("test-book")
+    book.set_title("Anchors")
+    book.set_language("en")
+
+    body = "".join(
+        f'<h2 id="ch{n}">Part {n}</h2><p>Paragraph one of part {n}.</p><p>Paragraph two of part {n}.</p>'
+        for n in range(1, chapters + 1)
+    )
+    text = epub.EpubHtml(title="Text", file_name="text/all.xhtml", lang="en")
+    text.content = f"<html><body>{body}</body></html>"
+    intro = epub.EpubHtml(title="Intro", file_name="text/intro.xhtml", lang="en")
+    intro.content = "<html><body><p>An introduction.</p></body></html>"
+    book.add_item(intro)
+    book.add_item(text)
+
+    book.toc = [epub.Link("text/intro.xhtml", "Intro", "intro")] + [
+        epub.Link(f"text/all.xhtml#ch{n}", f"Part {n}", f"ch{n}") for n in range(1, chapters + 1)
+    ]
+    book.add_item(epub.EpubNcx())
+    book.add_item(epub.EpubNav())
+    book.spine = ["nav", intro, text]
+    epub.write_epub(path, book)
+
+def test_chapters_from_anchors():
+    """Test fragment links are sliced from a document parsed once"""
+    print("Testing indexed EPUB extraction...")
+
+    parsed = []
+    original = epub_reader.BeautifulSoup
+
+    def counting_soup(markup, parser):
+        parsed.append(markup)
+        return original(markup, parser)
+
+    epub_reader.BeautifulSoup = counting_soup
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "anchors.epub")
+            make_book(path)
+            chapters = extract_chapters_from_epub(path)
+    finally:
+        epub_reader.BeautifulSoup = original
+
+    assert [chapter['title'] for chapter in chapters] == ["Intro"] + [f"Part {n}" for n in range(1, 21)], \
+        "Chapters missing or out of order"
+    assert chapters[3]['content'] == "Paragraph one of part 3.\nParagraph two of part 3.", \
+        f"Chapter sliced incorrectly: {chapters[3]['content']!r}"
+    assert len(parsed) == 2, f"Each document should be parsed once, parsed {len(parsed)} times"
+
+    print("✓ Indexed EPUB extraction works")
+
+
+def test_lazy_spine_order():
+    """Test chapters are yielded in spine order before later documents are parsed"""
+    print("Testing lazy EPUB reading...")
+
+    parsed = []
+    original = epub_reader.BeautifulSoup
+
+    def counting_soup(markup, parser):
+        parsed.append(markup)
+        return original(markup, parser)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "anchors.epub")
+        make_book(path, chapters=3)
+
+        epub_reader.BeautifulSoup = counting_soup
+        try:
+            chapters = epub_reader.iter_epub_chapters(path)
+            first = next(chapters)
+            assert first['title'] == "Intro", f"First spine document should come first: {first['title']}"
+            assert len(parsed) == 1, "Later documents should not be parsed yet"
+            assert [chapter['title'] for chapter in chapters] == ["Part 1", "Part 2", "Part 3"], \
+                "Remaining chapters missing"
+        finally:
+            epub_reader.BeautifulSoup = original
+
+        text = extract_text_from_epub(path)
+        assert text.index("An introduction.") < text.index("Paragraph two of part 3."), "Text out of spine order"
+
+    print("✓ Lazy EPUB reading works")
+
+
+if __name__ == "__main__":
+    test_chapters_from_anchors()
+    test_lazy_spine_order()
+    print("All EPUB reader tests passed! ✓")
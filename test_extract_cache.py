@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent cache of extracted book text
+"""
+
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '.'))
+
+from kokoro_tts import load_cached_chapters, chapter_chunks
+from kokoro_tts import extract_cache
+
+def test_cache_roundtrip():
+    """Test a book is extracted once and read back with its chunks"""
+    print("Testing extraction cache...")
+
+    calls = []
+
+    def extract():
+        calls.append(1)
+        for n in range(1, 4):
+            yield {'title': f"Chapter {n}", 'content': f"Sentence {n}. " * 200, 'order': n}
+
+    original = extract_cache.CACHE_DIR
+    with tempfile.TemporaryDirectory() as directory:
+        extract_cache.CACHE_DIR = os.path.join(directory, "cache")
+        try:
+            book = os.path.join(directory, "book.epub")
+            with open(book, 'wb') as f:
+                f.write(b"first edition")
+
+            # An interrupted extraction is not cached
+            chapters = load_cached_chapters(book, extract)
+            next(chapters)
+            chapters.close()
+            assert not os.listdir(extract_cache.CACHE_DIR), "Partial extraction should leave nothing behind"
+
+            first = list(load_cached_chapters(book, extract))
+            again = list(load_cached_chapters(book, extract))
+            assert len(calls) == 2, "Cached book should not be extracted again"
+            assert again == first, "Cached chapters differ"
+            assert chapter_chunks(again[0]) == again[0]['chunks'] and len(again[0]['chunks']) > 1, \
+                "Chunk lists should come from the cache"
+
+            # A changed file gets a new entry
+            with open(book, 'wb') as f:
+                f.write(b"second edition")
+            list(load_cached_chapters(book, extract))
+            assert len(calls) == 3, "Changed book should be extracted again"
+            assert len(os.listdir(extract_cache.CACHE_DIR)) == 2, "Expected one entry per version of the book"
+        finally:
+            extract_cache.CACHE_DIR = original
+
+    print("✓ Extraction cache works")
+
+
+if __name__ == "__main__":
+    test_cache_roundtrip()
+    print("All extraction cache tests passed! ✓")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test script for chunked, cancellable file conversion in the desktop GUI
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import numpy as np
+import soundfile as sf
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '.'))
+
+from kokoro_tts.file_conversion import convert_file, ConversionCancelled, parts_dir
+
+class FakeKokoro:
+    """One sample per character, so output length shows what was rendered."""
+
+    def __init__(self, cancel_after=None, cancel=None):
+        self.calls = 0
+        self.cancel_after = cancel_after
+        self.cancel = cancel
+
+    def create(self, text, voice, speed, lang):
+        self.calls += 1
+        if self.calls == self.cancel_after:
+            self.cancel.set()
+        return np.full(len(text), 0.1, dtype=np.float32), 24000
+
+def write_book(directory):
+    path = os.path.join(directory, "book.txt")
+    with open(path, 'w', encoding='utf-8') as f:
+        for n in range(300):
+            f.write(f"Sentence {n} of the book goes on for a while. ")
+    return path
+
+def test_convert_file():
+    """Test a file is converted chunk by chunk into one output file"""
+    print("Testing chunked file conversion...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        book = write_book(directory)
+        output = os.path.join(directory, "book.wav")
+        updates = []
+        kokoro = FakeKokoro()
+        progress = convert_file(kokoro, book, output, "af_sarah", on_progress=updates.append)
+
+        assert kokoro.calls == progress.total_chunks > 1, "Expected one synthesis call per chunk"
+        assert len(updates) == progress.total_chunks, "Expected a progress update per chunk"
+        assert progress.fraction == 1.0 and progress.eta_seconds == 0, "Progress not finished"
+        assert sf.info(output).frames > 10000, "Output file incomplete"
+        assert not os.path.exists(parts_dir(output)), "Chunk files should be removed when done"
+
+    print("✓ Chunked file conversion works")
+
+
+def test_cancel_and_resume():
+    """Test a cancelled conversion keeps its chunks and resumes from them"""
+    print("Testing cancel and resume...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        book = write_book(directory)
+        output = os.path.join(directory, "book.wav")
+        cancel = threading.Event()
+        try:
+            convert_file(FakeKokoro(cancel_after=2, cancel=cancel), book, output, "af_sarah", cancel=cancel)
+            raise AssertionError("Conversion should have been cancelled")
+        except ConversionCancelled:
+            pass
+        assert not os.path.exists(output), "Cancelled conversion should not write the output"
+        assert len([f for f in os.listdir(parts_dir(output)) if f.endswith(".wav")]) == 2, \
+            "Finished chunks should be kept"
+
+        kokoro = FakeKokoro()
+        progress = convert_file(kokoro, book, output, "af_sarah")
+        assert kokoro.calls == progress.total_chunks - 2, "Resumed conversion rendered kept chunks again"
+        reference = os.path.join(directory, "reference.wav")
+        convert_file(FakeKokoro(), book, reference, "af_sarah")
+        assert sf.info(output).frames == sf.info(reference).frames, "Resumed output differs"
+
+        # Other voice settings start over
+        kokoro = FakeKokoro()
+        cancel = threading.Event()
+        kokoro.cancel_after, kokoro.cancel = 1, cancel
+        try:
+            convert_file(kokoro, book, output, "af_sarah", cancel=cancel)
+        except ConversionCancelled:
+            pass
+        kokoro = FakeKokoro()
+        progress = convert_file(kokoro, book, output, "am_adam")
+        assert kokoro.calls == progress.total_chunks, "Chunks of another voice were reused"
+
+    print("✓ Cancel and resume work")
+
+
+if __name__ == "__main__":
+    test_convert_file()
+    test_cancel_and_resume()
+    print("All file conversion tests passed! ✓")
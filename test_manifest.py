@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test script for the JSONL manifest mode of the CLI
+"""
+
+import sys
+import os
+import json
+import tempfile
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '.'))
+
+from kokoro_tts import manifest
+from kokoro_tts.session_pool import SessionPool
+
+class MockKokoro:
+    def __init__(self):
+        self.created = []
+
+    def get_voices(self):
+        return ["af_sarah", "am_adam"]
+
+    def get_languages(self):
+        return ["en-us", "en-gb"]
+
+    def get_voice_style(self, voice):
+        return np.ones(256, dtype=np.float32)
+
+    def create(self, text, voice, speed=1.0, lang="en-us"):
+        self.created.append(text)
+        return np.zeros(2400, dtype=np.float32), 24000
+
+def write_manifest(path, entries):
+    with open(path, 'w', encoding='utf-8') as f:
+        for entry in entries:
+            f.write((entry if isinstance(entry, str) else json.dumps(entry)) + "\n")
+
+def test_read_manifest():
+    """Test manifest lines are parsed with command line defaults"""
+    print("Testing manifest parsing...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "prompts.jsonl")
+        write_manifest(path, [
+            {"text": "Welcome.", "out": "welcome"},
+            {"text": "Goodbye.", "voice": "af_sarah:60,am_adam:40", "speed": 1.2, "out": "bye.mp3"},
+            "not json",
+            {"text": "Escape.", "out": "../outside"},
+            {"text": "Again.", "out": "welcome"},
+            {"text": "No name."},
+        ])
+        items, errors = manifest.read_manifest(path, voice="am_adam")
+
+    assert [item['out'] for item in items] == ["welcome.wav", "bye.mp3", "000006.wav"], "Output names incorrect"
+    assert items[0]['voice'] == "am_adam" and items[1]['speed'] == 1.2, "Defaults not applied"
+    assert [line for line, _ in errors] == [3, 4, 5], f"Invalid lines not reported: {errors}"
+
+    print("✓ Manifest parsing works")
+
+
+def test_run_manifest():
+    """Test one model load renders, reuses and skips outputs"""
+    print("Testing manifest rendering...")
+
+    kokoro = MockKokoro()
+    original = manifest.create_sessions
+    manifest.create_sessions = lambda model_path, voices_path, workers: SessionPool([kokoro])
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "prompts.jsonl")
+            out_dir = os.path.join(directory, "out")
+            write_manifest(path, [
+                {"text": "Press one for sales.", "out": "sales"},
+                {"text": "Press one for sales.", "out": "sales-copy"},
+                {"text": "Blended voice.", "voice": "af_sarah,am_adam", "out": "blend"},
+                {"text": "Bad voice.", "voice": "xx_nobody", "out": "bad"},
+            ])
+
+            summary = manifest.run_manifest(path, out_dir)
+            assert summary["counts"] == {"synthesized": 2, "cached": 1, "skipped": 0, "failed": 1}, \
+                f"Unexpected counts: {summary['counts']}"
+            assert sorted(kokoro.created) == ["Blended voice.", "Press one for sales."], \
+                "Identical items should be synthesized once"
+            assert os.path.exists(os.path.join(out_dir, "sales-copy.wav")), "Shared output not written"
+            assert summary["failures"][0]["out"] == "bad.wav", "Failure not reported"
+            with open(os.path.join(out_dir, manifest.SUMMARY_FILE)) as f:
+                assert json.load(f)["counts"] == summary["counts"], "Summary file not written"
+
+            # A rerun skips everything that is up to date and re-renders changed lines
+            write_manifest(path, [
+                {"text": "Press one for sales.", "out": "sales"},
+                {"text": "Press one for sales.", "out": "sales-copy"},
+                {"text": "Blended voice, now longer.", "voice": "af_sarah,am_adam", "out": "blend"},
+                {"text": "Press one for sales.", "out": "sales-again"},
+            ])
+            kokoro.created = []
+            summary = manifest.run_manifest(path, out_dir)
+            assert summary["counts"] == {"synthesized": 1, "cached": 1, "skipped": 2, "failed": 0}, \
+                f"Unexpected rerun counts: {summary['counts']}"
+            assert kokoro.created == ["Blended voice, now longer."], "Only the changed line should be synthesized"
+    finally:
+        manifest.create_sessions = original
+
+    print("✓ Manifest rendering works")
+
+
+def test_item_key_model():
+    """Test models with the same file name in different directories get different keys"""
+    print("Testing item keys...")
+
+    item = {"text": "Hello.", "voice": "af_sarah", "speed": 1.0, "lang": "en-us", "out": "hello.wav"}
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for version in ("v1", "v2"):
+            os.makedirs(os.path.join(directory, version))
+            paths.append(os.path.join(directory, version, "kokoro.onnx"))
+            with open(paths[-1], 'wb') as f:
+                f.write(version.encode())
+        voices_path = os.path.join(directory, "voices.bin")
+        assert manifest.item_key(item, paths[0], voices_path) == manifest.item_key(item, paths[0], voices_path)
+        assert manifest.item_key(item, paths[0], voices_path) != manifest.item_key(item, paths[1], voices_path), \
+            "A different model with the same file name should not match"
+
+        key = manifest.item_key(item, paths[0], voices_path)
+        with open(paths[0], 'wb') as f:
+            f.write(b"replaced model")
+        assert manifest.item_key(item, paths[0], voices_path) != key, "A replaced model file should not match"
+
+    print("✓ Item keys work")
+
+
+if __name__ == "__main__":
+    test_read_manifest()
+    test_run_manifest()
+    test_item_key_model()
+    print("All manifest tests passed! ✓")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test script for the in-process metrics and the session pool
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '.'))
+
+from kokoro_tts.metrics import MetricsRegistry, get_process_rss
+from kokoro_tts.session_pool import SessionPool
+
+def test_prometheus_rendering():
+    """Test counters, gauges and histograms render in the text format"""
+    print("Testing Prometheus text rendering...")
+
+    registry = MetricsRegistry()
+    requests = registry.counter("test_requests_total", "Requests.", ("status",))
+    busy = registry.gauge("test_busy", "Busy sessions.")
+    latency = registry.histogram("test_latency_seconds", "Latency.", ("stage",), buckets=(0.1, 1.0))
+
+    requests.inc(status="200")
+    requests.inc(2, status="200")
+    busy.set(3)
+    latency.observe(0.05, stage="inference")
+    latency.observe(0.5, stage="inference")
+    latency.observe(5.0, stage="inference")
+
+    text = registry.render()
+    assert "# TYPE test_requests_total counter" in text, "Counter type missing"
+    assert 'test_requests_total{status="200"} 3' in text, "Counter value incorrect"
+    assert "test_busy 3" in text, "Gauge value incorrect"
+    assert 'test_latency_seconds_bucket{stage="inference",le="0.1"} 1' in text, "First bucket incorrect"
+    assert 'test_latency_seconds_bucket{stage="inference",le="1"} 2' in text, "Buckets should be cumulative"
+    assert 'test_latency_seconds_bucket{stage="inference",le="+Inf"} 3' in text, "+Inf bucket incorrect"
+    assert 'test_latency_seconds_count{stage="inference"} 3' in text, "Histogram count incorrect"
+
+    print("✓ Prometheus rendering works")
+
+
+def test_scrape_time_functions():
+    """Test gauges computed when scraped"""
+    print("Testing scrape-time gauges...")
+
+    registry = MetricsRegistry()
+    ratio = registry.gauge("test_ratio", "Ratio.", ("cache",))
+    ratio.set_function(lambda: {("coalesce",): 0.25})
+    assert 'test_ratio{cache="coalesce"} 0.25' in registry.render(), "Function gauge not rendered"
+    assert get_process_rss() > 0, "Process RSS should be positive"
+
+    print("✓ Scrape-time gauges work")
+
+
+def test_session_pool_accounting():
+    """Test session pool leases and utilization"""
+    print("Testing session pool accounting...")
+
+    pool = SessionPool(["session-a", "session-b"])
+    session, waited = pool.acquire()
+    assert session in ("session-a", "session-b"), "Unknown session returned"
+    assert waited >= 0, "Wait time should not be negative"
+    assert pool.utilization() == 0.5, "Utilization incorrect with one of two busy"
+    pool.release(session)
+
+    with pool.session() as borrowed:
+        assert pool.stats()["busy"] == 1, "Borrowed session not counted"
+    stats = pool.stats()
+    assert stats["busy"] == 0, "Sessions should be returned"
+    assert stats["leases"] == 2, "Lease count incorrect"
+
+    print("✓ Session pool accounting works")
+
+
+if __name__ == "__main__":
+    test_prometheus_rendering()
+    test_scrape_time_functions()
+    test_session_pool_accounting()
+    print("All metrics tests passed! ✓")
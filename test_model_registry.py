@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for the model registry and its memory-budgeted LRU
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '.'))
+
+from kokoro_tts.model_registry import ModelRegistry, UnknownModel, load_model_config, resolve_model_paths
+
+def make_models(directory, sizes):
+    """Create fake model files of the given sizes in bytes"""
+    voices = os.path.join(directory, "voices.bin")
+    with open(voices, 'wb') as f:
+        f.write(b"\0" * 10)
+    models = {}
+    for name, size in sizes.items():
+        path = os.path.join(directory, f"{name}.onnx")
+        with open(path, 'wb') as f:
+            f.write(b"\0" * size)
+        models[name] = {'model': path, 'voices': voices}
+    return models
+
+def test_config_file():
+    """Test the registry file is read and relative paths resolved"""
+    print("Testing registry file...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "models.json")
+        with open(path, 'w') as f:
+            json.dump({
+                "default": "full",
+                "memory_budget_mb": 512,
+                "models": {
+                    "full": {"model": "kokoro-v1.0.onnx", "voices": "voices-v1.0.bin"},
+                    "int8": {"model": "kokoro-v1.0.int8.onnx"},
+                }
+            }, f)
+        config = load_model_config(path)
+        assert config['default'] == "full", "Default model incorrect"
+        assert config['memory_budget_mb'] == 512, "Memory budget incorrect"
+        assert config['models']['int8']['model'] == os.path.join(directory, "kokoro-v1.0.int8.onnx"), \
+            "Relative model path not resolved"
+
+        os.environ['KOKORO_MODELS'] = path
+        try:
+            model_path, voices_path = resolve_model_paths("int8", "voices-v1.0.bin", "voices-v1.0.bin")
+            assert model_path.endswith("kokoro-v1.0.int8.onnx"), "Registry name not resolved for the CLI"
+            assert resolve_model_paths("other.onnx", "v.bin") == ("other.onnx", "v.bin"), \
+                "Unknown names should pass through as paths"
+        finally:
+            del os.environ['KOKORO_MODELS']
+
+        with open(path, 'w') as f:
+            json.dump({"models": {}}, f)
+        try:
+            load_model_config(path)
+            assert False, "Empty registry should be rejected"
+        except ValueError:
+            pass
+
+    print("✓ Registry file works")
+
+
+def test_lru_eviction():
+    """Test on-demand models are evicted least recently used first within the budget"""
+    print("Testing LRU eviction...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        models = make_models(directory, {"full": 100, "a": 390, "b": 390, "c": 390})
+        loaded = []
+
+        def loader(model_path, voices_path):
+            loaded.append(os.path.basename(model_path))
+            return object()
+
+        registry = ModelRegistry(models, "full", memory_budget=1000, loader=loader)
+        with registry.lease("a"):
+            pass
+        with registry.lease("b"):
+            pass
+        with registry.lease("a"):
+            pass  # a is now the most recently used
+        with registry.lease("c"):
+            pass
+
+        assert loaded == ["a.onnx", "b.onnx", "c.onnx"], f"Unexpected loads: {loaded}"
+        assert not registry.is_resident("b"), "Least recently used model should be evicted"
+        assert registry.is_resident("a") and registry.is_resident("c"), "Recent models should stay"
+
+        stats = registry.stats()
+        assert stats['resident_bytes'] <= 1000, "Budget exceeded"
+        assert stats['models']['a']['requests'] == 2, "Request count incorrect"
+        assert stats['models']['b']['evictions'] == 1, "Eviction count incorrect"
+        assert [e['event'] for e in stats['events']] == ['load', 'load', 'evict', 'load'], "Events incorrect"
+
+        # A model serving a request is never evicted
+        with registry.lease("a"):
+            with registry.lease("b"):
+                assert registry.is_resident("a"), "Busy model was evicted"
+
+        try:
+            registry.resolve("missing")
+            assert False, "Unknown model should raise"
+        except UnknownModel:
+            pass
+        assert registry.resolve(None) == "full", "None should pick the default"
+
+    print("✓ LRU eviction works")
+
+
+if __name__ == "__main__":
+    test_config_file()
+    test_lru_eviction()
+    print("All model registry tests passed! ✓")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test script for stripping running headers, footers and non-speech blocks from PDFs
+"""
+
+import sys
+import os
+import fitz
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '.'))
+
+from kokoro_tts.pdf_cleanup import PageCleaner, is_non_speech, block_signature, read_page_blocks
+
+def make_document(pages=5):
+    doc = fitz.open()
+    for number in range(1, pages + 1):
+        page = doc.new_page()
+        page.insert_text((72, 40), "A Treatise on Widgets")
+        page.insert_text((72, 300), f"Body text of page {number} explains widgets in plain words.")
+        if number == 2:
+            page.insert_text((72, 500), "12.5  13.7  88.0  91.2  4.4  3.1")
+        page.insert_text((290, 810), str(number))
+    return doc
+
+def clean(doc):
+    cleaner = PageCleaner()
+    for page in doc:
+        cleaner.add(read_page_blocks(page))
+    cleaner.complete = True
+    return cleaner
+
+def test_helpers():
+    """Test page numbers match across pages and number tables are non-speech"""
+    print("Testing block helpers...")
+
+    assert block_signature("Page 3 of 10") == block_signature("Page 4  of 10"), "Page numbers should match"
+    assert is_non_speech("12.5  13.7  88.0  91.2  4.4"), "Number table should be non-speech"
+    assert not is_non_speech("Table 3 lists the results for 2024."), "Prose should be kept"
+    assert not is_non_speech("42"), "Short blocks are left to the running header check"
+
+    print("✓ Block helpers work")
+
+
+def test_page_cleaner():
+    """Test running headers, page numbers and number tables are removed"""
+    print("Testing page cleaning...")
+
+    cleaner = clean(make_document())
+    text = "\n".join(cleaner.page_text(page) for page in range(5))
+    assert "Treatise" not in text, "Running title not removed"
+    assert "88.0" not in text, "Number table not removed"
+    assert text.count("Body text") == 5, "Body text should be kept"
+    assert not any(line.strip().isdigit() for line in text.splitlines()), "Page numbers not removed"
+    assert cleaner.removed['running_headers'] == 5 * len("A Treatise on Widgets") + 5, \
+        f"Removed characters miscounted: {dict(cleaner.removed)}"
+    assert cleaner.removed['non_speech'] > 0, "Table characters not counted"
+
+    # Too few pages to tell a running header from a heading
+    short = clean(make_document(pages=2))
+    assert "Treatise" in short.page_text(0), "Short documents should keep margin text"
+
+    print("✓ Page cleaning works")
+
+
+if __name__ == "__main__":
+    test_helpers()
+    test_page_cleaner()
+    print("All PDF cleanup tests passed! ✓")
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for parallel page extraction from PDFs
+"""
+
+import sys
+import os
+import tempfile
+import fitz
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '.'))
+
+from kokoro_tts import PdfParser
+from kokoro_tts import pdf_pages
+
+def make_book(path, chapters=4, pages_per_chapter=20):
+    """Write a PDF with a TOC, a running title per chapter and page numbers."""
+    doc = fitz.open()
+    toc = []
+    for chapter in range(1, chapters + 1):
+        toc.append([1, f"Chapter {chapter}", doc.page_count + 1])
+        for number in range(pages_per_chapter):
+            page = doc.new_page()
+            page.insert_text((72, 40), f"Running title of chapter {chapter}")
+            page.insert_text((72, 300), f"Chapter {chapter} body, page {number}.")
+            page.insert_text((290, 810), str(doc.page_count))
+    doc.set_toc(toc)
+    doc.save(path)
+
+def test_iter_pages():
+    """Test pages read by a process pool come back in order"""
+    print("Testing parallel page reading...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "book.pdf")
+        make_book(path)
+        serial = list(pdf_pages.iter_pages(path, range(80), workers=1, blocks=False))
+        original = pdf_pages.PARALLEL_MIN_PAGES
+        pdf_pages.PARALLEL_MIN_PAGES = 0
+        try:
+            parallel = list(pdf_pages.iter_pages(path, range(80), workers=2, blocks=False))
+        finally:
+            pdf_pages.PARALLEL_MIN_PAGES = original
+    assert len(parallel) == 80, f"Expected 80 pages, got {len(parallel)}"
+    assert parallel == serial, "Parallel pages differ from serial pages"
+
+    print("✓ Parallel page reading works")
+
+
+def test_parser_chapters():
+    """Test chapters are assembled in order, lazily, without running titles"""
+    print("Testing PDF chapter assembly...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "book.pdf")
+        make_book(path)
+        chapters = PdfParser(path, interactive=False).get_chapters()
+        assert [chapter['title'] for chapter in chapters] == [f"Chapter {n}" for n in range(1, 5)], \
+            "Chapters missing or out of order"
+        assert chapters[1]['content'].count("Chapter 2 body") == 20, "Chapter pages missing"
+        assert "Running title" not in chapters[1]['content'], "Per-chapter running title not removed"
+
+        lazy = PdfParser(path, interactive=False).iter_chapters()
+        assert next(lazy)['content'] == chapters[0]['content'], "Lazy chapters differ"
+        lazy.close()
+
+    print("✓ PDF chapter assembly works")
+
+
+def test_markdown_windows():
+    """Test Markdown chapters are split at headings across page windows"""
+    print("Testing windowed Markdown fallback...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "untitled.pdf")
+        doc = fitz.open()
+        for chapter in range(1, 4):
+            for number in range(3):
+                page = doc.new_page()
+                if number == 0:
+                    page.insert_text((72, 80), f"Chapter {chapter}", fontsize=28)
+                page.insert_text((72, 200), f"Chapter {chapter}, page {number}: a well-known sentence of text.")
+        doc.save(path)
+
+        original = pdf_pages.MARKDOWN_WINDOW_PAGES
+        pdf_pages.MARKDOWN_WINDOW_PAGES = 2
+        try:
+            chapters = PdfParser(path, interactive=False).get_chapters_from_markdown()
+        finally:
+            pdf_pages.MARKDOWN_WINDOW_PAGES = original
+
+    assert [chapter['title'] for chapter in chapters] == [f"Chapter {n}_Chapter {n}" for n in range(1, 4)], \
+        f"Headings not detected: {[chapter['title'] for chapter in chapters]}"
+    assert chapters[1]['content'].count("Chapter 2, page") == 3, "Chapter spanning windows incomplete"
+    assert "well-known" in chapters[0]['content'], "Hyphens should be kept"
+
+    print("✓ Windowed Markdown fallback works")
+
+
+if __name__ == "__main__":
+    test_iter_pages()
+    test_parser_chapters()
+    test_markdown_windows()
+    print("All PDF page tests passed! ✓")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test script for quick file previews in the desktop GUI
+"""
+
+import sys
+import os
+import tempfile
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '.'))
+
+from kokoro_tts import preview
+from kokoro_tts.preview import PreviewCache, play_preview, preview_sentences
+
+class FakeKokoro:
+    """Records the text it is asked to synthesize."""
+
+    def __init__(self):
+        self.calls = []
+
+    def create(self, text, voice, speed, lang):
+        self.calls.append((text, voice))
+        return np.zeros(len(text), dtype=np.float32), 24000
+
+def write_book(directory, sentences=2000):
+    path = os.path.join(directory, "novel.txt")
+    with open(path, 'w', encoding='utf-8') as f:
+        for n in range(sentences):
+            f.write(f"This is sentence number {n} of a very long novel. ")
+    return path
+
+def test_preview_sentences():
+    """Test only the opening sentences are taken"""
+    print("Testing preview sentences...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_book(directory)
+        sentences = preview_sentences(path, max_sentences=3)
+        assert sentences == [f"This is sentence number {n} of a very long novel." for n in range(3)], sentences
+        assert len(preview_sentences(path, max_sentences=100, max_seconds=10)) < 100, \
+            "Time limit ignored"
+
+    print("✓ Preview sentences work")
+
+
+def test_play_preview_cached():
+    """Test previews are synthesized per sentence and replayed from the cache"""
+    print("Testing preview cache...")
+
+    played = []
+    original = preview.sd.play, preview.sd.wait
+    preview.sd.play = lambda samples, sample_rate: played.append(len(samples))
+    preview.sd.wait = lambda: None
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            path = write_book(directory)
+            kokoro = FakeKokoro()
+            cache = PreviewCache()
+
+            assert not play_preview(kokoro, path, "af_sarah", 1.0, "en-us", cache)
+            assert len(kokoro.calls) == preview.PREVIEW_SENTENCES, "Expected one call per preview sentence"
+            assert len(played) == preview.PREVIEW_SENTENCES, "Sentences should be played as they are ready"
+
+            assert play_preview(kokoro, path, "af_sarah", 1.0, "en-us", cache), "Second preview not cached"
+            assert len(kokoro.calls) == preview.PREVIEW_SENTENCES, "Cached preview synthesized again"
+            assert played[-1] == sum(played[:-1]), "Cached preview should be the whole preview"
+
+            assert not play_preview(kokoro, path, "am_adam", 1.0, "en-us", cache), "Other voice should not be cached"
+            assert not play_preview(kokoro, path, "af_sarah", 1.2, "en-us", cache), "Other speed should not be cached"
+            assert play_preview(kokoro, path, "af_sarah", 1.0, "en-us", cache), "Switching back should hit the cache"
+    finally:
+        preview.sd.play, preview.sd.wait = original
+
+    print("✓ Preview cache works")
+
+
+if __name__ == "__main__":
+    test_preview_sentences()
+    test_play_preview_cached()
+    print("All preview tests passed! ✓")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for in-flight request coalescing in the web layer
+"""
+
+import sys
+import os
+import threading
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '.'))
+
+from kokoro_tts.coalesce import RequestCoalescer, make_request_key
+
+def test_identical_requests_share_one_call():
+    """Test that concurrent identical requests run a single synthesis"""
+    print("Testing coalescing of identical in-flight requests...")
+
+    coalescer = RequestCoalescer()
+    calls = []
+    release = threading.Event()
+
+    def slow_synthesis(text):
+        calls.append(text)
+        release.wait(5)
+        return f"audio for {text}"
+
+    key = make_request_key("Your order has shipped.", "af_sarah", 1.0, "en-us")
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(coalescer.run(key, slow_synthesis, "shipped")))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+
+    # Wait until every follower is parked behind the leader
+    deadline = time.time() + 5
+    while coalescer.stats()["waiting"] < 7 and time.time() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1, f"Expected 1 synthesis, got {len(calls)}"
+    assert results == ["audio for shipped"] * 8, "Every waiter should get the same result"
+    stats = coalescer.stats()
+    assert stats["executions"] == 1, "Leader count incorrect"
+    assert stats["coalesced"] == 7, "Follower count incorrect"
+    assert stats["in_flight"] == 0, "Finished call should be removed"
+
+    print("✓ Identical requests are coalesced")
+
+
+def test_errors_fan_out_and_clear():
+    """Test that a failing leader propagates its error and does not stick"""
+    print("Testing error propagation...")
+
+    coalescer = RequestCoalescer()
+
+    def failing_synthesis():
+        raise RuntimeError("boom")
+
+    try:
+        coalescer.run("key", failing_synthesis)
+        assert False, "Expected RuntimeError"
+    except RuntimeError:
+        pass
+
+    # A later request with the same key runs again
+    assert coalescer.run("key", lambda: "ok") == "ok", "Key should be free after an error"
+    assert coalescer.stats()["errors"] == 1, "Error counter incorrect"
+
+    print("✓ Errors propagate and clear the in-flight entry")
+
+
+def test_request_key():
+    """Test that the key separates requests that produce different audio"""
+    print("Testing request keys...")
+
+    base = make_request_key("Hello", "af_sarah", 1.0, "en-us")
+    assert base == make_request_key("Hello", "af_sarah", 1.0000001, "en-us"), "Speed noise should not split keys"
+    assert base != make_request_key("Hello", "af_sarah:60,am_adam:40", 1.0, "en-us"), "Blend should change key"
+    assert base != make_request_key("Hello", "af_sarah", 1.2, "en-us"), "Speed should change key"
+    assert base != make_request_key("Hello", "af_sarah", 1.0, "en-gb"), "Language should change key"
+
+    print("✓ Request keys work")
+
+
+if __name__ == "__main__":
+    test_identical_requests_share_one_call()
+    test_errors_fan_out_and_clear()
+    test_request_key()
+    print("All coalescing tests passed! ✓")
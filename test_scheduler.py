@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test script for priority classes and deadline admission in the synthesis scheduler
+"""
+
+import sys
+import os
+import time
+import threading
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '.'))
+
+from kokoro_tts.scheduler import SynthesisScheduler, DeadlineExceeded, truncate_to_sentences
+
+def test_interactive_overtakes_bulk():
+    """Test a waiting interactive request runs before queued bulk requests"""
+    print("Testing priority ordering...")
+
+    scheduler = SynthesisScheduler(capacity=1)
+    order = []
+    release = threading.Event()
+
+    def job(priority, name, hold=None):
+        with scheduler.slot(priority):
+            order.append(name)
+            if hold:
+                hold.wait()
+
+    running = threading.Thread(target=job, args=('bulk', 'bulk-1', release))
+    running.start()
+    time.sleep(0.05)
+    threads = [threading.Thread(target=job, args=('bulk', 'bulk-2'))]
+    threads[0].start()
+    time.sleep(0.05)
+    threads.append(threading.Thread(target=job, args=('interactive', 'preview')))
+    threads[1].start()
+    time.sleep(0.05)
+
+    assert scheduler.waiting() == {'interactive': 1, 'bulk': 1}, "Waiting counts incorrect"
+    release.set()
+    for thread in [running] + threads:
+        thread.join(timeout=2)
+    assert order == ['bulk-1', 'preview', 'bulk-2'], f"Unexpected order: {order}"
+
+    print("✓ Priority ordering works")
+
+
+def test_class_limits():
+    """Test the bulk limit leaves a session for interactive requests"""
+    print("Testing per-class limits...")
+
+    scheduler = SynthesisScheduler(capacity=2)
+    assert scheduler.limits == {'interactive': 2, 'bulk': 1}, f"Default limits incorrect: {scheduler.limits}"
+
+    with scheduler.slot('bulk'):
+        started = threading.Event()
+
+        def second_bulk():
+            with scheduler.slot('bulk'):
+                started.set()
+
+        thread = threading.Thread(target=second_bulk)
+        thread.start()
+        time.sleep(0.05)
+        assert not started.is_set(), "Second bulk request should wait for the bulk limit"
+        with scheduler.slot('interactive') as waited:
+            assert waited < 0.05, "Interactive request should use the reserved session"
+    thread.join(timeout=2)
+    assert started.is_set(), "Bulk request should run once the first finishes"
+
+    scheduler.configure(4, {'bulk': 3})
+    assert scheduler.limits == {'interactive': 4, 'bulk': 3}, "Configured limits not applied"
+
+    print("✓ Per-class limits work")
+
+
+def test_deadline_admission():
+    """Test requests are rejected or shortened when they would miss the deadline"""
+    print("Testing deadline admission...")
+
+    scheduler = SynthesisScheduler(capacity=1)
+    text = "First sentence here. " * 20
+    assert scheduler.admit(text, deadline=0.001)[1] is None, "Should admit before any measurement"
+
+    # 14 characters per audio second at half real time
+    scheduler.estimator.observe(140, 10.0, 5.0)
+    admitted, estimated, truncated = scheduler.admit(text, deadline=60.0)
+    assert admitted == text and not truncated, "Request within deadline should be untouched"
+    assert abs(estimated - len(text) / 14 * 0.5) < 1e-6, f"Estimate incorrect: {estimated}"
+
+    try:
+        scheduler.admit(text, deadline=1.0)
+        assert False, "Request past its deadline should be rejected"
+    except DeadlineExceeded as e:
+        assert e.estimated_seconds > 1.0, "Rejection should report the estimate"
+
+    admitted, estimated, truncated = scheduler.admit(text, deadline=2.0, degrade=True)
+    assert truncated and admitted.endswith("here."), "Degraded text should end on a sentence"
+    assert estimated <= 2.0, "Degraded request should fit the deadline"
+    assert scheduler.stats()['rejected']['interactive'] == 1, "Rejection not counted"
+
+    assert truncate_to_sentences("One. Two. Three.", 10) == "One. Two.", "Sentence truncation incorrect"
+    assert scheduler.classify("x" * 5000) == 'bulk', "Long text should be bulk"
+    assert scheduler.classify("x" * 5000, 'interactive') == 'interactive', "Client hint ignored"
+
+    print("✓ Deadline admission works")
+
+
+if __name__ == "__main__":
+    test_interactive_overtakes_bulk()
+    test_class_limits()
+    test_deadline_admission()
+    print("All scheduler tests passed! ✓")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for selective rendering by chapter, page range or time budget
+"""
+
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '.'))
+
+from kokoro_tts import PdfParser
+from kokoro_tts.selection import parse_ranges, select_chapters, limit_duration, estimate_seconds
+from test_pdf_pages import make_book
+
+def test_parse_ranges():
+    """Test range lists are parsed and bad ones rejected"""
+    print("Testing range parsing...")
+
+    assert parse_ranges("3-5,9") == [(3, 5), (9, 9)], "Ranges not parsed"
+    assert parse_ranges(" 100-180 ") == [(100, 180)], "Whitespace not allowed"
+    for bad in ["", "5-3", "0", "a-b", "3-"]:
+        try:
+            parse_ranges(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"'{bad}' should be rejected")
+
+    print("✓ Range parsing works")
+
+
+def test_select_chapters():
+    """Test chapters are picked by number and reading stops after the last one"""
+    print("Testing chapter selection...")
+
+    read = []
+
+    def chapters():
+        for n in range(1, 11):
+            read.append(n)
+            yield {'title': f"Chapter {n}", 'content': "Text."}
+
+    selected = list(select_chapters(chapters(), parse_ranges("3-5,7")))
+    assert [chapter['number'] for chapter in selected] == [3, 4, 5, 7], "Wrong chapters selected"
+    assert selected[0]['title'] == "Chapter 3", "Chapter content changed"
+    assert read[-1] == 8, f"Reading should stop after chapter 7, read {read}"
+
+    print("✓ Chapter selection works")
+
+
+def test_limit_duration():
+    """Test a time budget cuts the crossing chapter and stops reading"""
+    print("Testing time budget...")
+
+    read = []
+    sentence = "This sentence is about four seconds of speech when read. "
+
+    def chapters():
+        for n in range(1, 6):
+            read.append(n)
+            yield {'title': f"Chapter {n}", 'content': sentence * 100}
+
+    chapter_seconds = estimate_seconds(sentence * 100)
+    limited = list(limit_duration(chapters(), chapter_seconds * 1.5))
+    assert len(limited) == 2, f"Expected two chapters, got {len(limited)}"
+    assert limited[0]['content'] == sentence * 100, "First chapter should be whole"
+    assert 0 < len(limited[1]['content']) < len(sentence * 100), "Second chapter should be cut"
+    assert limited[1]['content'] == ' '.join(limited[1]['chunks']), "Cut chapter chunks differ"
+    assert read == [1, 2], f"Reading should stop at the budget, read {read}"
+
+    # Slower speech uses the budget up sooner
+    assert len(list(limit_duration(chapters(), chapter_seconds * 1.5, speed=0.5))) == 1
+
+    print("✓ Time budget works")
+
+
+def test_pdf_page_ranges():
+    """Test only the selected PDF pages are read"""
+    print("Testing PDF page ranges...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "book.pdf")
+        make_book(path)
+        chapters = PdfParser(path, interactive=False, pages=parse_ranges("25-30,71-75")).get_chapters()
+
+    assert [chapter['title'] for chapter in chapters] == ["Chapter 2", "Chapter 4"], \
+        f"Chapters without selected pages kept: {[chapter['title'] for chapter in chapters]}"
+    assert chapters[0]['content'].count("Chapter 2 body") == 6, "Selected pages missing"
+    assert "page 3." not in chapters[0]['content'] and "page 4." in chapters[0]['content'], \
+        "Pages outside the range read"
+    assert chapters[1]['content'].count("Chapter 4 body") == 5, "Second range missing"
+
+    print("✓ PDF page ranges work")
+
+
+if __name__ == "__main__":
+    test_parse_ranges()
+    test_select_chapters()
+    test_limit_duration()
+    test_pdf_page_ranges()
+    print("All selection tests passed! ✓")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for incremental text-in / audio-out streaming
+"""
+
+import sys
+import os
+import json
+import time
+import base64
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '.'))
+
+from kokoro_tts.streaming import SentenceCutter, AudioStream, SENTENCE_GAP_SECONDS
+
+def test_sentence_cutter():
+    """Test sentences are cut only once they are complete"""
+    print("Testing incremental sentence cutting...")
+
+    cutter = SentenceCutter()
+    assert cutter.feed("The value of pi is about 3.") == [], "Should wait for text after the period"
+    assert cutter.feed("14, as everyone knows") == [], "Decimal point is not a sentence end"
+    assert cutter.feed(".") == [], "Sentence end needs the following whitespace"
+    assert cutter.feed(" Next one arrives") == ["The value of pi is about 3.14, as everyone knows."], \
+        "Completed sentence not cut"
+    assert cutter.feed(" soon. Yes. ") == ["Next one arrives soon. Yes."], \
+        "Short fragments should stay with their neighbours"
+    assert cutter.feed("Unfinished") == [], "Incomplete sentence should be held"
+    assert cutter.flush() == ["Unfinished"], "Flush should return the remainder"
+
+    long_text = "word " * 100
+    sentences = cutter.feed(long_text)
+    assert sentences and all(len(s) <= cutter.max_chars for s in sentences), "Long text should be cut"
+
+    print("✓ Incremental sentence cutting works")
+
+
+def test_frames_in_order():
+    """Test frames come back in sequence order with timing figures"""
+    print("Testing ordered audio frames...")
+
+    def synthesize(sentence, voice, speed, language, model):
+        # The first sentence is the slowest, so later ones finish first
+        time.sleep(0.15 if sentence.startswith("First") else 0.01)
+        return np.full(2400, 0.5, dtype=np.float32), 24000
+
+    timings = []
+    stream = AudioStream(synthesize, "af_sarah", 1.0, "en-us", workers=3,
+                         on_frame=lambda s, timing: timings.append(timing))
+    stream.add_text("First sentence of the reply is here. Second sentence comes right after it. ")
+    stream.add_text("Third and last sentence.", final=True)
+
+    events = list(stream.events())
+    frames = [payload for event, payload in events if event == "audio"]
+    assert [frame["seq"] for frame in frames] == [0, 1, 2], "Frames out of order"
+    assert events[-1][0] == "end", "Stream should end with an end event"
+
+    pcm = np.frombuffer(base64.b64decode(frames[0]["audio"]), dtype='<i2')
+    assert len(pcm) == 2400 and pcm[0] == 16383, "PCM frame encoding incorrect"
+    pcm = np.frombuffer(base64.b64decode(frames[1]["audio"]), dtype='<i2')
+    gap = int(24000 * SENTENCE_GAP_SECONDS)
+    assert len(pcm) == 2400 + gap and not pcm[:gap].any(), "Later frames should lead with a pause"
+
+    stats = events[-1][1]
+    assert stats["frames"] == 3, "Frame count incorrect"
+    assert stats["time_to_first_audio"] >= 0.15, "TTFA should include the first synthesis"
+    assert timings[0]["ttfa"] is not None and timings[1]["gap"] is not None, "Timing not reported"
+
+    print("✓ Ordered audio frames work")
+
+
+def test_stream_endpoints():
+    """Test the POST and server-sent event endpoints together"""
+    print("Testing stream endpoints...")
+
+    from kokoro_tts import web_service
+    from kokoro_tts.web_gui import app
+
+    class MockKokoro:
+        def get_voices(self):
+            return ["af_sarah"]
+
+        def create(self, text, voice, speed=1.0, lang="en-us", phonemes=None):
+            return np.zeros(240, dtype=np.float32), 24000
+
+    web_service.attach_model(MockKokoro())
+    client = app.test_client()
+
+    stream_id = client.post('/api/stream', json={"voice": "af_sarah"}).json["stream_id"]
+    response = client.post(f'/api/stream/{stream_id}/text', json={"text": "Hello there, how are you today? I am "})
+    assert response.json["queued"] == 1, "First sentence should be queued"
+    client.post(f'/api/stream/{stream_id}/text', json={"text": "fine.", "final": True})
+
+    body = client.get(f'/api/stream/{stream_id}/events').data.decode()
+    events = [line[len("event: "):] for line in body.splitlines() if line.startswith("event: ")]
+    assert events == ["audio", "audio", "end"], f"Unexpected events: {events}"
+    data = [json.loads(line[len("data: "):]) for line in body.splitlines() if line.startswith("data: ")]
+    assert data[1]["text"] == "I am fine.", "Final fragment not synthesized"
+
+    assert client.post(f'/api/stream/{stream_id}/text', json={"text": "x"}).status_code == 404, \
+        "Finished stream should be forgotten"
+    assert client.post('/api/stream', json={"model": "missing"}).status_code == 400, "Unknown model accepted"
+    for speed in ("fast", None, 3.0):
+        assert client.post('/api/stream', json={"speed": speed}).status_code == 400, f"Speed {speed!r} accepted"
+
+    print("✓ Stream endpoints work")
+
+
+if __name__ == "__main__":
+    test_sentence_cutter()
+    test_frames_in_order()
+    test_stream_endpoints()
+    print("All streaming tests passed! ✓")
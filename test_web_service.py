@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared web service: startup warmup, probes and server options
+"""
+
+import sys
+import os
+import time
+import tempfile
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '.'))
+
+from kokoro_tts import web_service, audition
+from kokoro_tts.server import parse_server_args
+from kokoro_tts.streaming import sentence_gap
+from kokoro_tts.web_gui import app
+
+class MockKokoro:
+    """Small stand-in for the Kokoro model that returns silence"""
+
+    def __init__(self):
+        self.created = []
+
+    def get_voices(self):
+        return ["af_sarah", "am_adam", "bf_emma", "jf_alpha"]
+
+    def get_languages(self):
+        return ["en-us", "en-gb", "ja"]
+
+    def get_voice_style(self, voice):
+        return np.ones((512, 1, 256), dtype=np.float32)
+
+    def create(self, text, voice, speed=1.0, lang="en-us", phonemes=None):
+        self.created.append((text, voice, lang))
+        return np.zeros(2400, dtype=np.float32), 24000
+
+def test_warmup_plan():
+    """Test the warmup set covers each language at each length"""
+    print("Testing warmup plan...")
+
+    plan = web_service.build_warmup_plan(["en-us", "ja"], [40, 200])
+    assert len(plan) == 4, f"Expected 4 warmup items, got {len(plan)}"
+    assert [len(text) for _, text in plan] == [40, 200, 40, 200], "Warmup text lengths incorrect"
+    assert web_service.pick_voice(MockKokoro(), "ja") == "jf_alpha", "Japanese voice not picked"
+    assert web_service.pick_voice(MockKokoro(), "en-gb") == "bf_emma", "British voice not picked"
+
+    print("✓ Warmup plan works")
+
+
+def test_readiness_probes():
+    """Test /healthz and /readyz before and after the warmup"""
+    print("Testing readiness probes...")
+
+    client = app.test_client()
+    web_service.pool = None
+    web_service.warmup_state['state'] = 'pending'
+    assert client.get('/healthz').status_code == 200, "Liveness should not depend on the model"
+    assert client.get('/readyz').status_code == 503, "Should not be ready without a model"
+
+    model = MockKokoro()
+    web_service.configure_warmup(True, ["en-us", "ja"], [40, 200])
+    web_service.start_background_startup(lambda: web_service.attach_model(model))
+
+    deadline = time.time() + 5
+    while not web_service.is_ready() and time.time() < deadline:
+        time.sleep(0.01)
+    response = client.get('/readyz')
+    assert response.status_code == 200, "Should be ready after warmup"
+    assert response.json["warmup"]["completed"] == 4, "Warmup count incorrect"
+    assert {lang for _, _, lang in model.created} == {"en-us", "ja"}, "Warmup languages incorrect"
+
+    print("✓ Readiness probes work")
+
+
+def test_sentence_splitting():
+    """Test text is split into whole sentences within the model's limit"""
+    print("Testing sentence splitting...")
+
+    text = "Dr. Smith arrived at noon. Nobody expected him to come back! Was it planned? Yes."
+    sentences = web_service.split_sentences(text)
+    # Short fragments are joined to their neighbours rather than synthesized alone
+    assert sentences == ["Dr. Smith arrived at noon.", "Nobody expected him to come back! Was it planned? Yes."], \
+        f"Unexpected sentences: {sentences}"
+
+    # Decimals, abbreviations and initials are not sentence ends, and spacing is kept
+    text = "The company reported quarterly revenues of 3.5 million dollars. Dr. Smith agreed, e.g. with the U.S. plan."
+    sentences = web_service.split_sentences(text)
+    assert sentences == ["The company reported quarterly revenues of 3.5 million dollars.",
+                         "Dr. Smith agreed, e.g. with the U.S. plan."], f"Unexpected sentences: {sentences}"
+    assert web_service.split_sentences("Short one.\n  Another short line of text here.") == \
+        ["Short one.\n  Another short line of text here."], "Original spacing not kept"
+
+    long_sentence = ", ".join(["a clause of some length"] * 40) + "."
+    parts = web_service.split_sentences(long_sentence)
+    assert all(len(part) <= web_service.SENTENCE_MAX_CHARS for part in parts), "Sentence over the limit"
+    assert " ".join(parts) == long_sentence, "Splitting should not lose text"
+
+    print("✓ Sentence splitting works")
+
+
+def test_sentence_parallel_synthesis():
+    """Test sentences run concurrently across the pool and join in order"""
+    print("Testing sentence-parallel synthesis...")
+
+    class SlowKokoro(MockKokoro):
+        def create(self, text, voice, speed=1.0, lang="en-us", phonemes=None):
+            time.sleep(0.1)
+            # Tag each sentence's audio with its length so the order can be checked
+            return np.full(10, len(text), dtype=np.float32), 24000
+
+    web_service.pool_size = 4
+    web_service.attach_model(SlowKokoro())
+    assert web_service.pool.size == 4, "Pool should hold 4 sessions"
+
+    sentences = [f"Sentence number {i} is{' quite' * i} long." for i in range(8)]
+    start = time.time()
+    samples, sample_rate = web_service.render_samples(" ".join(sentences), "af_sarah", 1.0, "en-us")
+    elapsed = time.time() - start
+
+    assert sample_rate == 24000, "Sample rate incorrect"
+    # Each sentence is followed by a short pause before the next one
+    gap = len(sentence_gap(sample_rate))
+    assert 0.1 * sample_rate <= gap <= 0.2 * sample_rate, "Sentence gap should be 0.1-0.2s"
+    assert len(samples) == 8 * 10 + 7 * gap, "Expected one gap between each pair of sentences"
+    assert list(samples[::10 + gap]) == [len(s) for s in sentences], "Sentences out of order"
+    assert not samples[10:10 + gap].any(), "Gap should be silent"
+    assert elapsed < 0.5, f"8 sentences on 4 sessions should take ~0.2s, took {elapsed:.2f}s"
+    web_service.pool_size = None
+
+    print("✓ Sentence-parallel synthesis works")
+
+
+def test_idle_unload_and_reload():
+    """Test an idle model is released and reloaded by the next request"""
+    print("Testing idle unload and reload...")
+
+    class LargeKokoro(MockKokoro):
+        def __init__(self):
+            super().__init__()
+            # Stand-in for the session weights so the unload has memory to give back
+            self.weights = np.ones(64 * 1024 * 1024 // 8)
+
+    loads = []
+
+    def load_model():
+        loads.append(True)
+        web_service.attach_model(LargeKokoro())
+
+    web_service.pool_size = 1
+    load_model()
+    web_service._load_model = load_model
+
+    reclaimed = web_service.unload_model()
+    assert web_service.pool is None, "Sessions should be released"
+    status = app.test_client().get('/api/status').get_json()
+    assert not status['model_loaded'] and status['idle']['state'] == 'unloaded', f"Status not updated: {status}"
+    assert reclaimed is not None and reclaimed > 32 * 1024 * 1024, f"Expected ~64 MB reclaimed, got {reclaimed}"
+    assert web_service.is_ready(), "An unloaded model should still count as ready"
+
+    audio_data = web_service.synthesize("Hello after a quiet afternoon.", "af_sarah", 1.0, "en-us")
+    assert audio_data, "Request after unload should be served"
+    assert len(loads) == 2, "Model should be reloaded once"
+    stats = web_service.get_idle_stats()
+    assert stats['state'] == 'resident' and stats['reloads'] == 1, f"Unexpected idle stats: {stats}"
+    assert stats['reload_seconds'] is not None, "Reload latency not reported"
+    assert app.test_client().get('/api/status').get_json()['model_loaded'], "Reload not reported"
+
+    # Opening the page wakes an unloaded model without waiting for a synthesis request
+    web_service.unload_model()
+    app.test_client().get('/api/voices')
+    web_service._reload_thread.join(5)
+    assert web_service.pool is not None and len(loads) == 3, "Voice list should reload the model"
+
+    # Prefork workers exit through os._exit and remove their optimized graph themselves
+    with tempfile.NamedTemporaryFile(delete=False) as f:
+        web_service._optimized_models["model.onnx"] = f.name
+    web_service.remove_optimized_models()
+    assert not os.path.exists(f.name) and not web_service._optimized_models, "Optimized graph left behind"
+    web_service.pool_size = None
+
+    print("✓ Idle unload and reload work")
+
+
+def test_server_options():
+    """Test the web server command line options"""
+    print("Testing server options...")
+
+    options = parse_server_args([])
+    assert not options['dev'] and options['workers'] == 1, "Defaults incorrect"
+
+    options = parse_server_args(['--workers', '4', '--max-requests', '500', '--dev',
+                                 '--sessions', '2', '--warmup-langs', 'en-us,ja', '--no-warmup',
+                                 '--idle-unload', '30'])
+    assert options['workers'] == 4, "Workers not parsed"
+    assert options['max_requests'] == 500, "Max requests not parsed"
+    assert options['dev'], "Dev flag not parsed"
+    assert options['sessions'] == 2, "Sessions not parsed"
+    assert options['idle_unload'] == 30, "Idle unload not parsed"
+    assert options['warmup_langs'] == ['en-us', 'ja'], "Warmup languages not parsed"
+    assert not options['warmup'], "No-warmup flag not parsed"
+
+    print("✓ Server options work")
+
+
+def test_audition_endpoint():
+    """Test /api/audition renders every chosen voice, then serves it from the cache"""
+    print("Testing audition endpoint...")
+
+    client = app.test_client()
+    model = MockKokoro()
+    web_service.attach_model(model)
+    original = audition.AUDITION_CACHE_DIR, web_service.get_model_paths
+    with tempfile.TemporaryDirectory() as directory:
+        voices_path = os.path.join(directory, "voices.bin")
+        with open(voices_path, 'wb') as f:
+            np.savez(f, **{voice: np.ones(4, dtype=np.float32) for voice in model.get_voices()})
+        audition.AUDITION_CACHE_DIR = os.path.join(directory, "cache")
+        web_service.get_model_paths = lambda name: ("model.onnx", voices_path)
+        try:
+            response = client.post('/api/audition', json={"text": "Hello there.", "voices": ["a*_*"]})
+            assert response.status_code == 200, response.get_json()
+            clips = response.get_json()["clips"]
+            assert [clip["voice"] for clip in clips] == ["af_sarah", "am_adam"], "Voice list not applied"
+            assert all(clip["status"] == "synthesized" and clip["audio_data"] for clip in clips), clips
+
+            rendered = len(model.created)
+            response = client.post('/api/audition', json={"text": "Hello there.", "voices": "a*_*"})
+            assert [clip["status"] for clip in response.get_json()["clips"]] == ["cached", "cached"]
+            assert len(model.created) == rendered, "Cached clips synthesized again"
+
+            response = client.post('/api/audition', json={"text": "Hello there.", "voices": "zz_*"})
+            assert response.status_code == 400, "Unknown voice should be rejected"
+        finally:
+            audition.AUDITION_CACHE_DIR, web_service.get_model_paths = original
+
+    print("✓ Audition endpoint works")
+
+
+if __name__ == "__main__":
+    test_warmup_plan()
+    test_readiness_probes()
+    test_sentence_splitting()
+    test_sentence_parallel_synthesis()
+    test_idle_unload_and_reload()
+    test_server_options()
+    test_audition_endpoint()
+    print("All web service tests passed! ✓")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared-filesystem work queue
+"""
+
+import sys
+import os
+import time
+import tempfile
+import multiprocessing
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '.'))
+
+from kokoro_tts import work_queue
+from kokoro_tts.session_pool import SessionPool
+
+class MockKokoro:
+    def get_voices(self):
+        return ["af_sarah"]
+
+    def get_languages(self):
+        return ["en-us"]
+
+    def create(self, text, voice, speed=1.0, lang="en-us"):
+        time.sleep(0.01)
+        return np.full(2400, 0.1, dtype=np.float32), 24000
+
+def run_mock_worker(queue_dir):
+    work_queue.create_sessions = lambda model_path, voices_path, workers: SessionPool([MockKokoro()])
+    work_queue.run_worker(queue_dir, workers=1, poll_seconds=0.05)
+
+def test_claim_and_reclaim():
+    """Test items are claimed once and expired leases come back"""
+    print("Testing claims and leases...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        queue = work_queue.WorkQueue(directory, lease_seconds=60)
+        queue.enqueue("001-001.json", {"text": "One.", "output": "chapter_001/chunk_001.wav"})
+        queue.enqueue("001-002.json", {"text": "Two.", "output": "chapter_001/chunk_002.wav"})
+
+        lease, item = queue.claim("host-a")
+        assert item["attempts"] == 1 and item["owner"] == "host-a", "Claim not recorded"
+        assert queue.claim("host-b")[1]["text"] == "Two.", "Second claim should get the next item"
+        assert queue.claim("host-c") is None, "Nothing should be left to claim"
+
+        # host-a goes quiet: its lease expires and the item goes back to pending
+        path = os.path.join(directory, "leased", lease)
+        os.utime(path, (time.time() - 120, time.time() - 120))
+        assert queue.reclaim_expired() == 1, "Expired lease not reclaimed"
+        assert queue.complete(lease) is False, "Lost lease should not complete"
+        assert queue.names("pending") == ["001-001.json"], "Reclaimed item not pending"
+
+    print("✓ Claims and leases work")
+
+
+def test_workers_render_book():
+    """Test several worker processes render a queued book once"""
+    print("Testing worker processes...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        book = os.path.join(directory, "book.txt")
+        with open(book, 'w') as f:
+            f.write("A sentence that repeats through the whole book. " * 200)
+        queue_dir = os.path.join(directory, "queue")
+        out_dir = os.path.join(directory, "out")
+
+        context = multiprocessing.get_context("spawn")
+        workers = [context.Process(target=run_mock_worker, args=(queue_dir,)) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        try:
+            assert work_queue.run_coordinator(book, queue_dir, out_dir, poll_seconds=0.05), "Coordinator failed"
+        finally:
+            for worker in workers:
+                worker.join(timeout=30)
+
+        queue = work_queue.WorkQueue(queue_dir)
+        chunks = os.listdir(os.path.join(out_dir, "chapter_001"))
+        assert queue.counts()["done"] == 10 and queue.finished(), f"Unexpected queue state: {queue.counts()}"
+        assert len([c for c in chunks if c.startswith("chunk_")]) == 10, "Chunk files missing"
+        assert os.path.exists(os.path.join(out_dir, "Chapter 1.wav")), "Chapters not merged"
+        assert all(worker.exitcode == 0 for worker in workers), "Workers should exit once the queue is finished"
+
+    print("✓ Worker processes work")
+
+
+if __name__ == "__main__":
+    test_claim_and_reclaim()
+    test_workers_render_book()
+    print("All work queue tests passed! ✓")